@@ -0,0 +1 @@
+"""Benchmarks (run as modules from the root of the repository, e.g., ``python -m benchmarks.records``)."""
@@ -0,0 +1,93 @@
+"""Corpus of recorded pages for benchmarks.
+
+Pages are loaded from a directory of recorded response bodies (``*.json`` files, one page per file). A synthetic
+corpus shaped like full-archive search pages is generated if no directory is provided.
+"""
+import glob
+import json
+import os
+import random
+
+__all__ = [
+    'load_pages',
+]
+
+
+def _generate_page(rnd, page_size=500, num_users=50):
+    users = [{
+        'id': str(1000 + i),
+        'username': 'user{}'.format(i),
+        'name': 'User {}'.format(i),
+        'created_at': '2015-01-01T00:00:00.000Z',
+        'description': 'description ' * 8,
+        'public_metrics': {'followers_count': rnd.randint(0, 10 ** 6), 'following_count': rnd.randint(0, 10 ** 4),
+                           'tweet_count': rnd.randint(0, 10 ** 5), 'listed_count': rnd.randint(0, 100)},
+        'verified': False,
+    } for i in range(num_users)]
+    data, media, tweets = [], [], []
+    for i in range(page_size):
+        tweet_id = str(rnd.randint(10 ** 18, 10 ** 19))
+        tweet = {
+            'id': tweet_id,
+            'text': 'tweet text with #hashtag and @mention ' * 3,
+            'author_id': rnd.choice(users)['id'],
+            'conversation_id': tweet_id,
+            'created_at': '2022-09-30T{:02d}:{:02d}:{:02d}.000Z'.format(i % 24, i % 60, (i * 7) % 60),
+            'lang': 'en',
+            'possibly_sensitive': False,
+            'reply_settings': 'everyone',
+            'source': 'Twitter for iPhone',
+            'edit_history_tweet_ids': [tweet_id],
+            'public_metrics': {'retweet_count': rnd.randint(0, 1000), 'reply_count': rnd.randint(0, 100),
+                               'like_count': rnd.randint(0, 10000), 'quote_count': rnd.randint(0, 10)},
+            'entities': {
+                'hashtags': [{'start': 17, 'end': 25, 'tag': 'hashtag'}],
+                'mentions': [{'start': 30, 'end': 38, 'username': 'mention', 'id': rnd.choice(users)['id']}],
+            },
+        }
+        if i % 4 == 0:
+            media_key = '3_{}'.format(tweet_id)
+            tweet['attachments'] = {'media_keys': [media_key]}
+            media.append({'media_key': media_key, 'type': 'photo', 'url': 'https://pbs.twimg.com/media/x.jpg',
+                          'width': 1200, 'height': 800})
+        if i % 5 == 0:
+            quoted = {'id': str(rnd.randint(10 ** 18, 10 ** 19)), 'text': 'quoted tweet',
+                      'author_id': rnd.choice(users)['id'], 'created_at': '2022-09-29T00:00:00.000Z'}
+            tweets.append(quoted)
+            tweet['referenced_tweets'] = [{'type': 'quoted', 'id': quoted['id']}]
+        data.append(tweet)
+    return {
+        'data': data,
+        'includes': {'users': users, 'media': media, 'tweets': tweets},
+        'meta': {'newest_id': data[0]['id'], 'oldest_id': data[-1]['id'], 'result_count': len(data),
+                 'next_token': 'b26v89c19zqg8o3fpzbkk5ivlbpzb1f1lzcb5xwi1c4zh'},
+    }
+
+
+def load_pages(path=None, num_pages=20, page_size=500, seed=42):
+    """Loads the raw pages of the corpus.
+
+    Parameters
+    ----------
+    path: str
+        Path to a directory of recorded pages (``*.json``).
+    num_pages: int
+        The number of synthetic pages to generate if path is not provided.
+    page_size: int
+        The number of tweets per synthetic page.
+    seed: int
+        The random seed of synthetic pages.
+
+    Returns
+    -------
+    pages: list of bytes
+        The raw content of pages.
+    """
+    if path is not None:
+        pages = []
+        for file_path in sorted(glob.glob(os.path.join(path, '*.json'))):
+            with open(file_path, 'rb') as fp:
+                pages.append(fp.read())
+        return pages
+    rnd = random.Random(seed)
+    return [json.dumps(_generate_page(rnd, page_size=page_size)).encode('utf-8') for _ in range(num_pages)]
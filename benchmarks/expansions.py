@@ -0,0 +1,141 @@
+"""Benchmark of looking up the includes of each item of a page.
+
+Compares `TwitterExpansions.get_includes` with the implementation it replaced (`_BaselineExpansions`, copied from
+the previous version of ``tweetkit/models/expansions.py``), which built a `TwitterExpansions` for each item.
+
+Usage (from the root of the repository): ``python -m benchmarks.expansions [path/to/recorded/pages]``
+"""
+import collections.abc
+import json
+import sys
+import timeit
+
+from benchmarks.corpus import load_pages
+from tweetkit.models import TwitterExpansions
+from tweetkit.models.expansions import index_by, mappings
+
+
+class _BaselineExpansions(object):
+    """Previous implementation of `TwitterExpansions` (only `collections` ABCs moved to `collections.abc`)."""
+
+    def __init__(self, includes=None, **kwargs):
+        self._includes = {store_key: {} for store_key in index_by.keys()}
+        if includes is None:
+            includes = {}
+        if 'includes' in includes:
+            includes = includes['includes']
+        for key, value in includes.items():
+            self.add(value, dtype=key)
+        self._next_id = 0
+
+    @property
+    def next_id(self):
+        """next_id"""
+        self._next_id += 1
+        return self._next_id
+
+    def add(self, data, dtype=None):
+        """Add to index."""
+        if data is None:
+            return
+        if isinstance(data, collections.abc.Sequence):
+            for item in data:
+                self.add(item, dtype=dtype)
+        elif isinstance(data, collections.abc.Mapping):
+            if dtype in mappings:
+                store_key = mappings[dtype]
+            else:
+                store_key = dtype
+            if store_key not in self._includes:
+                self._includes[store_key] = {}
+            if store_key in index_by:
+                id_ = data[index_by[store_key]]
+            else:
+                id_ = self.next_id
+            self._includes[store_key][id_] = data
+        else:
+            raise TypeError('expected dict or list, found {}'.format(type(data).__name__))
+
+    def get_includes(self, data):
+        """Gets mapping of includes used in the provided data."""
+        if not isinstance(data, collections.abc.Mapping):
+            raise TypeError('expected dict, found {}'.format(type(data).__name__))
+        expansions = _BaselineExpansions()
+        if 'attachments' in data:
+            attachments = data['attachments']
+            if 'poll_ids' in attachments:
+                poll_ids = attachments['poll_ids']
+                for poll_id in poll_ids:
+                    poll = self._includes['polls'].get(poll_id)
+                    expansions.add(poll, dtype='Poll')
+            if 'media_keys' in attachments:
+                media_keys = attachments['media_keys']
+                for media_key in media_keys:
+                    media_ = self._includes['media'].get(media_key)
+                    expansions.add(media_, dtype='Media')
+        if 'referenced_tweets' in data:
+            referenced_tweets = data['referenced_tweets']
+            for referenced_tweet in referenced_tweets:
+                referenced_tweet_id = referenced_tweet['id']
+                tweet_ = self._includes['tweets'].get(referenced_tweet_id)
+                expansions.add(tweet_, dtype='Tweet')
+        if 'author_id' in data:
+            author_id = data['author_id']
+            user = self._includes['users'].get(author_id)
+            expansions.add(user, dtype='User')
+        if 'in_reply_to_user_id' in data:
+            in_reply_to_user_id = data['in_reply_to_user_id']
+            user = self._includes['users'].get(in_reply_to_user_id)
+            expansions.add(user, dtype='User')
+        if 'geo' in data and 'place_id' in data['geo']:
+            place_id = data['geo']['place_id']
+            place = self._includes['places'].get(place_id)
+            expansions.add(place, dtype='Place')
+        if 'pinned_tweet_id' in data:
+            pinned_tweet_id = data['pinned_tweet_id']
+            tweet_ = self._includes['tweets'].get(pinned_tweet_id)
+            expansions.add(tweet_, dtype='Tweet')
+        if 'host_ids' in data:
+            host_ids = data['host_ids']
+            for host_id in host_ids:
+                host = self._includes['users'].get(host_id)
+                expansions.add(host, dtype='User')
+        if 'invited_user_ids' in data:
+            invited_user_ids = data['invited_user_ids']
+            for invited_user_id in invited_user_ids:
+                invited_user = self._includes['users'].get(invited_user_id)
+                expansions.add(invited_user, dtype='User')
+        if 'speaker_ids' in data:
+            speaker_ids = data['speaker_ids']
+            for speaker_id in speaker_ids:
+                speaker = self._includes['users'].get(speaker_id)
+                expansions.add(speaker, dtype='User')
+        if 'owner_id' in data:
+            owner_id = data['owner_id']
+            owner = self._includes['users'].get(owner_id)
+            expansions.add(owner, dtype='User')
+        includes = {}
+        for key, val in expansions._includes.items():
+            if len(val) > 0:
+                includes[key] = list(val.values())
+        return includes
+
+
+def _run(pages, expansions_type):
+    for page in pages:
+        expansions = expansions_type(page.get('includes'))
+        for item in page['data']:
+            expansions.get_includes(item)
+
+
+def main(path=None, repeat=5):
+    pages = [json.loads(page) for page in load_pages(path)]
+    items = sum(len(page['data']) for page in pages)
+    print('pages: {:d}, items: {:d}'.format(len(pages), items))
+    for name, expansions_type in [('baseline', _BaselineExpansions), ('indexed', TwitterExpansions)]:
+        run_time = min(timeit.repeat(lambda: _run(pages, expansions_type), number=1, repeat=repeat))
+        print('{:>10}: {:8.1f} ms ({:0.2f} us/item)'.format(name, run_time * 1000, run_time * 10 ** 6 / items))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
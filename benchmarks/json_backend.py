@@ -0,0 +1,41 @@
+"""Benchmark of JSON backends on a corpus of pages.
+
+Usage (from the root of the repository): ``python -m benchmarks.json_backend [path/to/recorded/pages]``
+"""
+import sys
+import timeit
+
+import requests
+
+from benchmarks.corpus import load_pages
+from tweetkit.models import TwitterResponse
+from tweetkit.utils import json
+
+
+def _to_response(content):
+    r = requests.Response()
+    r.status_code = 200
+    r.headers['content-type'] = 'application/json; charset=utf-8'
+    r.encoding = 'utf-8'
+    r._content = content
+    return r
+
+
+def main(path=None, repeat=5):
+    pages = load_pages(path)
+    responses = [_to_response(page) for page in pages]
+    size = sum(len(page) for page in pages) / 2 ** 20
+    print('pages: {:d}, size: {:0.1f} MiB'.format(len(pages), size))
+    for backend in json.backends:
+        try:
+            json.set_backend(backend)
+        except ImportError:
+            print('{:>10}: not installed'.format(backend))
+            continue
+        parse_time = min(timeit.repeat(lambda: [TwitterResponse(r) for r in responses], number=1, repeat=repeat))
+        print('{:>10}: {:8.1f} ms ({:0.1f} MiB/s)'.format(backend, parse_time * 1000, size / parse_time))
+    json.set_backend()
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
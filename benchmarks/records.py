@@ -0,0 +1,37 @@
+"""Benchmark of the memory used by records compared to dicts.
+
+Usage (from the root of the repository): ``python -m benchmarks.records [path/to/recorded/pages]``
+"""
+import gc
+import json
+import sys
+import tracemalloc
+
+from benchmarks.corpus import load_pages
+from tweetkit.models import to_record
+
+
+def _measure(create):
+    gc.collect()
+    tracemalloc.start()
+    objects = create()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size
+
+
+def main(path=None):
+    pages = load_pages(path)
+    tweets = sum(len(json.loads(page)['data']) for page in pages)
+    print('pages: {:d}, tweets: {:d}'.format(len(pages), tweets))
+    dict_size = _measure(lambda: [json.loads(page)['data'] for page in pages])
+    record_size = _measure(lambda: [to_record(json.loads(page)['data'], 'Tweet') for page in pages])
+    for name, size in [('dict', dict_size), ('record', record_size)]:
+        print('{:>10}: {:8.1f} MiB ({:0.0f} MiB per million tweets)'.format(
+            name, size / 2 ** 20, size / 2 ** 20 * 10 ** 6 / tweets))
+    print('reduction: {:0.1f}x'.format(dict_size / record_size))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
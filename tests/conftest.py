@@ -0,0 +1,12 @@
+import pytest
+
+from helpers import FakeTime
+
+
+@pytest.fixture
+def fake_time(monkeypatch):
+    """Records the delays of reconnecting streams instead of sleeping."""
+    from tweetkit.models import stream
+    fake = FakeTime()
+    monkeypatch.setattr(stream, 'time', fake)
+    return fake
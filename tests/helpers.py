@@ -0,0 +1,146 @@
+"""Stubs of HTTP sessions and responses shared by the tests."""
+import io
+import json
+import time
+
+import requests
+
+from tweetkit.models import AsyncTwitterRequest, AsyncTwitterSession, TwitterRequest, TwitterRequestScheduler
+
+
+def make_response(status_code=200, body=None, headers=None, lines=None, raw=None, url='https://api.twitter.com/2/'):
+    """Creates a response with a JSON (or raw bytes) body, or a stream of lines."""
+    r = requests.Response()
+    r.status_code = status_code
+    r.url = url
+    r.encoding = 'utf-8'
+    if headers is not None:
+        r.headers.update(headers)
+    if lines is not None or raw is not None:
+        # streaming response (no content type as returned by the stream endpoints)
+        if raw is None:
+            raw = io.BytesIO(b''.join(line + b'\r\n' for line in lines))
+        r.raw = raw
+        r._content = False
+        r._content_consumed = False
+        return r
+    if isinstance(body, (dict, list)):
+        r.headers.setdefault('content-type', 'application/json; charset=utf-8')
+        body = json.dumps(body).encode('utf-8')
+    r._content = b'' if body is None else body
+    r._content_consumed = True
+    return r
+
+
+def make_page(ids, next_token=None, **meta):
+    """Creates a page of tweets."""
+    meta = dict(meta, result_count=len(ids))
+    if next_token is not None:
+        meta['next_token'] = next_token
+    data = [{'id': str(id_), 'text': 'tweet {}'.format(id_)} for id_ in ids]
+    return make_response(body={'data': data, 'meta': meta} if len(ids) > 0 else {'meta': meta})
+
+
+def make_pages(*pages):
+    """Creates the responses of consecutive pages (e.g., ``make_pages([1, 2], [3])``)."""
+    return [make_page(ids, next_token='token{}'.format(i + 1) if i + 1 < len(pages) else None)
+            for i, ids in enumerate(pages)]
+
+
+def make_line(id_, **fields):
+    """Creates a stream message of a tweet."""
+    return json.dumps({'data': dict(fields, id=str(id_), text='tweet {}'.format(id_))}).encode('utf-8')
+
+
+class FailingReader(object):
+    """Raw stream which returns the data and then raises an error (e.g., a disconnect or a read timeout)."""
+
+    def __init__(self, data, error):
+        self._data = io.BytesIO(data)
+        self._error = error
+
+    def read(self, size=-1, **kwargs):
+        chunk = self._data.read(size)
+        if len(chunk) == 0:
+            raise self._error
+        return chunk
+
+    def close(self):
+        pass
+
+
+class HeartbeatReader(object):
+    """Raw stream which only sends heartbeats until it is closed."""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.closed = False
+
+    def read(self, size=-1, **kwargs):
+        if self.closed:
+            raise requests.exceptions.ConnectionError('connection closed')
+        time.sleep(self.interval)
+        return b'\r\n'
+
+    def close(self):
+        self.closed = True
+
+
+class StubSession(object):
+    """Session returning queued responses (or raising queued errors) and recording the requests."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def request(self, method, url, params=None, json=None, **kwargs):
+        self.calls.append({'method': method, 'url': url, 'params': dict(params or {}), 'json': json})
+        if len(self.responses) == 0:
+            raise AssertionError('unexpected request to {}'.format(url))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+class AsyncStubSession(AsyncTwitterSession):
+    """Asynchronous session sending requests to a mock transport which returns queued responses."""
+
+    def __init__(self, *responses):
+        import httpx
+        super(AsyncStubSession, self).__init__()
+        self.responses = list(responses)
+        self.calls = []
+        self.client = httpx.AsyncClient(transport=httpx.MockTransport(self._handle))
+
+    def _handle(self, request):
+        import httpx
+        self.calls.append({'method': request.method, 'url': str(request.url.copy_with(query=None)),
+                           'params': dict(request.url.params)})
+        if len(self.responses) == 0:
+            raise AssertionError('unexpected request to {}'.format(request.url))
+        r = self.responses.pop(0)
+        # the content is read through the stream as with a network response
+        return httpx.Response(r.status_code, headers=dict(r.headers), stream=httpx.ByteStream(r.content))
+
+
+def make_request(session, url='https://api.twitter.com/2/tweets/search/stream', query=None, stream=False,
+                 scheduler=None, **kwargs):
+    """Creates a request sent with the session (without waiting for rate limits)."""
+    if scheduler is None:
+        scheduler = TwitterRequestScheduler(mode='reset')
+    request_type = AsyncTwitterRequest if isinstance(session, AsyncTwitterSession) else TwitterRequest
+    return request_type(url, query={} if query is None else query, params={}, stream=stream, session=session,
+                          scheduler=scheduler, **kwargs)
+
+
+class FakeTime(object):
+    """Replacement of the time module of a module recording (instead of sleeping) the delays."""
+
+    def __init__(self):
+        self.delays = []
+        self.time = time.time
+        self.monotonic = time.monotonic
+
+    def sleep(self, delay):
+        self.delays.append(delay)
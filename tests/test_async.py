@@ -0,0 +1,98 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from helpers import AsyncStubSession, make_line, make_pages, make_response
+from tweetkit.auth import BearerTokenAuth
+from tweetkit.client import AsyncTwitterClient
+from tweetkit.exceptions import TwitterProblem, TwitterRequestException
+from tweetkit.models import SQLiteStateBackend, TwitterRequestScheduler
+
+pytest.importorskip('httpx')
+
+
+def make_client(*responses, backend=None):
+    client = AsyncTwitterClient(BearerTokenAuth('token'), scheduler=TwitterRequestScheduler(mode='reset',
+                                                                                            backend=backend))
+    client.session = AsyncStubSession(*responses)
+    return client
+
+
+def test_endpoint_methods_are_awaitable():
+    async def run():
+        client = make_client(make_response(body={'data': {'id': '20', 'text': 'just setting up my twttr'}}))
+        async with client:
+            resp = await client.tweets.find_tweet_by_id('20')
+        return resp, client.session.calls
+
+    resp, calls = asyncio.run(run())
+    assert resp.data['id'] == '20'
+    assert calls[0]['url'] == 'https://api.twitter.com/2/tweets/20'
+
+
+def test_concurrent_requests():
+    async def run():
+        client = make_client(*[make_response(body={'data': {'id': str(i)}}) for i in range(3)])
+        responses = await asyncio.gather(*[client.tweets.find_tweet_by_id(str(i)) for i in range(3)])
+        await client.aclose()
+        return sorted(resp.data['id'] for resp in responses)
+
+    assert asyncio.run(run()) == ['0', '1', '2']
+
+
+def test_errors_are_raised():
+    async def run(response):
+        client = make_client(response)
+        await client.tweets.find_tweet_by_id('20')
+
+    problem = {'title': 'Unauthorized', 'type': 'about:blank', 'status': 401, 'detail': 'Unauthorized'}
+    with pytest.raises(TwitterProblem):
+        asyncio.run(run(make_response(401, body=problem)))
+    with pytest.raises(TwitterRequestException):
+        asyncio.run(run(make_response(503, body=b'<html></html>', headers={'content-type': 'text/html'})))
+
+
+def test_async_paginator():
+    async def run():
+        client = make_client(*make_pages([1, 2], [3]))
+        paginator = client.tweets.tweets_recent_search('tweetkit', paginate=True)
+        return [item['data']['id'] async for item in paginator.content], client.session.calls
+
+    ids, calls = asyncio.run(run())
+    assert ids == ['1', '2', '3']
+    assert [call['params'].get('next_token') for call in calls] == [None, 'token1']
+
+
+def test_async_stream():
+    async def run():
+        client = make_client(make_response(lines=[make_line(1), b'', make_line(2)]))
+        stream = await client.tweets.search_stream()
+        return [resp.data['id'] async for resp in stream]
+
+    assert asyncio.run(run()) == ['1', '2']
+
+
+def test_shared_state_does_not_block_the_event_loop(tmp_path):
+    path = str(tmp_path / 'state.db')
+    backend = SQLiteStateBackend(path, timeout=2.0)
+
+    async def run():
+        client = make_client(make_response(body={'data': {'id': '20'}}), backend=backend)
+        # another process holds the lock of the state
+        conn = sqlite3.connect(path, isolation_level=None)
+        conn.execute('BEGIN IMMEDIATE')
+        task = asyncio.ensure_future(client.tweets.find_tweet_by_id('20'))
+        ticks = 0
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+            ticks += 1
+        conn.execute('COMMIT')
+        conn.close()
+        resp = await task
+        await client.aclose()
+        return ticks, resp
+
+    ticks, resp = asyncio.run(run())
+    assert ticks == 5
+    assert resp.data['id'] == '20'
@@ -0,0 +1,88 @@
+import json
+
+from helpers import make_request, make_response, StubSession
+from tweetkit.models import EntityCache, TwitterResponse
+
+URL = 'https://api.twitter.com/2/tweets/search/recent'
+
+USERS = [{'id': '10', 'username': 'a'}, {'id': '11', 'username': 'b'}]
+
+
+def make_tweet(id_, author_id):
+    return {'id': str(id_), 'text': 'tweet {}'.format(id_), 'author_id': author_id}
+
+
+def test_includes_resolve_across_pages():
+    cache = EntityCache()
+    session = StubSession(
+        make_response(body={'data': [make_tweet(1, '10')], 'includes': {'users': USERS[:1]},
+                            'meta': {'result_count': 1, 'next_token': 'token1'}}),
+        # the author was included in the first page only
+        make_response(body={'data': [make_tweet(2, '10'), make_tweet(3, '11')], 'includes': {'users': USERS[1:]},
+                            'meta': {'result_count': 2}}),
+    )
+    paginator = make_request(session, url=URL, query={'query': 'tweetkit'}, cache=cache).send(paginate=True)
+    pages = list(paginator)
+    assert [tweet['author'] for tweet in pages[1].expand()] == USERS
+    assert pages[1].content[0]['includes'] == {'users': USERS[:1]}
+    assert [page.expansions.new_includes for page in pages] == [{'users': USERS[:1]}, {'users': USERS[1:]}]
+    assert cache.stats['entities'] == {'users': 2}
+
+
+def test_includes_resolve_across_stream_messages():
+    cache = EntityCache()
+    lines = [json.dumps(message).encode('utf-8') for message in [
+        {'data': make_tweet(1, '10'), 'includes': {'users': USERS[:1]}},
+        {'data': make_tweet(2, '10')},
+    ]]
+    stream = make_request(StubSession(make_response(lines=lines)), stream=True, cache=cache).send()
+    assert [resp.expand()['author'] for resp in stream] == [USERS[0], USERS[0]]
+
+
+def test_least_recently_used_entities_are_evicted():
+    cache = EntityCache(maxsize=2)
+    assert cache.add('users', '1', {'id': '1'})
+    assert cache.add('users', '2', {'id': '2'})
+    assert not cache.add('users', '1', {'id': '1'})
+    cache.add('users', '3', {'id': '3'})
+    # the maximum size is per type of entity
+    cache.add('tweets', '1', {'id': '1'})
+    assert ('users', '2') not in cache
+    assert ('users', '1') in cache and ('tweets', '1') in cache
+    assert cache.get('users', '1') == {'id': '1'}
+    cache.add('users', '4', {'id': '4'})
+    assert ('users', '3') not in cache
+    assert len(cache) == 3
+
+
+def test_stats():
+    cache = EntityCache()
+    assert cache.stats['hit_rate'] is None
+    cache.add('users', '1', {'id': '1'})
+    cache.get('users', '1')
+    cache.get('users', '2')
+    cache.get('tweets', '1')
+    assert cache.stats == {'entities': {'users': 1}, 'hits': 1, 'misses': 2, 'hit_rate': 1 / 3}
+    cache.clear()
+    assert cache.stats == {'entities': {}, 'hits': 0, 'misses': 0, 'hit_rate': None}
+
+
+def test_cache_is_not_checkpointed():
+    request = make_request(StubSession(), url=URL, query={'query': 'tweetkit'}, cache=EntityCache(), dtype='Tweet')
+    state = request.send(paginate=True).get_state('token1')
+    assert state['kwargs'] == {'dtype': 'Tweet'}
+    json.dumps(state)
+
+
+def test_lazy_responses_are_indexed_on_first_access():
+    cache = EntityCache()
+    body = {'data': [make_tweet(1, '10')], 'includes': {'users': USERS[:1]}, 'meta': {'result_count': 1}}
+    resp = TwitterResponse(make_response(body=body), lazy=True, cache=cache)
+    # the content is not decoded by the cache
+    assert resp._raw is not None
+    assert len(cache) == 0
+    assert resp.meta == {'result_count': 1}
+    assert resp._raw is not None
+    resp.data
+    assert resp._raw is None
+    assert ('users', '10') in cache
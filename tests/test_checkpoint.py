@@ -0,0 +1,88 @@
+import itertools
+
+import pytest
+
+from helpers import make_pages, make_request, StubSession
+from tweetkit.auth import BearerTokenAuth
+from tweetkit.client import TwitterClient
+from tweetkit.models import FileCheckpointStore, Paginator, SQLiteCheckpointStore, TwitterRequestScheduler
+
+URL = 'https://api.twitter.com/2/tweets/search/recent'
+
+
+@pytest.fixture(params=['file', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'file':
+        return FileCheckpointStore(str(tmp_path / 'checkpoints'))
+    return SQLiteCheckpointStore(str(tmp_path / 'checkpoints.db'))
+
+
+def make_paginator(session, store, **kwargs):
+    return make_request(session, url=URL, query={'query': 'tweetkit'}).send(paginate=True, checkpoint=store,
+                                                                            **kwargs)
+
+
+def get_ids(pages):
+    return [item['id'] for page in pages for item in page.data]
+
+
+def test_store_save_load_delete(store):
+    assert store.load('key') is None
+    store.save('key', {'next_token': 'a'})
+    store.save('key', {'next_token': 'b'})
+    assert store.load('key') == {'next_token': 'b'}
+    store.delete('key')
+    store.delete('key')
+    assert store.load('key') is None
+
+
+def test_resume_interrupted_run(store):
+    session = StubSession(*make_pages([1], [2], [3]))
+    paginator = make_paginator(session, store)
+    assert get_ids(itertools.islice(paginator, 2)) == ['1', '2']
+    state = store.load(paginator.checkpoint_key)
+    assert state['next_token'] == 'token2'
+    assert state['pages'] == 2
+    # a new paginator of the same request resumes after the pages returned before
+    session = StubSession(*make_pages([1], [2], [3])[2:])
+    paginator = make_paginator(session, store)
+    assert get_ids(paginator) == ['3']
+    assert session.calls[0]['params']['next_token'] == 'token2'
+    assert paginator.pages == 3
+    assert paginator.items == 3
+
+
+def test_completed_run_is_not_resumed(store):
+    paginator = make_paginator(StubSession(*make_pages([1], [2])), store)
+    assert get_ids(paginator) == ['1', '2']
+    assert store.load(paginator.checkpoint_key) is None
+    # a later run of the same request starts from the first page
+    paginator = make_paginator(StubSession(*make_pages([1], [2])), store)
+    assert get_ids(paginator) == ['1', '2']
+
+
+def test_completed_checkpoint_is_ignored(store):
+    paginator = make_paginator(StubSession(*make_pages([1])), store)
+    store.save(paginator.checkpoint_key, paginator.get_state(None, False))
+    assert get_ids(paginator) == ['1']
+    assert store.load(paginator.checkpoint_key) is None
+
+
+def test_checkpoint_every(store):
+    session = StubSession(*make_pages([1], [2], [3], [4]))
+    paginator = make_paginator(session, store, checkpoint_every=2)
+    assert get_ids(itertools.islice(paginator, 3)) == ['1', '2', '3']
+    assert store.load(paginator.checkpoint_key)['next_token'] == 'token2'
+
+
+def test_from_checkpoint(store):
+    client = TwitterClient(BearerTokenAuth('token'), scheduler=TwitterRequestScheduler(mode='reset'))
+    client.session = StubSession(*make_pages([1], [2]))
+    paginator = client.request('/2/tweets/search/recent', query={'query': 'tweetkit'}, params={}, paginate=True,
+                               checkpoint=store, checkpoint_key='search')
+    assert get_ids(itertools.islice(paginator, 1)) == ['1']
+    client.session = StubSession(*make_pages([1], [2])[1:])
+    paginator = Paginator.from_checkpoint(client, store, 'search')
+    assert get_ids(paginator) == ['2']
+    with pytest.raises(KeyError):
+        Paginator.from_checkpoint(client, store, 'search')
@@ -0,0 +1,83 @@
+import pytest
+
+from helpers import make_request, make_response, StubSession
+from tweetkit.models import to_columns, TwitterResponse
+
+np = pytest.importorskip('numpy')
+
+TWEETS = [
+    {'id': '1', 'text': 'a', 'created_at': '2022-10-17T12:00:00.000Z',
+     'public_metrics': {'retweet_count': 1, 'reply_count': 2, 'like_count': 3, 'quote_count': 4}},
+    {'id': '2', 'text': 'b'},
+]
+
+FIELDS = ['id', 'created_at', 'public_metrics.*', 'entities']
+
+
+def test_list_columns():
+    columns = to_columns(TWEETS, ['id', 'public_metrics.like_count', 'missing'], output='list', dtype='Tweet')
+    assert columns == {'id': ['1', '2'], 'public_metrics.like_count': [3, None], 'missing': [None, None]}
+
+
+def test_wildcard_expands_to_declared_fields():
+    columns = to_columns(TWEETS[1:], FIELDS, output='list', dtype='Tweet')
+    assert list(columns) == ['id', 'created_at', 'public_metrics.retweet_count', 'public_metrics.reply_count',
+                             'public_metrics.like_count', 'public_metrics.quote_count',
+                             'public_metrics.bookmark_count', 'public_metrics.impression_count', 'entities']
+    with pytest.raises(ValueError):
+        to_columns(TWEETS, ['public_metrics.*'])
+
+
+def test_numpy_schema_does_not_depend_on_page():
+    full = to_columns(TWEETS[:1], FIELDS, dtype='Tweet')
+    gaps = to_columns(TWEETS, FIELDS, dtype='Tweet')
+    empty = to_columns([], FIELDS, dtype='Tweet')
+    for batch in (gaps, empty):
+        assert list(batch) == list(full)
+        assert [column.dtype for column in batch.values()] == [column.dtype for column in full.values()]
+    assert full['public_metrics.like_count'].dtype == np.float64
+    assert np.isnan(gaps['public_metrics.like_count'][1])
+    assert gaps['created_at'].dtype == np.dtype('datetime64[ms]')
+    assert np.isnat(gaps['created_at'][1])
+    assert gaps['id'].dtype == object
+
+
+def test_arrow_schema_does_not_depend_on_page():
+    pa = pytest.importorskip('pyarrow')
+    full = to_columns(TWEETS[:1], FIELDS, output='arrow', dtype='Tweet')
+    gaps = to_columns(TWEETS, FIELDS, output='arrow', dtype='Tweet')
+    empty = to_columns([], FIELDS, output='arrow', dtype='Tweet')
+    assert gaps.schema == full.schema
+    assert empty.schema == full.schema
+    assert empty.num_rows == 0
+    assert full.schema.field('public_metrics.like_count').type == pa.int64()
+    assert full.schema.field('created_at').type == pa.timestamp('ms', tz='UTC')
+    # nested objects are encoded as JSON
+    assert full.schema.field('entities').type == pa.string()
+    assert gaps.column('public_metrics.like_count').to_pylist() == [3, None]
+
+
+def test_declared_types_of_fields():
+    columns = to_columns(TWEETS, {'id': 'int', 'created_at': None}, dtype='Tweet')
+    assert columns['id'].tolist() == [1.0, 2.0]
+    assert columns['created_at'].dtype == np.dtype('datetime64[ms]')
+    with pytest.raises(ValueError):
+        to_columns(TWEETS, {'id': 'number'})
+
+
+def test_response_to_columns_uses_dtype():
+    resp = TwitterResponse(make_response(body={'data': TWEETS}), dtype='Tweet')
+    assert resp.to_columns(['public_metrics.*'], output='list')['public_metrics.like_count'] == [3, None]
+    empty = TwitterResponse(make_response(body={'meta': {'result_count': 0}}), dtype='Tweet')
+    assert empty.to_columns(['id', 'public_metrics.like_count'])['public_metrics.like_count'].dtype == np.float64
+
+
+def test_paginator_batches():
+    session = StubSession(
+        make_response(body={'data': TWEETS[:1], 'meta': {'result_count': 1, 'next_token': 'token1'}}),
+        make_response(body={'data': TWEETS[1:], 'meta': {'result_count': 1}}),
+    )
+    paginator = make_request(session, query={}, dtype='Tweet').send(paginate=True)
+    batches = list(paginator.batches(FIELDS))
+    assert len(batches) == 2
+    assert [column.dtype for column in batches[0].values()] == [column.dtype for column in batches[1].values()]
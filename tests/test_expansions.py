@@ -0,0 +1,111 @@
+import pytest
+
+from helpers import make_response
+from tweetkit.models import ExpandedView, TwitterExpansions, TwitterResponse
+from tweetkit.models import response as response_module
+
+BODY = {
+    'data': [
+        {'id': '1', 'text': 'a', 'author_id': '10', 'attachments': {'media_keys': ['3_1']},
+         'referenced_tweets': [{'type': 'quoted', 'id': '2'}]},
+        {'id': '3', 'text': 'b', 'author_id': '11', 'in_reply_to_user_id': '10', 'geo': {'place_id': 'p1'}},
+    ],
+    'includes': {
+        'users': [{'id': '10', 'username': 'a'}, {'id': '11', 'username': 'b'}, {'id': '12', 'username': 'c'}],
+        'tweets': [{'id': '2', 'text': 'quoted', 'author_id': '12'}],
+        'media': [{'media_key': '3_1', 'type': 'photo'}],
+        'places': [{'id': 'p1', 'full_name': 'Place'}],
+    },
+    'meta': {'result_count': 2},
+}
+
+
+def make_tweets():
+    return TwitterResponse(make_response(body=BODY), dtype='Tweet')
+
+
+def test_expansions_are_built_once_per_response(monkeypatch):
+    built = []
+    expansions_type = response_module.TwitterExpansions
+
+    def create(*args, **kwargs):
+        built.append(args)
+        return expansions_type(*args, **kwargs)
+
+    monkeypatch.setattr(response_module, 'TwitterExpansions', create)
+    resp = make_tweets()
+    first, second = resp.content, resp.content
+    assert first == second
+    assert resp.expansions is resp.expansions
+    resp.expand()
+    assert len(built) == 1
+
+
+def test_content_includes_only_referenced_entities():
+    content = make_tweets().content
+    assert content[0]['includes'] == {
+        'media': [{'media_key': '3_1', 'type': 'photo'}],
+        'tweets': [{'id': '2', 'text': 'quoted', 'author_id': '12'}],
+        'users': [{'id': '10', 'username': 'a'}],
+    }
+    assert content[1]['includes'] == {
+        'places': [{'id': 'p1', 'full_name': 'Place'}],
+        'users': [{'id': '11', 'username': 'b'}, {'id': '10', 'username': 'a'}],
+    }
+
+
+def test_get_includes_without_references():
+    expansions = TwitterExpansions(BODY['includes'])
+    assert expansions.get_includes({'id': '4', 'text': 'c'}) == {}
+    assert expansions.get_includes({'id': '5', 'author_id': 'missing'}) == {}
+    with pytest.raises(TypeError):
+        expansions.get_includes([{'id': '1'}])
+
+
+def test_references_are_computed_once_per_item():
+    expansions = TwitterExpansions(BODY['includes'])
+    expansions.index_references(BODY['data'])
+    references = expansions.get_references(BODY['data'][0])
+    assert references == (('media', '3_1'), ('tweets', '2'), ('users', '10'))
+    assert expansions.get_references(BODY['data'][0]) is references
+
+
+def test_expanded_views_match_expanded_copies():
+    resp = make_tweets()
+    views = resp.expand(view=True)
+    assert all(isinstance(view, ExpandedView) for view in views)
+    assert [view.to_dict() for view in views] == resp.expand()
+    # the data is not copied
+    assert views[0]['attachments']['media_keys'] is resp.data[0]['attachments']['media_keys']
+    assert views[0]['author'] is resp.expansions.get('users', '10')
+    assert 'author' not in resp.data[0]
+
+
+def test_expanded_views_resolve_on_access():
+    expansions = TwitterExpansions(BODY['includes'])
+    view = expansions.expand(BODY['data'][1], view=True)
+    assert view._values == {}
+    assert view['in_reply_to_user'] == {'id': '10', 'username': 'a'}
+    assert list(view._values) == ['in_reply_to_user']
+    assert len(view) == len(list(view)) == len(BODY['data'][1]) + 2
+    with pytest.raises(TypeError):
+        view['text'] = 'c'
+
+
+def test_expanded_view_of_tweet_referencing_itself():
+    tweet = {'id': '1', 'text': 'a', 'referenced_tweets': [{'type': 'quoted', 'id': '1'}]}
+    view = TwitterExpansions().expand(tweet, view=True)
+    assert view['referenced_tweets'][0] is view
+    assert view.to_dict()['referenced_tweets'][0] is tweet
+
+
+@pytest.mark.parametrize('dtype, data, expanded', [
+    ('User', {'id': '10', 'pinned_tweet_id': '2'}, {'pinned_tweet': BODY['includes']['tweets'][0]}),
+    ('Space', {'id': 's1', 'host_ids': ['10'], 'speaker_ids': ['11', '12']},
+     {'hosts': BODY['includes']['users'][:1], 'speakers': BODY['includes']['users'][1:]}),
+    ('List', {'id': 'l1', 'owner_id': '12'}, {'owner': BODY['includes']['users'][2]}),
+])
+def test_expanded_views_by_dtype(dtype, data, expanded):
+    expansions = TwitterExpansions(BODY['includes'])
+    view = expansions.expand(data, dtype=dtype, view=True)
+    assert view.to_dict() == dict(data, **expanded) == expansions.expand(data, dtype=dtype)
@@ -0,0 +1,65 @@
+import json as simplejson
+
+import pytest
+
+from helpers import make_response
+from tweetkit.exceptions import JSONDecodeError
+from tweetkit.utils import json
+
+OBJ = {'a': 'é', 'b': [1, 2], 'c': {'d': None}}
+
+
+@pytest.fixture
+def backend():
+    yield
+    json.set_backend()
+
+
+@pytest.mark.parametrize('name', json.backends)
+def test_dumps_does_not_depend_on_backend(name, backend):
+    try:
+        json.set_backend(name)
+    except ImportError:
+        pytest.skip('{} is not installed'.format(name))
+    assert json.dumps(OBJ) == simplejson.dumps(OBJ)
+    assert json.dumps(OBJ, indent=2) == simplejson.dumps(OBJ, indent=2)
+    assert json._dumpb(OBJ) == simplejson.dumps(OBJ).encode('utf-8')
+
+
+@pytest.mark.parametrize('name', json.backends)
+def test_loads_with_backend(name, backend):
+    try:
+        json.set_backend(name)
+    except ImportError:
+        pytest.skip('{} is not installed'.format(name))
+    assert json.get_backend() == name
+    content = simplejson.dumps(OBJ).encode('utf-8')
+    assert json.loads(content) == OBJ
+    assert json.loads(content.decode('utf-8')) == OBJ
+    assert json.loads(make_response(body=OBJ)) == OBJ
+    with pytest.raises(JSONDecodeError):
+        json.loads(b'<html></html>')
+
+
+def test_loads_response_in_other_encoding():
+    r = make_response(body=simplejson.dumps(OBJ, ensure_ascii=False).encode('latin-1'))
+    r.encoding = 'latin-1'
+    assert json.loads(r) == OBJ
+
+
+def test_encoding_with_backend_is_opt_in(backend):
+    orjson = pytest.importorskip('orjson')
+    json.set_backend('orjson', encode=True)
+    assert json.dumps(OBJ) == orjson.dumps(OBJ).decode('utf-8')
+    assert json._dumpb(OBJ) == orjson.dumps(OBJ)
+    # objects which are not supported by the backend are encoded with the standard library
+    assert json.dumps({1: 'a'}) == simplejson.dumps({1: 'a'})
+
+
+def test_dump_json_lines(tmp_path):
+    path = tmp_path / 'items.jsonl'
+    json.dump(iter([OBJ, OBJ]), path)
+    assert path.read_text(encoding='utf-8') == '{}\n'.format(simplejson.dumps(OBJ)) * 2
+    path = tmp_path / 'items.json'
+    json.dump([OBJ], path)
+    assert path.read_text(encoding='utf-8') == simplejson.dumps([OBJ])
@@ -0,0 +1,103 @@
+import time
+
+from helpers import make_line, make_response
+from tweetkit.models import RawStreamResponse, StreamMonitor, TwitterStreamResponse
+
+
+def wait_until(predicate, timeout=5.0):
+    start = time.monotonic()
+    while not predicate():
+        if time.monotonic() - start > timeout:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_stall_of_one_connection_is_detected():
+    stalls = []
+    monitor = StreamMonitor(stall_timeout=0.2, on_stall=stalls.append)
+    active, stalled = monitor.connected('active'), monitor.connected('stalled')
+    # the active connection keeps receiving data while the other connection receives nothing
+    start = time.monotonic()
+    while len(stalls) == 0 and time.monotonic() - start < 5.0:
+        monitor.add_messages(active, 100)
+        time.sleep(0.02)
+    assert len(stalls) == 1
+    stats = monitor.stats
+    assert stats['stalled']
+    assert stats['stalls'] == 1
+    assert [c['stalled'] for c in stats['connections']] == [False, True]
+    monitor.disconnected(active)
+    monitor.disconnected(stalled)
+    assert not monitor.stalled
+
+
+def test_resume_after_stall():
+    resumed = []
+    monitor = StreamMonitor(stall_timeout=0.05, on_resume=resumed.append)
+    connection = monitor.connected()
+    assert wait_until(lambda: monitor.stalled)
+    monitor.add_heartbeat(connection)
+    assert not monitor.stalled
+    assert len(resumed) == 1
+    assert monitor.stats['stalled_seconds'] > 0.05
+    monitor.disconnected(connection)
+
+
+def test_heartbeat_intervals_are_per_connection():
+    monitor = StreamMonitor(stall_timeout=None)
+    first, second = monitor.connected(), monitor.connected()
+    monitor.add_heartbeat(first)
+    time.sleep(0.1)
+    monitor.add_heartbeat(second)
+    # the interval between the heartbeats of different connections is not a heartbeat interval
+    assert monitor.stats['heartbeat_interval'] is None
+    time.sleep(0.1)
+    monitor.add_heartbeat(first)
+    assert monitor.stats['heartbeat_interval'] >= 0.2
+    assert monitor.stats['heartbeats'] == 3
+
+
+def test_disconnect_is_recorded_once():
+    monitor = StreamMonitor(stall_timeout=None)
+    connection = monitor.connected()
+    monitor.disconnected(connection)
+    monitor.disconnected(connection)
+    assert monitor.stats['connected'] is False
+    assert monitor.stats['connects'] == 1
+
+
+def test_lag_callback():
+    lags = []
+    monitor = StreamMonitor(stall_timeout=None, max_lag=60.0, on_lag=lags.append)
+    monitor.add_created_at('2020-01-01T00:00:00.000Z')
+    monitor.add_created_at('2020-01-01T00:00:00Z')
+    assert len(lags) == 1
+    assert monitor.stats['lagging']
+    assert monitor.stats['lag'] > 60.0
+    # invalid timestamps are ignored
+    monitor.add_created_at('not a timestamp')
+    assert len(monitor._lags) == 2
+
+
+def test_stream_response_records_lines():
+    monitor = StreamMonitor(stall_timeout=None)
+    lines = [make_line(1, created_at='2020-01-01T00:00:00.000Z'), b'', make_line(2)]
+    stream = TwitterStreamResponse(make_response(lines=lines), monitor=monitor)
+    assert [resp.data['id'] for resp in stream] == ['1', '2']
+    stats = monitor.stats
+    assert stats['messages'] == 2
+    assert stats['heartbeats'] == 1
+    assert stats['lag'] is not None
+    # the connection ended with the stream
+    assert stats['connected'] is False
+
+
+def test_raw_stream_records_chunks():
+    monitor = StreamMonitor(stall_timeout=None)
+    stream = RawStreamResponse(iter([make_line(1) + b'\r\n\r\n' + make_line(2) + b'\r\n']), monitor=monitor)
+    assert len(b''.join(stream)) > 0
+    stats = monitor.stats
+    assert stats['messages'] == 2
+    assert stats['heartbeats'] == 1
+    assert stats['connected'] is False
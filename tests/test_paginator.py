@@ -0,0 +1,110 @@
+import asyncio
+import gc
+import time
+
+import pytest
+
+from helpers import AsyncStubSession, make_pages, make_request, StubSession
+
+URL = 'https://api.twitter.com/2/tweets/search/recent'
+
+
+def make_paginator(session, prefetch=0, **kwargs):
+    return make_request(session, url=URL, query={'query': 'tweetkit'}).send(paginate=True, prefetch=prefetch,
+                                                                            **kwargs)
+
+
+def wait_until(predicate, timeout=5.0):
+    start = time.monotonic()
+    while not predicate():
+        if time.monotonic() - start > timeout:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.mark.parametrize('prefetch', [0, 2])
+def test_pages(prefetch):
+    session = StubSession(*make_pages([1, 2], [3, 4], [5]))
+    paginator = make_paginator(session, prefetch=prefetch)
+    assert [item['data']['id'] for item in paginator.content] == ['1', '2', '3', '4', '5']
+    assert [call['params'].get('next_token') for call in session.calls] == [None, 'token1', 'token2']
+    assert paginator.pages == 3
+    assert paginator.items == 5
+
+
+def test_prefetch_fetches_ahead():
+    session = StubSession(*make_pages([1], [2], [3], [4]))
+    paginator = make_paginator(session, prefetch=2)
+    assert next(iter(paginator)).data[0]['id'] == '1'
+    # the following pages are fetched while the first page is processed (up to the size of the queue)
+    assert wait_until(lambda: len(session.calls) == 4)
+    paginator.close()
+
+
+def test_prefetch_error_is_raised():
+    session = StubSession(*make_pages([1], [2])[:1], ConnectionError('connection reset'))
+    paginator = make_paginator(session, prefetch=1)
+    with pytest.raises(ConnectionError):
+        list(paginator)
+    assert paginator._worker is None
+
+
+def test_abandoned_prefetch_stops_worker():
+    session = StubSession(*make_pages([1], [2], [3], [4], [5], [6]))
+    paginator = make_paginator(session, prefetch=1)
+    for _ in paginator:
+        break
+    worker = paginator._worker
+    # the worker waits for the consumer with a full queue
+    assert wait_until(lambda: len(session.calls) == 3)
+    del paginator
+    gc.collect()
+    worker.join(timeout=5.0)
+    assert not worker.is_alive()
+    assert len(session.calls) == 3
+
+
+def test_abandoned_content_stops_worker():
+    session = StubSession(*make_pages([1, 2], [3], [4], [5], [6]))
+    paginator = make_paginator(session, prefetch=1)
+    content = paginator.content
+    assert next(content)['data']['id'] == '1'
+    worker = paginator._worker
+    del content
+    gc.collect()
+    assert not worker.is_alive()
+    assert paginator._worker is None
+
+
+def test_async_pages():
+    pytest.importorskip('httpx')
+
+    async def run(prefetch):
+        session = AsyncStubSession(*make_pages([1, 2], [3], [4]))
+        paginator = make_paginator(session, prefetch=prefetch)
+        return [item['data']['id'] async for item in paginator.content]
+
+    assert asyncio.run(run(0)) == ['1', '2', '3', '4']
+    assert asyncio.run(run(2)) == ['1', '2', '3', '4']
+
+
+def test_async_abandoned_prefetch_cancels_task():
+    pytest.importorskip('httpx')
+
+    async def run():
+        session = AsyncStubSession(*make_pages([1], [2], [3], [4], [5]))
+        paginator = make_paginator(session, prefetch=1)
+        async for _ in paginator:
+            break
+        task = paginator._worker
+        for _ in range(10):
+            await asyncio.sleep(0)
+        del paginator
+        gc.collect()
+        await asyncio.sleep(0)
+        return task, len(session.calls)
+
+    task, calls = asyncio.run(run())
+    assert task.cancelled()
+    assert calls == 3
@@ -0,0 +1,72 @@
+import pickle
+
+import pytest
+
+from helpers import make_response
+from tweetkit.models import Record, to_record, TwitterResponse
+from tweetkit.models.records import Tweet, User
+
+TWEET = {
+    'id': '1', 'text': 'a', 'lang': 'en', 'author_id': '10',
+    'public_metrics': {'retweet_count': 1, 'like_count': 2},
+    'entities': {'hashtags': [{'start': 0, 'end': 2, 'tag': 'a'}]},
+    'note_tweet': {'text': 'a longer text'},
+}
+
+
+def test_fields():
+    tweet = Tweet(TWEET)
+    assert (tweet.id, tweet.text, tweet.author_id) == ('1', 'a', '10')
+    # missing fields are None
+    assert tweet.geo is None and tweet.created_at is None
+    with pytest.raises(AttributeError):
+        tweet.unknown
+    assert not hasattr(tweet, '__dict__')
+
+
+def test_nested_fields_are_decoded_on_access():
+    tweet = Tweet(TWEET)
+    assert isinstance(object.__getattribute__(tweet, '_public_metrics'), bytes)
+    assert tweet.public_metrics == {'retweet_count': 1, 'like_count': 2}
+    assert object.__getattribute__(tweet, '_public_metrics') is tweet.public_metrics
+    assert isinstance(object.__getattribute__(tweet, '_entities'), bytes)
+
+
+def test_interned_values_are_shared():
+    first, second = Tweet(dict(TWEET, lang=''.join(['e', 'n']))), Tweet(TWEET)
+    assert first.lang is second.lang
+
+
+def test_get_and_to_dict():
+    tweet = Tweet(TWEET)
+    assert tweet.get('geo', 'missing') == 'missing'
+    assert tweet.get('lang') == 'en'
+    # unknown fields are kept
+    assert tweet.get('note_tweet') == {'text': 'a longer text'}
+    assert tweet.to_dict() == TWEET
+    assert Tweet({'id': '2', 'geo': None}).to_dict() == {'id': '2', 'geo': None}
+
+
+def test_pickle():
+    tweet = Tweet(TWEET)
+    tweet.entities
+    copy = pickle.loads(pickle.dumps(tweet))
+    assert copy == tweet
+    assert copy.public_metrics == TWEET['public_metrics']
+    assert copy.geo is None
+
+
+def test_to_record():
+    users = to_record([{'id': '10', 'username': 'a'}, {'id': '11', 'username': 'b'}], 'User')
+    assert [type(user) for user in users] == [User, User]
+    assert repr(users[0]) == "User(id='10')"
+    assert users[0] != users[1]
+    # objects without a record type are returned as is
+    assert to_record({'id': '1'}, 'Topic') == {'id': '1'}
+
+
+def test_response_to_records():
+    resp = TwitterResponse(make_response(body={'data': [TWEET], 'meta': {'result_count': 1}}), dtype='Tweet')
+    records = resp.to_records()
+    assert isinstance(records[0], Record)
+    assert records[0].to_dict() == TWEET
@@ -0,0 +1,50 @@
+import json as simplejson
+
+from helpers import make_pages, make_request, make_response, StubSession
+from tweetkit.models import TwitterResponse
+
+BODY = {
+    'data': [{'id': '1', 'text': 'a "meta": {}', 'author_id': '10'}],
+    'includes': {'users': [{'id': '10', 'username': 'tweetkit'}]},
+    'meta': {'result_count': 1, 'next_token': 'token1'},
+}
+
+
+def test_lazy_meta_does_not_decode_content():
+    resp = TwitterResponse(make_response(body=BODY), lazy=True)
+    assert resp.meta == BODY['meta']
+    assert resp._raw is not None
+    assert resp._data is None
+
+
+def test_lazy_sections_decode_full_content():
+    resp = TwitterResponse(make_response(body=BODY), lazy=True)
+    assert resp.data == BODY['data']
+    assert resp._raw is None
+    assert resp._includes == BODY['includes']
+    assert resp.meta == BODY['meta']
+
+
+def test_lazy_meta_falls_back_to_decoding():
+    body = dict(BODY, meta={'result_count': 1, 'nested': {'a': 1}})
+    resp = TwitterResponse(simplejson.dumps(body), lazy=True)
+    assert resp.meta == body['meta']
+    assert resp._raw is None
+    resp = TwitterResponse(simplejson.dumps({'data': []}), lazy=True)
+    assert resp.meta is None
+
+
+def test_lazy_and_eager_content_are_equal():
+    lazy = TwitterResponse(make_response(body=BODY), dtype='Tweet', lazy=True)
+    eager = TwitterResponse(make_response(body=BODY), dtype='Tweet')
+    assert lazy.content == eager.content
+    assert lazy.errors is None
+
+
+def test_paginator_counts_lazy_pages_from_meta():
+    session = StubSession(*make_pages([1, 2], [3]))
+    paginator = make_request(session, query={}, lazy=True).send(paginate=True)
+    pages = list(paginator)
+    assert paginator.items == 3
+    # the pages are not decoded by the paginator
+    assert all(page._data is None for page in pages)
@@ -0,0 +1,214 @@
+import multiprocessing
+import threading
+import time
+
+import pytest
+
+from helpers import FakeTime, make_response, StubSession
+from tweetkit.auth import BearerTokenAuth, CredentialPoolAuth
+from tweetkit.models import scheduler as scheduler_module, SQLiteStateBackend, TwitterRequest, \
+    TwitterRequestScheduler
+
+URL = 'https://api.twitter.com/2/users/{id}/followers'
+
+
+def make_headers(limit, remaining, reset_in, status_code=200):
+    return make_response(status_code, headers={
+        'x-rate-limit-limit': str(limit),
+        'x-rate-limit-remaining': str(remaining),
+        'x-rate-limit-reset': str(int(time.time() + reset_in)),
+    })
+
+
+def make_request(url=URL, method='get', auth=None):
+    return TwitterRequest(url, method=method, query={}, params={'id': '1'},
+                          auth=BearerTokenAuth('token') if auth is None else auth)
+
+
+def test_rate_limits_per_endpoint():
+    scheduler = TwitterRequestScheduler(mode='reset')
+    followers, following = make_request(), make_request(URL.replace('followers', 'following'))
+    scheduler.update(make_headers(15, 0, reset_in=600), followers)
+    # the exhausted endpoint waits for its reset, other endpoints are not affected
+    assert scheduler.acquire(followers) == pytest.approx(601.0, abs=2.0)
+    assert scheduler.acquire(following) == 0.0
+    assert scheduler.get_rate_limit(followers).limit == 15
+    assert scheduler.get_rate_limit(following).limit is None
+
+
+def test_rate_limits_per_method_and_identity():
+    scheduler = TwitterRequestScheduler()
+    auth = BearerTokenAuth('token')
+    assert scheduler.key(make_request(auth=auth)) == (auth.identity, 'GET', '/2/users/{id}/followers')
+    assert scheduler.key(make_request(method='post', auth=auth))[1] == 'POST'
+    assert scheduler.key(make_request(auth=BearerTokenAuth('other')))[0] != auth.identity
+    # the same credentials share the rate limits
+    assert scheduler.key(make_request(auth=BearerTokenAuth('token'))) == scheduler.key(make_request(auth=auth))
+
+
+def test_reset_mode_uses_the_full_quota():
+    scheduler = TwitterRequestScheduler(mode='reset')
+    request = make_request()
+    scheduler.update(make_headers(15, 2, reset_in=600), request)
+    assert [scheduler.acquire(request) for _ in range(2)] == [0.0, 0.0]
+    # the quota is exhausted, wait until the reset (and the margin)
+    assert scheduler.acquire(request) == pytest.approx(601.0, abs=2.0)
+    # the next window is reserved after the quota of the new window
+    assert scheduler.get_rate_limit(request).rate_limit_remaining == 14
+    # the following requests are made in the next window too
+    assert scheduler.acquire(request) == pytest.approx(601.0, abs=2.0)
+
+
+def test_interval_mode_spaces_requests():
+    scheduler = TwitterRequestScheduler(mode='interval')
+    request = make_request()
+    scheduler.update(make_headers(900, 899, reset_in=900), request)
+    # one request per second
+    delays = [scheduler.acquire(request) for _ in range(3)]
+    assert delays[0] == pytest.approx(1.0, abs=0.1)
+    assert delays[2] == pytest.approx(3.0, abs=0.1)
+
+
+def test_expired_reset_starts_a_new_window():
+    scheduler = TwitterRequestScheduler(mode='reset')
+    request = make_request()
+    scheduler.update(make_headers(15, 0, reset_in=-5), request)
+    assert scheduler.acquire(request) == 0.0
+    assert scheduler.get_rate_limit(request).rate_limit_remaining == 14
+
+
+def test_too_many_requests_waits_for_retry_after():
+    scheduler = TwitterRequestScheduler(mode='reset', max_retries=1)
+    request = make_request()
+    r = make_response(429, headers={'retry-after': '30'})
+    scheduler.update(r, request)
+    assert scheduler.acquire(request) == pytest.approx(31.0, abs=2.0)
+    assert scheduler.should_retry(r, 0)
+    assert not scheduler.should_retry(r, 1)
+
+
+def test_send_retries_rate_limited_requests(monkeypatch):
+    fake_time = FakeTime()
+    monkeypatch.setattr(scheduler_module, 'time', fake_time)
+    session = StubSession(make_headers(15, 0, reset_in=60, status_code=429),
+                          make_response(body={'data': {'id': '1'}}))
+    request = TwitterRequest(URL, query={}, params={'id': '1'}, auth=BearerTokenAuth('token'), session=session,
+                             scheduler=TwitterRequestScheduler(mode='reset', max_retries=1))
+    assert request.send().data == {'id': '1'}
+    assert len(session.calls) == 2
+    assert fake_time.delays == [pytest.approx(61.0, abs=2.0)]
+
+
+def test_threads_do_not_exceed_the_quota():
+    scheduler = TwitterRequestScheduler(mode='reset')
+    request = make_request()
+    scheduler.update(make_headers(15, 10, reset_in=600), request)
+    barrier = threading.Barrier(20)
+    delays = []
+
+    def acquire():
+        barrier.wait()
+        delays.append(scheduler.acquire(request))
+
+    threads = [threading.Thread(target=acquire) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # exactly the remaining requests are made without waiting, the others wait for the reset
+    assert sum(1 for delay in delays if delay == 0.0) == 10
+    assert sum(1 for delay in delays if delay > 500) == 10
+
+
+def _acquire_slots(path, count, results):
+    scheduler = TwitterRequestScheduler(mode='reset', backend=SQLiteStateBackend(path))
+    results.put([scheduler.acquire(make_request()) for _ in range(count)])
+
+
+def test_processes_share_rate_limits(tmp_path):
+    path = str(tmp_path / 'state.db')
+    scheduler = TwitterRequestScheduler(mode='reset', backend=SQLiteStateBackend(path))
+    scheduler.update(make_headers(15, 10, reset_in=600), make_request())
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    processes = [context.Process(target=_acquire_slots, args=(path, 5, results)) for _ in range(4)]
+    for process in processes:
+        process.start()
+    delays = [delay for _ in processes for delay in results.get(timeout=60)]
+    for process in processes:
+        process.join()
+    assert sum(1 for delay in delays if delay == 0.0) == 10
+    assert scheduler.get_rate_limit(make_request()).rate_limit_remaining == 15 - 10
+
+
+def test_memory_backend_is_per_scheduler():
+    first, second = TwitterRequestScheduler(mode='reset'), TwitterRequestScheduler(mode='reset')
+    first.update(make_headers(15, 0, reset_in=600), make_request())
+    assert second.acquire(make_request()) == 0.0
+
+
+def test_pool_selects_credentials_with_most_remaining_quota():
+    credentials = [BearerTokenAuth('a'), BearerTokenAuth('b'), BearerTokenAuth('c')]
+    request = make_request(auth=CredentialPoolAuth(credentials))
+    scheduler = TwitterRequestScheduler(mode='reset')
+    scheduler.update(make_headers(15, 3, reset_in=600), request, auth=credentials[0])
+    scheduler.update(make_headers(15, 9, reset_in=600), request, auth=credentials[1])
+    scheduler.update(make_headers(15, 0, reset_in=600), request, auth=credentials[2])
+    assert scheduler.select(request) is credentials[1]
+    # selecting does not reserve a slot
+    assert scheduler.get_rate_limit(request, auth=credentials[1]).rate_limit_remaining == 9
+
+
+def test_pool_parks_exhausted_credentials():
+    credentials = [BearerTokenAuth('a'), BearerTokenAuth('b')]
+    request = make_request(auth=CredentialPoolAuth(credentials))
+    scheduler = TwitterRequestScheduler(mode='reset')
+    scheduler.update(make_headers(15, 0, reset_in=600), request, auth=credentials[0])
+    scheduler.update(make_headers(15, 0, reset_in=60), request, auth=credentials[1])
+    # the credentials which reset first are used
+    assert scheduler.select(request) is credentials[1]
+
+
+def test_pool_spreads_requests(monkeypatch):
+    monkeypatch.setattr(scheduler_module, 'time', FakeTime())
+    credentials = [BearerTokenAuth('a'), BearerTokenAuth('b')]
+    responses = [make_headers(15, 0, reset_in=600, status_code=429), make_headers(15, 0, reset_in=600, status_code=429),
+                 make_response(body={'data': {'id': '1'}})]
+    scheduler = TwitterRequestScheduler(mode='reset', max_retries=2)
+    request = TwitterRequest(URL, query={}, params={'id': '1'}, auth=CredentialPoolAuth(credentials),
+                             session=StubSession(*responses), scheduler=scheduler)
+    assert request.send().data == {'id': '1'}
+    # both credentials were used before waiting for a reset
+    assert [scheduler.get_rate_limit(request, auth=auth).limit for auth in credentials] == [15, 15]
+
+
+def test_pool_requires_credentials():
+    with pytest.raises(ValueError):
+        CredentialPoolAuth([])
+
+
+@pytest.mark.parametrize('backend', ['memory', 'sqlite'])
+def test_pool_spreads_concurrent_requests(backend, tmp_path):
+    credentials = [BearerTokenAuth('a'), BearerTokenAuth('b'), BearerTokenAuth('c')]
+    request = make_request(auth=CredentialPoolAuth(credentials))
+    scheduler = TwitterRequestScheduler(mode='reset', backend=SQLiteStateBackend(str(tmp_path / 'state.db'))
+                                        if backend == 'sqlite' else None)
+    barrier = threading.Barrier(6)
+    selected = []
+
+    def reserve():
+        barrier.wait()
+        selected.append(scheduler.reserve(request)[0])
+
+    threads = [threading.Thread(target=reserve) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # before the rate limits are known, the credentials are used in turn
+    assert sorted(credentials.index(auth) for auth in selected) == [0, 0, 1, 1, 2, 2]
+
+
+def test_pool_does_not_authenticate_requests():
+    with pytest.raises(TypeError):
+        CredentialPoolAuth([BearerTokenAuth('a')])(make_response())
@@ -0,0 +1,159 @@
+import time
+
+import pytest
+
+from helpers import make_pages, make_request, make_response, StubSession
+from tweetkit.auth import BearerTokenAuth, CredentialPoolAuth
+from tweetkit.client import TwitterClient
+from tweetkit.models import SearchPlanner, SlicedSearch, TwitterRequest, TwitterRequestScheduler
+from tweetkit.models.search import split_time_range, split_time_range_by_counts
+
+URL = 'https://api.twitter.com/2/tweets/search/all'
+
+SLICES = [('2022-10-01T00:00:00Z', '2022-10-02T00:00:00Z'), ('2022-10-02T00:00:00Z', '2022-10-03T00:00:00Z')]
+
+
+def make_planner(mode='reset', auth=None, endpoint='all'):
+    if auth is None:
+        auth = BearerTokenAuth('token')
+    client = TwitterClient(auth, scheduler=TwitterRequestScheduler(mode=mode))
+    return SearchPlanner(client, endpoint=endpoint)
+
+
+def set_rate_limit(planner, limit, remaining, reset_in, auth=None):
+    """Sets the rate limit state of the search endpoint as if a response with the headers was received."""
+    client = planner.client
+    if auth is None:
+        auth = client.auth
+    url = '{}{}'.format(client.url, planner.endpoints[planner.endpoint]['url'])
+    headers = {
+        'x-rate-limit-limit': str(limit),
+        'x-rate-limit-remaining': str(remaining),
+        'x-rate-limit-reset': str(int(time.time() + reset_in)),
+    }
+    client._request_scheduler.update(make_response(headers=headers), TwitterRequest(url, auth=auth), auth=auth)
+
+
+def test_estimate_within_quota():
+    planner = make_planner()
+    assert planner.estimate_duration(300) == 0.0
+
+
+def test_estimate_cold_credentials_wait_for_a_full_window():
+    planner = make_planner()
+    # the quota of 300 requests (full-archive search) is exceeded by one request
+    assert planner.estimate_duration(301) == pytest.approx(900.0)
+    assert planner.estimate_duration(601) == pytest.approx(1800.0)
+
+
+def test_estimate_cold_credentials_with_known_limit():
+    planner = make_planner()
+    set_rate_limit(planner, 180, 180, reset_in=-1)
+    assert planner.estimate_duration(180) == 0.0
+    assert planner.estimate_duration(200) == pytest.approx(900.0)
+
+
+def test_estimate_uses_remaining_quota_and_reset():
+    planner = make_planner()
+    set_rate_limit(planner, 180, 30, reset_in=600)
+    assert planner.estimate_duration(30) == 0.0
+    assert planner.estimate_duration(100) == pytest.approx(600.0, abs=2.0)
+    assert planner.estimate_duration(300) == pytest.approx(1500.0, abs=2.0)
+
+
+def test_estimate_interval_mode_spaces_requests():
+    planner = make_planner(mode='interval')
+    assert planner.estimate_duration(150) == pytest.approx(450.0)
+
+
+def test_estimate_interval_mode_waits_for_exhausted_window():
+    planner = make_planner(mode='interval')
+    set_rate_limit(planner, 180, 0, reset_in=600)
+    assert planner.estimate_duration(18) == pytest.approx(690.0, abs=2.0)
+
+
+def test_estimate_interval_mode_is_bounded_by_quota():
+    planner = make_planner(mode='interval')
+    set_rate_limit(planner, 180, 10, reset_in=600)
+    # spacing alone would take 100s, but only 10 requests are left until the reset
+    assert planner.estimate_duration(20) == pytest.approx(600.0, abs=2.0)
+
+
+def test_estimate_credential_pool():
+    credentials = [BearerTokenAuth('a'), BearerTokenAuth('b')]
+    planner = make_planner(auth=CredentialPoolAuth(credentials))
+    set_rate_limit(planner, 300, 0, reset_in=300, auth=credentials[0])
+    # only the quota of the second credentials is left
+    assert planner.estimate_duration(300) == 0.0
+    assert planner.estimate_duration(301) == pytest.approx(900.0, abs=2.0)
+
+
+def make_search(pages_by_start):
+    """Creates a search endpoint method which paginates a stub session per slice (by start time)."""
+    sessions = {start: StubSession(*make_pages(*pages)) for start, pages in pages_by_start.items()}
+
+    def search(query, start_time=None, end_time=None, paginate=False, **kwargs):
+        request = make_request(sessions[start_time], url=URL, query={'query': query, 'start_time': start_time,
+                                                                      'end_time': end_time})
+        return request.send(paginate=paginate)
+
+    return search, sessions
+
+
+def get_ids(pages):
+    return [item['data']['id'] for page in pages for item in page.content]
+
+
+def test_split_time_range():
+    assert split_time_range('2022-10-01T00:00:00Z', '2022-10-01T00:00:03Z', 3) == [
+        ('2022-10-01T00:00:00Z', '2022-10-01T00:00:01Z'),
+        ('2022-10-01T00:00:01Z', '2022-10-01T00:00:02Z'),
+        ('2022-10-01T00:00:02Z', '2022-10-01T00:00:03Z'),
+    ]
+    with pytest.raises(ValueError):
+        split_time_range('2022-10-02T00:00:00Z', '2022-10-01T00:00:00Z', 2)
+
+
+def test_split_time_range_by_counts():
+    counts = [
+        {'start': '2022-10-01T00:00:00.000Z', 'end': '2022-10-02T00:00:00.000Z', 'tweet_count': 90},
+        {'start': '2022-10-02T00:00:00.000Z', 'end': '2022-10-03T00:00:00.000Z', 'tweet_count': 5},
+        {'start': '2022-10-03T00:00:00.000Z', 'end': '2022-10-04T00:00:00.000Z', 'tweet_count': 5},
+    ]
+    # the first day holds most of the volume
+    assert split_time_range_by_counts(counts, 2) == [
+        ('2022-10-01T00:00:00Z', '2022-10-02T00:00:00Z'),
+        ('2022-10-02T00:00:00Z', '2022-10-04T00:00:00Z'),
+    ]
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_sliced_search_merges_slices(ordered):
+    search, _ = make_search({SLICES[0][0]: [[5], [4]], SLICES[1][0]: [[3, 2], [1]]})
+    pages = SlicedSearch(search, 'tweetkit', SLICES[0][0], SLICES[1][1], slices=SLICES, ordered=ordered)
+    ids = get_ids(pages)
+    if ordered:
+        # newest slice first
+        assert ids == ['3', '2', '1', '5', '4']
+    else:
+        assert sorted(ids) == ['1', '2', '3', '4', '5']
+
+
+def test_sliced_search_raises_errors():
+    search, sessions = make_search({SLICES[0][0]: [[1]], SLICES[1][0]: []})
+    sessions[SLICES[1][0]].responses.append(ConnectionError('connection reset'))
+    with pytest.raises(ConnectionError):
+        list(SlicedSearch(search, 'tweetkit', SLICES[0][0], SLICES[1][1], slices=SLICES))
+
+
+def test_sliced_search_stops_requests_on_early_exit():
+    slices = split_time_range('2022-10-01T00:00:00Z', '2022-10-05T00:00:00Z', 4)
+    search, sessions = make_search({start: [[1], [2], [3], [4]] for start, _ in slices})
+    pages = iter(SlicedSearch(search, 'tweetkit', slices[0][0], slices[-1][1], slices=slices, max_workers=1,
+                              buffer_size=1))
+    next(pages)
+    pages.close()
+    time.sleep(0.5)
+    # the running slice sends no further requests and the pending slices are cancelled
+    assert len(sessions[slices[-1][0]].calls) <= 2
+    assert [len(sessions[start].calls) for start, _ in slices[:-1]] == [0, 0, 0]
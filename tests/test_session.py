@@ -0,0 +1,60 @@
+import http.server
+import json
+import threading
+
+import pytest
+
+from tweetkit.auth import BearerTokenAuth
+from tweetkit.client import TwitterClient
+from tweetkit.models import TwitterRequestScheduler, TwitterSession
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = json.dumps({'data': {'id': self.path.rsplit('/', 1)[-1].split('?')[0]}}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('content-type', 'application/json')
+        self.send_header('content-length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield 'http://127.0.0.1:{}'.format(server.server_address[1])
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(url, **kwargs):
+    client = TwitterClient(BearerTokenAuth('token'), scheduler=TwitterRequestScheduler(mode='reset'), **kwargs)
+    client.url = url
+    return client
+
+
+def test_requests_reuse_connections(server):
+    with make_client(server) as client:
+        ids = [client.tweets.find_tweet_by_id(str(i)).data['id'] for i in range(3)]
+        assert ids == ['0', '1', '2']
+        stats = client.pool_stats
+    assert stats['requests'] == 3
+    assert stats['connections'] == 1
+    assert stats['reuse_rate'] == pytest.approx(2 / 3)
+    assert list(stats['pools']) == ['http://127.0.0.1:{}'.format(server.rsplit(':', 1)[-1])]
+
+
+def test_requests_share_client_session():
+    client = make_client(TwitterClient.url, pool_maxsize=4, pool_block=True)
+    request = client.request('/2/tweets/search/recent', query={'query': 'tweetkit'}, params={}, paginate=True)
+    assert request.request.session is client.session
+    assert isinstance(client.session, TwitterSession)
+    assert client.session.adapter._pool_maxsize == 4
+    assert client.session.adapter._pool_block is True
@@ -0,0 +1,199 @@
+import itertools
+import time
+
+import requests
+import pytest
+
+from helpers import FailingReader, HeartbeatReader, make_line, make_request, make_response, StubSession
+from tweetkit.exceptions import TwitterRequestException
+from tweetkit.models import PartitionedStream, RawStreamResponse, ReconnectingStream, StreamPipeline, TwitterResponse
+
+HTML = b'<html><body><h1>503 Service Temporarily Unavailable</h1></body></html>'
+
+
+def test_html_error_is_request_exception():
+    r = make_response(503, body=HTML, headers={'content-type': 'text/html'})
+    ex = TwitterRequestException(r)
+    assert isinstance(ex, requests.exceptions.RequestException)
+    assert ex.code == 503
+
+
+def test_empty_error_body_is_request_exception():
+    ex = TwitterRequestException(make_response(429, body=b''))
+    assert ex.code == 429
+
+
+def test_reconnect_after_html_503(fake_time):
+    session = StubSession(
+        make_response(503, body=HTML, headers={'content-type': 'text/html'}),
+        make_response(lines=[make_line(1), b'', make_line(2)]),
+    )
+    stream = ReconnectingStream(make_request(session, stream=True), backfill=False)
+    assert [resp.data['id'] for resp in (next(stream), next(stream))] == ['1', '2']
+    # server errors back off exponentially from 5 seconds
+    assert fake_time.delays == [5.0]
+    assert stream.stats['connects'] == 1
+    stream.close()
+
+
+def test_reconnect_after_disconnect_with_backfill(fake_time):
+    disconnect = requests.exceptions.ChunkedEncodingError('connection broken')
+    session = StubSession(
+        make_response(raw=FailingReader(make_line(1) + b'\r\n', disconnect)),
+        make_response(lines=[make_line(1), make_line(2)]),
+    )
+    stream = ReconnectingStream(make_request(session, stream=True))
+    assert [next(stream).data['id'], next(stream).data['id']] == ['1', '2']
+    # the tweet delivered again by the backfill is skipped
+    assert stream.stats['duplicates'] == 1
+    assert stream.stats['reconnects'] == 1
+    assert session.calls[1]['params']['backfill_minutes'] == 1
+    assert 'backfill_minutes' not in stream.request.query
+    assert len(stream.stats['gaps']) == 1
+    stream.close()
+
+
+def test_client_errors_are_raised(fake_time):
+    session = StubSession(make_response(401, body=b'Unauthorized', headers={'content-type': 'text/plain'}))
+    stream = ReconnectingStream(make_request(session, stream=True))
+    with pytest.raises(TwitterRequestException):
+        next(stream)
+    assert fake_time.delays == []
+
+
+def test_max_retries(fake_time):
+    session = StubSession(*[make_response(503, body=HTML, headers={'content-type': 'text/html'})] * 3)
+    stream = ReconnectingStream(make_request(session, stream=True), max_retries=2)
+    with pytest.raises(TwitterRequestException):
+        next(stream)
+    assert fake_time.delays == [5.0, 10.0]
+
+
+@pytest.mark.parametrize('code, delays', [
+    (None, [0.25, 0.5, 0.75]),
+    (503, [5.0, 10.0, 20.0]),
+    (429, [60.0, 120.0, 240.0]),
+])
+def test_back_off(code, delays):
+    stream = ReconnectingStream(make_request(StubSession(), stream=True))
+    if code is None:
+        ex = requests.exceptions.ConnectionError()
+    else:
+        ex = TwitterRequestException(make_response(code, body=b''))
+    assert [stream._get_delay(ex) for _ in delays] == delays
+
+
+@pytest.mark.parametrize('code, max_delay', [(None, 16.0), (503, 320.0), (429, 960.0)])
+def test_back_off_is_capped(code, max_delay):
+    stream = ReconnectingStream(make_request(StubSession(), stream=True))
+    if code is None:
+        ex = requests.exceptions.ConnectionError()
+    else:
+        ex = TwitterRequestException(make_response(code, body=b''))
+    for _ in range(2000):
+        delay = stream._get_delay(ex)
+    assert delay == max_delay
+
+
+def test_reconnect_raw_stream(fake_time):
+    disconnect = requests.exceptions.ChunkedEncodingError('connection broken')
+    session = StubSession(
+        make_response(raw=FailingReader(make_line(1) + b'\r\n\r\n', disconnect)),
+        make_response(lines=[make_line(1), make_line(2)]),
+    )
+    stream = make_request(session, stream=True, raw=True).send(reconnect=True)
+    chunks = [next(stream), next(stream)]
+    assert all(isinstance(chunk, bytes) for chunk in chunks)
+    assert chunks[0] == make_line(1) + b'\r\n\r\n'
+    # backfilled tweets of raw streams are delivered again
+    assert chunks[1] == make_line(1) + b'\r\n' + make_line(2) + b'\r\n'
+    assert stream.stats['reconnects'] == 1
+    assert session.calls[1]['params']['backfill_minutes'] == 1
+    stream.close()
+
+
+def make_reconnecting_stream(*ids):
+    """Creates a reconnecting stream which is disconnected after the first message and backfills it (and only
+    receives heartbeats after the messages)."""
+    disconnect = requests.exceptions.ChunkedEncodingError('connection broken')
+    session = StubSession(
+        make_response(raw=FailingReader(make_line(ids[0]) + b'\r\n', disconnect)),
+        make_response(lines=[make_line(id_) for id_ in ids]),
+        make_response(raw=HeartbeatReader()),
+    )
+    return ReconnectingStream(make_request(session, stream=True))
+
+
+def test_reconnecting_stream_next_line_and_parse(fake_time):
+    stream = make_reconnecting_stream(1, 2)
+    lines = [stream.next_line(), stream.next_line(), stream.next_line()]
+    assert [stream.parse(line) is None for line in lines] == [False, True, False]
+    assert stream.stats['duplicates'] == 1
+    assert stream.stats['reconnects'] == 1
+
+
+def test_pipeline_over_reconnecting_stream(fake_time):
+    with StreamPipeline(make_reconnecting_stream(1, 2, 3), workers=1) as pipeline:
+        # reconnecting streams do not end
+        assert [resp.data['id'] for resp in itertools.islice(pipeline, 3)] == ['1', '2', '3']
+        assert pipeline.stats['received'] == 4
+        assert pipeline.stats['parsed'] == 3
+
+
+def test_pipeline_rejects_streams_without_lines():
+    stream = RawStreamResponse(iter([make_line(1) + b'\n']))
+    with pytest.raises(TypeError):
+        StreamPipeline(stream)
+
+
+def test_partitioned_processes_over_reconnecting_streams(fake_time):
+    streams = {1: make_reconnecting_stream(1, 2), 2: make_reconnecting_stream(3, 4)}
+    with PartitionedStream(streams.get, partitions=2, processes=1, batch_size=1) as partitioned:
+        ids = sorted(resp.data['id'] for resp in itertools.islice(partitioned, 4))
+    assert ids == ['1', '2', '3', '4']
+
+
+def make_partition(*ids):
+    """Creates the (ended) stream of a partition."""
+    return make_request(StubSession(make_response(lines=[make_line(id_) for id_ in ids])), stream=True).send()
+
+
+def test_partitioned_threads_merge_partitions():
+    streams = {3: make_partition(1, 2), 5: make_partition(3), 7: make_partition()}
+    connected = []
+
+    def connect(partition):
+        connected.append(partition)
+        return streams[partition]
+
+    partitioned = PartitionedStream(connect, partitions=[3, 5, 7])
+    # the iteration ends when all partitions ended
+    assert sorted(item['data']['id'] for item in partitioned.content) == ['1', '2', '3']
+    assert sorted(connected) == [3, 5, 7]
+    assert {partition: stats['consumed'] for partition, stats in partitioned.stats.items()} == {3: 2, 5: 1, 7: 0}
+
+
+def test_partitioned_threads_limit_queued_messages_per_partition():
+    def connect(partition):
+        # a partition which is always ahead of the consumer
+        return (TwitterResponse({'data': {'id': '{}-{}'.format(partition, i)}}) for i in itertools.count())
+
+    with PartitionedStream(connect, partitions=2, partition_maxsize=3) as partitioned:
+        next(partitioned)
+        time.sleep(0.2)
+        assert all(stats['queued'] <= 3 for stats in partitioned.stats.values())
+        ids = [resp.data['id'] for resp in itertools.islice(partitioned, 20)]
+    # both partitions are consumed
+    assert {id_.split('-')[0] for id_ in ids} == {'1', '2'}
+
+
+def test_partitioned_threads_raise_errors():
+    def connect(partition):
+        if partition == 2:
+            raise requests.exceptions.ConnectionError('connection refused')
+        return make_partition(1)
+
+    partitioned = PartitionedStream(connect, partitions=2)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        list(partitioned)
+    assert partitioned.stats[2]['error'] == 'ConnectionError: connection refused'
@@ -0,0 +1,123 @@
+import gzip
+import json as simplejson
+
+import pytest
+
+from tweetkit.models import RawStreamResponse, StreamMonitor
+from tweetkit.utils import json
+from tweetkit.utils.writer import JSONLinesWriter, RotatingFileWriter
+
+LINE = b'{"id":"1"}\n'
+
+
+def read_lines(path):
+    opener = gzip.open if str(path).endswith('.gz') else open
+    with opener(path, 'rb') as fp:
+        return fp.read().splitlines()
+
+
+def test_buffered_write(tmp_path):
+    path = tmp_path / 'items.jsonl'
+    with RotatingFileWriter(path, buffer_size=len(LINE) * 2) as writer:
+        writer.write(LINE)
+        assert writer._buffered == len(LINE)
+        # the buffer is written to the file once it is full
+        writer.write(LINE)
+        assert writer._buffered == 0
+        writer.write(LINE)
+        writer.flush()
+        assert path.read_bytes() == LINE * 3
+    assert path.read_bytes() == LINE * 3
+    assert writer.stats['count'] == 3
+    assert writer.stats['bytes'] == len(LINE) * 3
+    with pytest.raises(ValueError):
+        writer.write(LINE)
+
+
+def test_rotate_by_bytes(tmp_path):
+    with RotatingFileWriter(tmp_path / 'items.jsonl.gz', max_bytes=len(LINE) * 2) as writer:
+        for _ in range(5):
+            writer.write(LINE)
+    assert [p.rsplit('/', 1)[-1] for p in writer.files] == [
+        'items-00000.jsonl.gz', 'items-00001.jsonl.gz', 'items-00002.jsonl.gz']
+    assert [len(read_lines(p)) for p in writer.files] == [2, 2, 1]
+
+
+def test_zstd_compression(tmp_path):
+    zstandard = pytest.importorskip('zstandard')
+    with RotatingFileWriter(tmp_path / 'items.jsonl', compression='zstd') as writer:
+        writer.write(LINE)
+    assert writer.files == [str(tmp_path / 'items.jsonl.zst')]
+    with open(writer.files[0], 'rb') as fp:
+        assert zstandard.ZstdDecompressor().stream_reader(fp).read() == LINE
+
+
+def test_append_counts_existing_bytes(tmp_path):
+    path = tmp_path / 'items.jsonl'
+    with RotatingFileWriter(path, max_bytes=len(LINE) * 3) as writer:
+        writer.write(LINE)
+        writer.write(LINE)
+    # the first file has room for one more line
+    with RotatingFileWriter(path, max_bytes=len(LINE) * 3, append=True) as writer:
+        for _ in range(3):
+            writer.write(LINE)
+    assert [len(read_lines(p)) for p in writer.files] == [3, 2]
+
+
+def test_append_skips_full_files(tmp_path):
+    path = tmp_path / 'items.jsonl.gz'
+    with RotatingFileWriter(path, max_bytes=len(LINE)) as writer:
+        writer.write(LINE)
+    with RotatingFileWriter(path, max_bytes=len(LINE), append=True) as writer:
+        writer.write(LINE)
+    assert [p.rsplit('/', 1)[-1] for p in writer.files] == ['items-00001.jsonl.gz']
+    assert len(read_lines(tmp_path / 'items-00000.jsonl.gz')) == 1
+
+
+def test_append_without_rotation(tmp_path):
+    path = tmp_path / 'items.jsonl.gz'
+    for _ in range(2):
+        with RotatingFileWriter(path, append=True) as writer:
+            writer.write(LINE)
+    # gzip files may consist of multiple members
+    assert read_lines(path) == [LINE.rstrip()] * 2
+
+
+def test_json_lines_writer(tmp_path):
+    path = tmp_path / 'items.jsonl'
+    items = [{'id': str(i), 'text': 'é'} for i in range(3)]
+    with JSONLinesWriter(path) as writer:
+        stats = writer.write_all(iter(items))
+    assert stats['count'] == 3
+    assert [simplejson.loads(line) for line in read_lines(path)] == items
+
+
+def test_dump_streams_iterables(tmp_path):
+    path = tmp_path / 'items.jsonl.gz'
+
+    def generate():
+        for i in range(3):
+            yield {'id': str(i)}
+
+    json.dump(generate(), path)
+    assert [simplejson.loads(line) for line in read_lines(path)] == [{'id': '0'}, {'id': '1'}, {'id': '2'}]
+
+
+def test_raw_stream_archive(tmp_path):
+    path = tmp_path / 'stream.jsonl.gz'
+    chunks = [LINE + b'\r\n', LINE]
+    stats = RawStreamResponse(iter(chunks)).archive(path)
+    # heartbeats are not counted as messages
+    assert stats['count'] == 2
+    stats = RawStreamResponse(iter([LINE])).archive(path)
+    # archives are appended to
+    assert read_lines(path) == [LINE.rstrip(), b'', LINE.rstrip(), LINE.rstrip()]
+
+
+def test_raw_stream_archive_counts_messages_as_monitor(tmp_path):
+    monitor = StreamMonitor(stall_timeout=None)
+    # the last message is not terminated when the stream ends
+    chunks = [LINE + b'\r\n', b'\r\n' + LINE + LINE.rstrip()]
+    stats = RawStreamResponse(iter(chunks), monitor=monitor).archive(tmp_path / 'stream.jsonl')
+    assert stats['count'] == monitor.stats['messages'] == 3
+    assert monitor.stats['heartbeats'] == 2
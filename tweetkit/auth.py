@@ -1,6 +1,7 @@
 """TwitterAuth"""
 from __future__ import absolute_import
 
+import hashlib
 import inspect
 
 from oauthlib.oauth2 import BackendApplicationClient
@@ -26,6 +27,21 @@ class TokenAuth(AuthBase):
         """refresh"""
         return self
 
+    @property
+    def identity(self):
+        """Gets an identifier of the credentials (a digest so that secrets are not exposed).
+
+        Returns
+        -------
+        identity: str or None
+            The identifier of the credentials.
+        """
+        return None
+
+    @staticmethod
+    def _digest(*values):
+        return hashlib.sha256(':'.join(map(str, values)).encode('utf-8')).hexdigest()[:16]
+
     def __call__(self, r):
         """Add auth parameters to the request."""
         self.refresh()
@@ -39,6 +55,11 @@ class BearerTokenAuth(TokenAuth):
         super(BearerTokenAuth, self).__init__(type='http', scheme='bearer')
         self.bearer_token = bearer_token
 
+    @property
+    def identity(self):
+        """Gets an identifier of the credentials."""
+        return self._digest(self.scheme, self.bearer_token)
+
     def __call__(self, r):
         """Add OAuth parameters to the request."""
         r = super(BearerTokenAuth, self).__call__(r)
@@ -70,6 +91,11 @@ class OAuth2UserTokenAuth(TokenAuth):
             )
         return self
 
+    @property
+    def identity(self):
+        """Gets an identifier of the credentials."""
+        return self._digest(self.type, self.consumer_key)
+
     def __call__(self, r):
         """Add OAuth parameters to the request."""
         r = super(OAuth2UserTokenAuth, self).__call__(r)
@@ -200,6 +226,11 @@ class UserTokenAuth(TokenAuth):
             screen_name = response['screen_name']
             return access_token, access_token_secret, user_id, screen_name
 
+    @property
+    def identity(self):
+        """Gets an identifier of the credentials."""
+        return self._digest(self.scheme, self.consumer_key, self.access_token)
+
     def __call__(self, r):
         """Add OAuth parameters to the request."""
         r = super(UserTokenAuth, self).__call__(r)
@@ -209,3 +240,32 @@ class UserTokenAuth(TokenAuth):
             resource_owner_key=self.access_token,
             resource_owner_secret=self.access_token_secret
         )(r)
+
+
+class CredentialPoolAuth(TokenAuth):
+    """CredentialPool
+
+    A pool of credentials (e.g., several app or academic bearer tokens). The request scheduler routes each request
+    to the credentials with the most remaining quota for the endpoint, and credentials that exhausted the quota
+    are parked until their rate limit resets.
+
+    Parameters
+    ----------
+    credentials: list of TokenAuth
+        The credentials in the pool.
+    """
+
+    def __init__(self, credentials):
+        super(CredentialPoolAuth, self).__init__(type='pool', scheme=None)
+        self.credentials = list(credentials)
+        if len(self.credentials) == 0:
+            raise ValueError('expected at least one credential in the pool, found none')
+
+    @property
+    def identity(self):
+        """Gets an identifier of the credentials."""
+        return self._digest(self.type, *[auth.identity for auth in self.credentials])
+
+    def __call__(self, r):
+        """Add auth parameters to the request (not supported, requests are made with the selected credentials)."""
+        raise TypeError('expected the credentials selected from the pool by the request scheduler, found the pool')
@@ -1,5 +1,6 @@
 """Twitter API v2"""
-from tweetkit.models import TwitterRequest
+from tweetkit.models import AsyncTwitterRequest, AsyncTwitterSession, TwitterRequest, TwitterRequestScheduler, \
+    TwitterSession
 from tweetkit.requests import Bookmarks, Compliance, General, Lists, Spaces, Tweets, Users
 
 
@@ -13,13 +14,32 @@ class TwitterClient(object):
     Please refer to the following for more information on using the Twitter API.
         - Twitter Developers: `https://developer.twitter.com<https://developer.twitter.com>`__.
         - Twitter Developer Agreement and Policy: `https://developer.twitter.com/en/developer-terms/agreement-and-policy.html<https://developer.twitter.com/en/developer-terms/agreement-and-policy.html>`__.
+
+    Parameters
+    ----------
+    auth: TokenAuth
+        The authentication to use with requests.
+    pool_connections: int
+        The number of per-host connection pools to cache.
+    pool_maxsize: int
+        The maximum number of keep-alive connections to retain per host.
+    pool_block: bool
+        Whether to block when all connections to a host are in use (i.e., enforce `pool_maxsize` as a per-host
+        connection limit).
+    scheduler: TwitterRequestScheduler
+        The scheduler managing rate limits of requests (e.g., ``TwitterRequestScheduler(mode='reset',
+        max_retries=3)`` to use the full quota and retry rate limited requests).
     """
 
     url = 'https://api.twitter.com'
     version = '2.51'
 
-    def __init__(self, auth):
+    def __init__(self, auth, pool_connections=10, pool_maxsize=10, pool_block=False, scheduler=None):
         self.auth = auth
+        # session shared by all requests, paginators and streams to reuse connections
+        self.session = TwitterSession(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block,
+        )
         self.bookmarks = Bookmarks(self)
         self.compliance = Compliance(self)
         self.general = General(self)
@@ -27,11 +47,13 @@ class TwitterClient(object):
         self.spaces = Spaces(self)
         self.tweets = Tweets(self)
         self.users = Users(self)
-        # scheduler for request time management
-        self._request_scheduler = None
+        # scheduler for request time management (shared by all requests)
+        if scheduler is None:
+            scheduler = TwitterRequestScheduler()
+        self._request_scheduler = scheduler
 
     def request(self, url, method='get', query=None, params=None, data=None, stream=False, paginate=False,
-                **kwargs):
+                prefetch=0, checkpoint=None, checkpoint_key=None, checkpoint_every=1, reconnect=False, **kwargs):
         """Make request and get response.
 
         Parameters
@@ -50,8 +72,20 @@ class TwitterClient(object):
             Whether to stream.
         paginate: bool
             Whether to paginate.
+        prefetch: int
+            The number of pages to fetch ahead in the background when paginating.
+        checkpoint: FileCheckpointStore or SQLiteCheckpointStore
+            The store to save the cursor of the paginator to (and resume unfinished runs from).
+        checkpoint_key: str
+            The key of the checkpoint (defaults to a digest of the request).
+        checkpoint_every: int
+            The number of pages in between two checkpoints.
+        reconnect: bool or dict
+            Whether to reconnect the stream on disconnects with back-off and backfill (or keyword arguments to the
+            reconnecting stream, e.g., ``{'max_retries': 10}``).
         kwargs: typing.Any
-            Other keyword arguments.
+            Other keyword arguments to the responses (e.g., `dtype`, `lazy`, an `EntityCache` as `cache`, `raw`
+            for streams of undecoded messages or a `StreamMonitor` as `monitor` for streams).
 
         Returns
         -------
@@ -60,8 +94,164 @@ class TwitterClient(object):
         url = '{}/{}'.format(self.url, url.lstrip('/'))
         request = TwitterRequest(
             url, method=method, query=query, params=params, data=data,
-            stream=stream, auth=self.auth, scheduler=self._request_scheduler, **kwargs
+            stream=stream, auth=self.auth, scheduler=self._request_scheduler, session=self.session,
+            **kwargs
+        )
+        return request.send(paginate=paginate, prefetch=prefetch, checkpoint=checkpoint,
+                            checkpoint_key=checkpoint_key, checkpoint_every=checkpoint_every,
+                            reconnect=reconnect)
+
+    @property
+    def pool_stats(self):
+        """Gets connection pool statistics of the client session.
+
+        Returns
+        -------
+        stats: dict
+            The connection pool statistics.
+        """
+        return self.session.stats
+
+    def close(self):
+        """Close the client session and all pooled connections.
+
+        Returns
+        -------
+        None
+        """
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class AsyncTwitterClient(object):
+    """Asynchronous Twitter API Client.
+
+    Exposes the same endpoint groups as `TwitterClient` where each endpoint method returns an awaitable of the
+    response (or stream response), or an `AsyncPaginator` if `paginate` is true. Requires the optional `httpx`
+    dependency (``pip install tweetkit[async]``).
+
+    Parameters
+    ----------
+    auth: TokenAuth
+        The authentication to use with requests.
+    max_connections: int
+        The maximum number of concurrent connections.
+    max_keepalive_connections: int
+        The maximum number of idle keep-alive connections to retain.
+    keepalive_expiry: float
+        The time (in seconds) to keep idle connections alive.
+    scheduler: TwitterRequestScheduler
+        The scheduler managing rate limits of requests.
+
+    Examples
+    --------
+    >>> async with AsyncTwitterClient(auth) as client:
+    ...     response = await client.tweets.find_tweet_by_id('20')
+    ...     async for tweet in client.tweets.tweets_recent_search('twitter', paginate=True).content:
+    ...         pass
+    """
+
+    url = TwitterClient.url
+    version = TwitterClient.version
+
+    def __init__(self, auth, max_connections=100, max_keepalive_connections=20, keepalive_expiry=5.0,
+                 scheduler=None):
+        self.auth = auth
+        # session shared by all requests, paginators and streams to reuse connections
+        self.session = AsyncTwitterSession(
+            max_connections=max_connections, max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
         )
-        response = request.send(paginate=paginate)
-        self._request_scheduler = request.scheduler
-        return response
+        self.bookmarks = Bookmarks(self)
+        self.compliance = Compliance(self)
+        self.general = General(self)
+        self.lists = Lists(self)
+        self.spaces = Spaces(self)
+        self.tweets = Tweets(self)
+        self.users = Users(self)
+        # scheduler for request time management (shared by all requests)
+        if scheduler is None:
+            scheduler = TwitterRequestScheduler()
+        self._request_scheduler = scheduler
+
+    def request(self, url, method='get', query=None, params=None, data=None, stream=False, paginate=False,
+                prefetch=0, checkpoint=None, checkpoint_key=None, checkpoint_every=1, reconnect=False, **kwargs):
+        """Make request and get response.
+
+        Parameters
+        ----------
+        url: str
+            Request URL.
+        method: str
+            Request method.
+        query: dict
+            Request query.
+        params: dict
+            Request params.
+        data: dict
+            Request data.
+        stream: bool
+            Whether to stream.
+        paginate: bool
+            Whether to paginate.
+        prefetch: int
+            The number of pages to fetch ahead in the background when paginating.
+        checkpoint: FileCheckpointStore or SQLiteCheckpointStore
+            The store to save the cursor of the paginator to (and resume unfinished runs from).
+        checkpoint_key: str
+            The key of the checkpoint (defaults to a digest of the request).
+        checkpoint_every: int
+            The number of pages in between two checkpoints.
+        reconnect: bool or dict
+            Whether to reconnect the stream on disconnects with back-off and backfill (or keyword arguments to the
+            reconnecting stream, e.g., ``{'max_retries': 10}``).
+        kwargs: typing.Any
+            Other keyword arguments to the responses (e.g., `dtype`, `lazy`, an `EntityCache` as `cache`, `raw`
+            for streams of undecoded messages or a `StreamMonitor` as `monitor` for streams).
+
+        Returns
+        -------
+        typing.Awaitable or AsyncPaginator or AsyncReconnectingStream
+            Awaitable of TwitterResponse or AsyncTwitterStreamResponse, AsyncPaginator if paginate is true or
+            AsyncReconnectingStream if reconnect is true.
+        """
+        url = '{}/{}'.format(self.url, url.lstrip('/'))
+        request = AsyncTwitterRequest(
+            url, method=method, query=query, params=params, data=data,
+            stream=stream, auth=self.auth, scheduler=self._request_scheduler, session=self.session,
+            **kwargs
+        )
+        return request.send(paginate=paginate, prefetch=prefetch, checkpoint=checkpoint,
+                            checkpoint_key=checkpoint_key, checkpoint_every=checkpoint_every,
+                            reconnect=reconnect)
+
+    @property
+    def pool_stats(self):
+        """Gets connection pool statistics of the client session.
+
+        Returns
+        -------
+        stats: dict
+            The connection pool statistics.
+        """
+        return self.session.stats
+
+    async def aclose(self):
+        """Close the client session and all pooled connections.
+
+        Returns
+        -------
+        None
+        """
+        await self.session.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
@@ -1,5 +1,6 @@
 """TwitterException"""
 import collections
+import collections.abc
 import json as simplejson
 
 import requests
@@ -71,11 +72,17 @@ class TwitterRequestException(TwitterException, requests.exceptions.RequestExcep
             request = response.request
         # update kwargs data by parsing response data
         if response is not None and isinstance(response, requests.Response):
-            for key, value in json.loads(response).items():
-                if key is not None:
-                    kwargs[key] = value
+            try:
+                data = json.loads(response)
+            except ValueError:
+                # the body is not JSON (e.g., an HTML page of a proxy or an empty body)
+                data = None
+            if isinstance(data, collections.abc.Mapping):
+                for key, value in data.items():
+                    if key is not None:
+                        kwargs[key] = value
         # extract dict data from arg if provided (if response is provided as arg it should be first)
-        if len(args) > 0 and isinstance(args[0], collections.Mapping):
+        if len(args) > 0 and isinstance(args[0], collections.abc.Mapping):
             data, args = args[0], args[1:]
             kwargs.update(data)
         super(TwitterRequestException, self).__init__(*args, **kwargs, request=request, response=response)
@@ -2,10 +2,21 @@
 
 Includes implementations of TweetKit module methods.
 """
-from tweetkit.models.expansions import TwitterExpansions
-from tweetkit.models.paginator import Paginator
-from tweetkit.models.request import TwitterRequest
-from tweetkit.models.response import TwitterResponse, TwitterStreamResponse
+from tweetkit.models.cache import EntityCache
+from tweetkit.models.checkpoint import FileCheckpointStore, SQLiteCheckpointStore
+from tweetkit.models.columnar import to_columns
+from tweetkit.models.expansions import ExpandedView, TwitterExpansions
+from tweetkit.models.monitor import StreamMonitor
+from tweetkit.models.paginator import AsyncPaginator, Paginator
+from tweetkit.models.records import Record, record_types, to_record
+from tweetkit.models.request import AsyncTwitterRequest, TwitterRequest
+from tweetkit.models.response import AsyncRawStreamResponse, AsyncTwitterStreamResponse, RawStreamResponse, \
+    TwitterResponse, TwitterStreamResponse
+from tweetkit.models.scheduler import MemoryStateBackend, SQLiteStateBackend, TwitterRateLimit, \
+    TwitterRequestScheduler
+from tweetkit.models.search import SearchPlan, SearchPlanner, SlicedSearch
+from tweetkit.models.session import AsyncTwitterSession, TwitterSession
+from tweetkit.models.stream import AsyncReconnectingStream, PartitionedStream, ReconnectingStream, StreamPipeline
 
 __all__ = [
     'TwitterResponse',
@@ -13,4 +24,31 @@ __all__ = [
     'Paginator',
     'TwitterRequest',
     'TwitterExpansions',
+    'ExpandedView',
+    'TwitterSession',
+    'AsyncPaginator',
+    'AsyncTwitterRequest',
+    'AsyncTwitterStreamResponse',
+    'AsyncTwitterSession',
+    'TwitterRateLimit',
+    'TwitterRequestScheduler',
+    'MemoryStateBackend',
+    'SQLiteStateBackend',
+    'SlicedSearch',
+    'SearchPlan',
+    'SearchPlanner',
+    'FileCheckpointStore',
+    'SQLiteCheckpointStore',
+    'EntityCache',
+    'Record',
+    'record_types',
+    'to_record',
+    'to_columns',
+    'ReconnectingStream',
+    'AsyncReconnectingStream',
+    'PartitionedStream',
+    'StreamPipeline',
+    'RawStreamResponse',
+    'AsyncRawStreamResponse',
+    'StreamMonitor',
 ]
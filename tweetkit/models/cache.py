@@ -0,0 +1,122 @@
+"""Cache"""
+import collections
+import threading
+
+__all__ = [
+    'EntityCache',
+]
+
+
+class EntityCache(object):
+    """Bounded LRU cache of entities (e.g., users and tweets of includes) shared across responses.
+
+    Entities are keyed by the store key and the ID as in ``tweetkit.models.expansions.index_by`` (e.g.,
+    ``('users', '2244994945')``). Share a cache across the pages of a paginator or the messages of a stream by
+    passing it as ``cache`` to the request, so that expansions resolve from previously seen entities.
+
+    Parameters
+    ----------
+    maxsize: int
+        The maximum number of entities of each type (e.g., users) to keep.
+    """
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self._stores = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, store_key, id_):
+        """Gets an entity and marks it as recently used.
+
+        Parameters
+        ----------
+        store_key: str
+            The store key (e.g., users).
+        id_: str
+            The ID (or the media key) of the entity.
+
+        Returns
+        -------
+        entity: dict or None
+            The entity or None if not in the cache.
+        """
+        with self._lock:
+            store = self._stores.get(store_key)
+            entity = None if store is None else store.get(id_)
+            if entity is None:
+                self.misses += 1
+                return None
+            store.move_to_end(id_)
+            self.hits += 1
+            return entity
+
+    def add(self, store_key, id_, entity):
+        """Adds (or updates) an entity, evicting the least recently used entity of the type if the cache is full.
+
+        Parameters
+        ----------
+        store_key: str
+            The store key (e.g., users).
+        id_: str
+            The ID (or the media key) of the entity.
+        entity: dict
+            The entity.
+
+        Returns
+        -------
+        new: bool
+            Whether the entity was not in the cache.
+        """
+        with self._lock:
+            store = self._stores.get(store_key)
+            if store is None:
+                store = self._stores[store_key] = collections.OrderedDict()
+            new = id_ not in store
+            store[id_] = entity
+            store.move_to_end(id_)
+            if len(store) > self.maxsize:
+                store.popitem(last=False)
+            return new
+
+    def clear(self):
+        """Removes all entities.
+
+        Returns
+        -------
+        None
+        """
+        with self._lock:
+            self._stores.clear()
+            self.hits, self.misses = 0, 0
+
+    def __contains__(self, key):
+        store_key, id_ = key
+        with self._lock:
+            return id_ in self._stores.get(store_key, ())
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(store) for store in self._stores.values())
+
+    @property
+    def stats(self):
+        """Gets the number of cached entities by type and the hit rate of lookups.
+
+        Returns
+        -------
+        stats: dict
+            The statistics.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entities': {store_key: len(store) for store_key, store in self._stores.items()},
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups > 0 else None,
+            }
+
+    def __repr__(self):
+        return 'EntityCache(maxsize={})'.format(self.maxsize)
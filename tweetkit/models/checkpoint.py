@@ -0,0 +1,171 @@
+"""Checkpoint"""
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from tweetkit.utils import json
+
+__all__ = [
+    'FileCheckpointStore',
+    'SQLiteCheckpointStore',
+]
+
+
+class FileCheckpointStore(object):
+    """Stores checkpoints as JSON files in a directory.
+
+    Parameters
+    ----------
+    path: str
+        Path to the directory of checkpoints (created if it does not exist).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _get_path(self, key):
+        return os.path.join(self.path, '{}.json'.format(key))
+
+    def save(self, key, state):
+        """Saves the state of a checkpoint.
+
+        Parameters
+        ----------
+        key: str
+            The key of the checkpoint.
+        state: dict
+            The state to save.
+
+        Returns
+        -------
+        None
+        """
+        # write to a temporary file first so that an existing checkpoint is never left partially written
+        fd, temp_path = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as fp:
+                fp.write(json.dumps(state))
+            os.replace(temp_path, self._get_path(key))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def load(self, key):
+        """Loads the state of a checkpoint.
+
+        Parameters
+        ----------
+        key: str
+            The key of the checkpoint.
+
+        Returns
+        -------
+        state: dict or None
+            The saved state or None if the checkpoint does not exist.
+        """
+        path = self._get_path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as fp:
+            return json.loads(fp.read())
+
+    def delete(self, key):
+        """Deletes a checkpoint.
+
+        Parameters
+        ----------
+        key: str
+            The key of the checkpoint.
+
+        Returns
+        -------
+        None
+        """
+        path = self._get_path(key)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def __repr__(self):
+        return 'FileCheckpointStore(path=\'{}\')'.format(self.path)
+
+
+class SQLiteCheckpointStore(object):
+    """Stores checkpoints in a SQLite database.
+
+    Parameters
+    ----------
+    path: str
+        Path to the database file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS checkpoints (key TEXT PRIMARY KEY, state TEXT, updated REAL)')
+
+    def _connect(self):
+        # connections can not be shared among threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path)
+            self._local.conn = conn
+        return conn
+
+    def save(self, key, state):
+        """Saves the state of a checkpoint.
+
+        Parameters
+        ----------
+        key: str
+            The key of the checkpoint.
+        state: dict
+            The state to save.
+
+        Returns
+        -------
+        None
+        """
+        with self._connect() as conn:
+            conn.execute('INSERT OR REPLACE INTO checkpoints (key, state, updated) VALUES (?, ?, ?)',
+                         (key, json.dumps(state), time.time()))
+
+    def load(self, key):
+        """Loads the state of a checkpoint.
+
+        Parameters
+        ----------
+        key: str
+            The key of the checkpoint.
+
+        Returns
+        -------
+        state: dict or None
+            The saved state or None if the checkpoint does not exist.
+        """
+        row = self._connect().execute('SELECT state FROM checkpoints WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def delete(self, key):
+        """Deletes a checkpoint.
+
+        Parameters
+        ----------
+        key: str
+            The key of the checkpoint.
+
+        Returns
+        -------
+        None
+        """
+        with self._connect() as conn:
+            conn.execute('DELETE FROM checkpoints WHERE key = ?', (key,))
+
+    def __repr__(self):
+        return 'SQLiteCheckpointStore(path=\'{}\')'.format(self.path)
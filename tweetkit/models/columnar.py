@@ -0,0 +1,273 @@
+"""Columnar
+
+Converts lists of objects (e.g., the data of a page) to columns of selected fields without creating an object per
+item. Columns are returned as lists, NumPy arrays or an Arrow record batch (NumPy and Arrow are optional).
+
+The columns and their types are derived from the selected fields and the declared types of the fields of the
+data-type (see `schemas`), never from the data of a page, so that all batches of a paginator have the same schema
+(e.g., also an empty page or a page where a field is missing).
+"""
+import collections.abc
+
+from tweetkit.utils import json
+
+__all__ = [
+    'schemas',
+    'to_columns',
+]
+
+column_types = ['string', 'int', 'float', 'bool', 'timestamp', 'object']
+
+# fields parsed as timestamps if their type is not declared (by the name of the field)
+timestamp_fields = {
+    'created_at',
+    'updated_at',
+    'started_at',
+    'ended_at',
+    'scheduled_start',
+    'end_datetime',
+    'start',
+    'end',
+}
+
+
+def _metrics(prefix, names):
+    return {'{}.{}'.format(prefix, name): 'int' for name in names}
+
+
+_tweet_engagement = ['impression_count', 'like_count', 'reply_count', 'retweet_count', 'url_link_clicks',
+                     'user_profile_clicks']
+
+_media_playback = ['playback_0_count', 'playback_25_count', 'playback_50_count', 'playback_75_count',
+                   'playback_100_count']
+
+# column types of the (scalar) fields by data-type
+schemas = {
+    'Tweet': dict({
+        'id': 'string',
+        'text': 'string',
+        'author_id': 'string',
+        'conversation_id': 'string',
+        'created_at': 'timestamp',
+        'in_reply_to_user_id': 'string',
+        'lang': 'string',
+        'possibly_sensitive': 'bool',
+        'reply_settings': 'string',
+        'source': 'string',
+        'edit_controls.edits_remaining': 'int',
+        'edit_controls.is_edit_eligible': 'bool',
+        'edit_controls.editable_until': 'timestamp',
+        'geo.place_id': 'string',
+    }, **_metrics('public_metrics', ['retweet_count', 'reply_count', 'like_count', 'quote_count', 'bookmark_count',
+                                     'impression_count']),
+        **_metrics('non_public_metrics', ['impression_count', 'url_link_clicks', 'user_profile_clicks']),
+        **_metrics('organic_metrics', _tweet_engagement),
+        **_metrics('promoted_metrics', _tweet_engagement)),
+    'User': dict({
+        'id': 'string',
+        'name': 'string',
+        'username': 'string',
+        'created_at': 'timestamp',
+        'description': 'string',
+        'location': 'string',
+        'pinned_tweet_id': 'string',
+        'profile_image_url': 'string',
+        'protected': 'bool',
+        'url': 'string',
+        'verified': 'bool',
+        'verified_type': 'string',
+    }, **_metrics('public_metrics', ['followers_count', 'following_count', 'tweet_count', 'listed_count',
+                                     'like_count'])),
+    'Media': dict({
+        'media_key': 'string',
+        'type': 'string',
+        'url': 'string',
+        'duration_ms': 'int',
+        'height': 'int',
+        'width': 'int',
+        'preview_image_url': 'string',
+        'alt_text': 'string',
+    }, **_metrics('public_metrics', ['view_count']),
+        **_metrics('non_public_metrics', _media_playback),
+        **_metrics('organic_metrics', _media_playback + ['view_count']),
+        **_metrics('promoted_metrics', _media_playback + ['view_count'])),
+    'Place': {
+        'id': 'string',
+        'full_name': 'string',
+        'country': 'string',
+        'country_code': 'string',
+        'name': 'string',
+        'place_type': 'string',
+    },
+    'Poll': {
+        'id': 'string',
+        'duration_minutes': 'int',
+        'end_datetime': 'timestamp',
+        'voting_status': 'string',
+    },
+    'Space': {
+        'id': 'string',
+        'state': 'string',
+        'created_at': 'timestamp',
+        'ended_at': 'timestamp',
+        'lang': 'string',
+        'is_ticketed': 'bool',
+        'participant_count': 'int',
+        'subscriber_count': 'int',
+        'scheduled_start': 'timestamp',
+        'started_at': 'timestamp',
+        'title': 'string',
+        'updated_at': 'timestamp',
+        'creator_id': 'string',
+    },
+    'List': {
+        'id': 'string',
+        'name': 'string',
+        'created_at': 'timestamp',
+        'description': 'string',
+        'follower_count': 'int',
+        'member_count': 'int',
+        'private': 'bool',
+        'owner_id': 'string',
+    },
+    'SearchCount': {
+        'start': 'timestamp',
+        'end': 'timestamp',
+        'tweet_count': 'int',
+    },
+}
+
+outputs = ['list', 'numpy', 'arrow']
+
+
+def _get_schema(fields, dtype):
+    """Gets the column types of the selected fields, expanding wildcards (e.g., ``public_metrics.*``) to the
+    declared fields of the data-type."""
+    declared = schemas.get(dtype, {})
+    if isinstance(fields, collections.abc.Mapping):
+        types = dict(fields)
+    else:
+        types = dict.fromkeys(fields)
+    schema = {}
+    for field, column_type in types.items():
+        if field.endswith('.*'):
+            prefix = field[:-1]
+            expanded = [(key, value) for key, value in declared.items() if key.startswith(prefix)]
+            if len(expanded) == 0:
+                raise ValueError('expected wildcard \'{}\' to match declared fields of data-type \'{}\''
+                                 .format(field, dtype))
+            for key, value in expanded:
+                schema[key] = value if column_type is None else column_type
+            continue
+        if column_type is None:
+            column_type = declared.get(field)
+        if column_type is None:
+            column_type = 'timestamp' if field.rsplit('.', 1)[-1] in timestamp_fields else 'object'
+        schema[field] = column_type
+    for field, column_type in schema.items():
+        if column_type not in column_types:
+            raise ValueError('expected type of field \'{}\' to be one of {}, found \'{}\''
+                             .format(field, ', '.join(column_types), column_type))
+    return schema
+
+
+def _get(item, path):
+    for key in path:
+        if not isinstance(item, collections.abc.Mapping):
+            return None
+        item = item.get(key)
+    return item
+
+
+def _extract(data, fields):
+    """Extracts the values of each field in a single pass over the data."""
+    paths = [field.split('.') for field in fields]
+    columns = [[] for _ in fields]
+    for item in data:
+        for path, column in zip(paths, columns):
+            if len(path) == 1:
+                column.append(item.get(path[0]))
+            else:
+                column.append(_get(item, path))
+    return columns
+
+
+def _to_numpy(column_type, values):
+    import numpy as np
+    if column_type == 'timestamp':
+        # parse all timestamps at once (the UTC designator is removed as NumPy datetimes are timezone naive)
+        values = np.array(['NaT' if value is None else value for value in values], dtype=str)
+        return np.char.rstrip(values, 'Z').astype('datetime64[ms]')
+    if column_type in ('int', 'float'):
+        # missing numbers are NaN (in all batches, not only in the ones with missing values)
+        return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+    # strings, booleans and nested values are kept as objects (with None for missing values)
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    return column
+
+
+def _to_arrow(column_type, values):
+    import pyarrow as pa
+    if column_type == 'timestamp':
+        return pa.array(values, type=pa.string()).cast(pa.timestamp('ms', tz='UTC'))
+    if column_type == 'object':
+        # nested values are encoded as JSON
+        values = [None if value is None else json.dumps(value) for value in values]
+        return pa.array(values, type=pa.string())
+    arrow_types = {'string': pa.string(), 'int': pa.int64(), 'float': pa.float64(), 'bool': pa.bool_()}
+    return pa.array(values, type=arrow_types[column_type])
+
+
+def to_columns(data, fields, output='numpy', dtype=None):
+    """Converts objects to columns of the selected fields.
+
+    Parameters
+    ----------
+    data: list of dict or dict
+        The objects (e.g., the data of a page of Tweets).
+    fields: list of str or dict
+        The fields to select. Nested fields are separated by a dot (e.g., ``public_metrics.like_count``) and all
+        declared fields of a nested object are selected with a wildcard (e.g., ``public_metrics.*``). Provide a
+        dict of fields to types (one of `string`, `int`, `float`, `bool`, `timestamp` or `object`) to select
+        fields which are not declared for the data-type (these are objects unless named as timestamps).
+    output: str
+        The type of the columns, one of `list` (dict of lists), `numpy` (dict of NumPy arrays) or `arrow`
+        (Arrow record batch). Timestamps (e.g., ``created_at``) are parsed for NumPy and Arrow. NumPy columns of
+        numbers are floats (NaN for missing values), other columns are objects. Arrow columns of objects are
+        encoded as JSON.
+    dtype: str
+        The data-type of the objects (e.g., Tweet or User) declaring the types of fields.
+
+    Returns
+    -------
+    columns: dict or pyarrow.RecordBatch
+        The columns by field.
+    """
+    if output not in outputs:
+        raise ValueError('expected output to be one of {}, found \'{}\''.format(', '.join(outputs), output))
+    if isinstance(fields, str):
+        fields = [fields]
+    if data is None:
+        data = []
+    elif isinstance(data, collections.abc.Mapping):
+        data = [data]
+    schema = _get_schema(fields, dtype)
+    fields = list(schema)
+    columns = _extract(data, fields)
+    if output == 'list':
+        return dict(zip(fields, columns))
+    if output == 'numpy':
+        try:
+            import numpy  # noqa: F401
+        except ImportError as ex:
+            raise ImportError('NumPy output requires numpy, install it with '
+                              '\'pip install tweetkit[columnar]\'') from ex
+        return {field: _to_numpy(schema[field], values) for field, values in zip(fields, columns)}
+    try:
+        import pyarrow as pa
+    except ImportError as ex:
+        raise ImportError('Arrow output requires pyarrow, install it with '
+                          '\'pip install tweetkit[columnar]\'') from ex
+    arrays = [_to_arrow(schema[field], values) for field, values in zip(fields, columns)]
+    return pa.RecordBatch.from_arrays(arrays, names=fields)
@@ -1,10 +1,12 @@
 """ObjectStore"""
 import collections
+import collections.abc
 
 from tweetkit.utils import copy
 
 __all__ = [
     'TwitterExpansions',
+    'ExpandedView',
 ]
 
 index_by = {
@@ -30,18 +32,159 @@ mappings = {
 }
 
 
+def _lookup(store_key, id_key):
+    def resolve(view):
+        return view._expansions.get(store_key, view._data[id_key])
+
+    return resolve
+
+
+def _lookup_all(store_key, ids_key):
+    def resolve(view):
+        expansions = view._expansions
+        return [expansions.get(store_key, id_) for id_ in view._data.get(ids_key, ())]
+
+    return resolve
+
+
+def _resolve_referenced_tweets(view):
+    expansions = view._expansions
+    id_ = view._data['id']
+    return [view if ref['id'] == id_ else expansions.get('tweets', ref['id'])
+            for ref in view._data['referenced_tweets']]
+
+
+# expanded outputs by dtype: (key, required key in data or None, resolver)
+_attachment_fields = (
+    ('polls', None, _lookup_all('polls', 'poll_ids')),
+    ('media', None, _lookup_all('media', 'media_keys')),
+)
+
+_geo_fields = (
+    ('place', 'place_id', _lookup('places', 'place_id')),
+)
+
+_owner_fields = (
+    ('owner', 'owner_id', _lookup('users', 'owner_id')),
+)
+
+_fields = {
+    'Tweet': (
+        ('attachments', 'attachments', lambda view: ExpandedView(view._data['attachments'], view._expansions,
+                                                                 _attachment_fields)),
+        ('referenced_tweets', 'referenced_tweets', _resolve_referenced_tweets),
+        ('author', 'author_id', _lookup('users', 'author_id')),
+        ('in_reply_to_user', 'in_reply_to_user_id', _lookup('users', 'in_reply_to_user_id')),
+        ('geo', 'geo', lambda view: ExpandedView(view._data['geo'], view._expansions, _geo_fields)),
+    ),
+    'User': (
+        ('pinned_tweet', 'pinned_tweet_id', _lookup('tweets', 'pinned_tweet_id')),
+    ),
+    'Space': (
+        ('hosts', 'host_ids', _lookup_all('users', 'host_ids')),
+        ('invited_users', 'invited_user_ids', _lookup_all('users', 'invited_user_ids')),
+        ('speakers', 'speaker_ids', _lookup_all('users', 'speaker_ids')),
+    ),
+    'List': _owner_fields,
+    'Media': _owner_fields,
+    'Place': _owner_fields,
+}
+
+
+class ExpandedView(collections.abc.Mapping):
+    """Read-only view of a data object with expanded outputs.
+
+    Expanded outputs (e.g., ``author`` of a Tweet) are resolved from the includes on first access without copying
+    the data object. Values other than the expanded outputs are shared with the data object, hence should not be
+    modified.
+
+    Parameters
+    ----------
+    data: dict
+        The data object.
+    expansions: TwitterExpansions
+        The index of includes to resolve expanded outputs from.
+    fields: tuple of tuple
+        The expanded outputs as tuples of key, key required in the data (or None) and resolver.
+    """
+
+    __slots__ = ('_data', '_expansions', '_fields', '_values')
+
+    def __init__(self, data, expansions, fields=()):
+        self._data = data
+        self._expansions = expansions
+        self._fields = {key: resolve for key, required, resolve in fields if required is None or required in data}
+        self._values = {}
+
+    def __getitem__(self, key):
+        resolve = self._fields.get(key)
+        if resolve is None:
+            return self._data[key]
+        try:
+            return self._values[key]
+        except KeyError:
+            value = self._values[key] = resolve(self)
+            return value
+
+    def __iter__(self):
+        for key in self._data:
+            yield key
+        for key in self._fields:
+            if key not in self._data:
+                yield key
+
+    def __len__(self):
+        return len(self._data) + sum(1 for key in self._fields if key not in self._data)
+
+    def to_dict(self):
+        """Gets the data object with expanded outputs as a dict.
+
+        Returns
+        -------
+        dict
+            The expanded data object.
+        """
+        return {key: _to_dict(self[key], self) for key in self}
+
+    def __repr__(self):
+        return 'ExpandedView({!r})'.format(self._data)
+
+
+def _to_dict(value, parent):
+    if isinstance(value, ExpandedView):
+        # referenced tweets of a tweet may refer to the tweet itself
+        return value._data if value is parent else value.to_dict()
+    if isinstance(value, list):
+        return [_to_dict(item, parent) for item in value]
+    return value
+
+
 class TwitterExpansions(object):
-    """TwitterExpansions"""
+    """TwitterExpansions
+
+    Parameters
+    ----------
+    includes: dict
+        The includes of a response.
+    cache: EntityCache
+        The cache of entities shared across responses. Includes are added to the cache and references which are
+        not in the includes are resolved from the cache.
+    """
 
-    def __init__(self, includes=None, **kwargs):
+    def __init__(self, includes=None, cache=None, **kwargs):
         self._includes = {store_key: {} for store_key in index_by.keys()}
+        self._next_id = 0
+        self._cache = cache
+        # includes which were not in the cache
+        self._new_includes = {}
         if includes is None:
             includes = {}
         if 'includes' in includes:
             includes = includes['includes']
         for key, value in includes.items():
             self.add(value, dtype=key)
-        self._next_id = 0
+        # references to includes by data ID
+        self._references = {}
 
     @property
     def next_id(self):
@@ -53,10 +196,10 @@ class TwitterExpansions(object):
         """Add to index."""
         if data is None:
             return
-        if isinstance(data, collections.Sequence):
+        if isinstance(data, collections.abc.Sequence):
             for item in data:
                 self.add(item, dtype=dtype)
-        elif isinstance(data, collections.Mapping):
+        elif isinstance(data, collections.abc.Mapping):
             if dtype in mappings:
                 store_key = mappings[dtype]
             else:
@@ -68,79 +211,150 @@ class TwitterExpansions(object):
             else:
                 id_ = self.next_id
             self._includes[store_key][id_] = data
+            if self._cache is not None and store_key in index_by and self._cache.add(store_key, id_, data):
+                self._new_includes.setdefault(store_key, []).append(data)
         else:
             raise TypeError('expected dict or list, found {}'.format(type(data).__name__))
 
-    def get_includes(self, data):
-        """Gets mapping of includes used in the provided data."""
-        if not isinstance(data, collections.Mapping):
-            raise TypeError('expected dict, found {}'.format(type(data).__name__))
-        expansions = TwitterExpansions()
-        if 'attachments' in data:
-            attachments = data['attachments']
-            if 'poll_ids' in attachments:
-                poll_ids = attachments['poll_ids']
-                for poll_id in poll_ids:
-                    poll = self._includes['polls'].get(poll_id)
-                    expansions.add(poll, dtype='Poll')
-            if 'media_keys' in attachments:
-                media_keys = attachments['media_keys']
-                for media_key in media_keys:
-                    media_ = self._includes['media'].get(media_key)
-                    expansions.add(media_, dtype='Media')
-        if 'referenced_tweets' in data:
-            referenced_tweets = data['referenced_tweets']
-            for referenced_tweet in referenced_tweets:
-                referenced_tweet_id = referenced_tweet['id']
-                tweet_ = self._includes['tweets'].get(referenced_tweet_id)
-                expansions.add(tweet_, dtype='Tweet')
+    def get(self, store_key, id_):
+        """Gets an include by the store key and ID (resolved from the cache if not in the includes).
+
+        Parameters
+        ----------
+        store_key: str
+            The store key (e.g., users).
+        id_: str
+            The ID (or the media key) of the include.
+
+        Returns
+        -------
+        include: dict or None
+            The include or None if not found.
+        """
+        include = self._includes[store_key].get(id_)
+        if include is None and self._cache is not None:
+            include = self._cache.get(store_key, id_)
+        return include
+
+    @property
+    def new_includes(self):
+        """Gets includes which were not seen by the cache before (e.g., to emit each entity once).
+
+        Returns all includes if there is no cache.
+
+        Returns
+        -------
+        includes: dict
+            Mapping of store key to the list of includes.
+        """
+        if self._cache is None:
+            return {key: list(val.values()) for key, val in self._includes.items() if len(val) > 0}
+        return {key: list(val) for key, val in self._new_includes.items()}
+
+    def get_references(self, data):
+        """Gets references to includes in the provided data.
+
+        References are cached by the ID of the data so that they are computed once per item.
+
+        Parameters
+        ----------
+        data: dict
+            The data object (e.g., Tweet, User, Space or List).
+
+        Returns
+        -------
+        references: tuple of tuple
+            Pairs of store key and ID (e.g., ``('users', '2244994945')``) of the referenced includes.
+        """
+        id_ = data.get('id')
+        references = self._references.get(id_) if id_ is not None else None
+        if references is not None:
+            return references
+        references = []
+        attachments = data.get('attachments')
+        if attachments is not None:
+            for poll_id in attachments.get('poll_ids', ()):
+                references.append(('polls', poll_id))
+            for media_key in attachments.get('media_keys', ()):
+                references.append(('media', media_key))
+        for referenced_tweet in data.get('referenced_tweets', ()):
+            references.append(('tweets', referenced_tweet['id']))
         if 'author_id' in data:
-            author_id = data['author_id']
-            user = self._includes['users'].get(author_id)
-            expansions.add(user, dtype='User')
+            references.append(('users', data['author_id']))
         if 'in_reply_to_user_id' in data:
-            in_reply_to_user_id = data['in_reply_to_user_id']
-            user = self._includes['users'].get(in_reply_to_user_id)
-            expansions.add(user, dtype='User')
+            references.append(('users', data['in_reply_to_user_id']))
         if 'geo' in data and 'place_id' in data['geo']:
-            place_id = data['geo']['place_id']
-            place = self._includes['places'].get(place_id)
-            expansions.add(place, dtype='Place')
+            references.append(('places', data['geo']['place_id']))
         if 'pinned_tweet_id' in data:
-            pinned_tweet_id = data['pinned_tweet_id']
-            tweet_ = self._includes['tweets'].get(pinned_tweet_id)
-            expansions.add(tweet_, dtype='Tweet')
-        if 'host_ids' in data:
-            host_ids = data['host_ids']
-            for host_id in host_ids:
-                host = self._includes['users'].get(host_id)
-                expansions.add(host, dtype='User')
-        if 'invited_user_ids' in data:
-            invited_user_ids = data['invited_user_ids']
-            for invited_user_id in invited_user_ids:
-                invited_user = self._includes['users'].get(invited_user_id)
-                expansions.add(invited_user, dtype='User')
-        if 'speaker_ids' in data:
-            speaker_ids = data['speaker_ids']
-            for speaker_id in speaker_ids:
-                speaker = self._includes['users'].get(speaker_id)
-                expansions.add(speaker, dtype='User')
+            references.append(('tweets', data['pinned_tweet_id']))
+        for key in ('host_ids', 'invited_user_ids', 'speaker_ids'):
+            for user_id in data.get(key, ()):
+                references.append(('users', user_id))
         if 'owner_id' in data:
-            owner_id = data['owner_id']
-            owner = self._includes['users'].get(owner_id)
-            expansions.add(owner, dtype='User')
-        includes = {}
-        for key, val in expansions._includes.items():
-            if len(val) > 0:
-                includes[key] = list(val.values())
-        return includes
-
-    def expand(self, data, dtype=None):
-        """Creates a copy with expanded outputs."""
-        if isinstance(data, collections.Sequence) and not isinstance(data, str):
-            return [self.expand(item, dtype=dtype) for item in data]
-        if not isinstance(data, collections.MutableMapping):
+            references.append(('users', data['owner_id']))
+        references = tuple(references)
+        if id_ is not None:
+            self._references[id_] = references
+        return references
+
+    def index_references(self, data):
+        """Precomputes references to includes of a list of data objects (e.g., the data of a page).
+
+        Parameters
+        ----------
+        data: list of dict or dict
+            The data objects.
+
+        Returns
+        -------
+        None
+        """
+        if isinstance(data, collections.abc.Mapping):
+            data = [data]
+        for item in data:
+            self.get_references(item)
+
+    def get_includes(self, data):
+        """Gets mapping of includes used in the provided data."""
+        if not isinstance(data, collections.abc.Mapping):
+            raise TypeError('expected dict, found {}'.format(type(data).__name__))
+        found = {}
+        for store_key, id_ in self.get_references(data):
+            include = self.get(store_key, id_)
+            if include is None:
+                continue
+            store = found.get(store_key)
+            if store is None:
+                store = found[store_key] = {}
+            store[id_] = include
+        if len(found) == 0:
+            return {}
+        # keep the order of stores consistent
+        return {key: list(found[key].values()) for key in index_by if key in found}
+
+    def expand(self, data, dtype=None, view=False):
+        """Creates a copy with expanded outputs.
+
+        Parameters
+        ----------
+        data: dict or list of dict
+            The data object(s).
+        dtype: str
+            The type of data (e.g., Tweet, User, Space or List).
+        view: bool
+            Whether to return read-only views resolving expanded outputs on access instead of copies.
+
+        Returns
+        -------
+        dict or ExpandedView or list
+            The expanded data object(s).
+        """
+        if isinstance(data, collections.abc.Sequence) and not isinstance(data, str):
+            return [self.expand(item, dtype=dtype, view=view) for item in data]
+        if not isinstance(data, collections.abc.Mapping):
             raise TypeError('expected list or dict, found {}'.format(type(data).__name__))
+        if view:
+            return ExpandedView(data, self, _fields.get('Tweet' if dtype is None else dtype, ()))
         data = copy.deepcopy(data)
         if dtype is None or dtype == 'Tweet':
             if 'attachments' in data:
@@ -149,14 +363,14 @@ class TwitterExpansions(object):
                 if 'poll_ids' in attachments:
                     poll_ids = attachments['poll_ids']
                     for poll_id in poll_ids:
-                        poll = self._includes['polls'].get(poll_id)
+                        poll = self.get('polls', poll_id)
                         polls.append(poll)
                 data['attachments']['polls'] = polls
                 media = []
                 if 'media_keys' in attachments:
                     media_keys = attachments['media_keys']
                     for media_key in media_keys:
-                        media_ = self._includes['media'].get(media_key)
+                        media_ = self.get('media', media_key)
                         media.append(media_)
                 data['attachments']['media'] = media
             if 'referenced_tweets' in data:
@@ -167,59 +381,59 @@ class TwitterExpansions(object):
                     if data['id'] == referenced_tweet_id:
                         tweet_ = data
                     else:
-                        tweet_ = self._includes['tweets'].get(referenced_tweet_id)
+                        tweet_ = self.get('tweets', referenced_tweet_id)
                     referenced_tweet['tweet'] = tweet_
                     referenced_tweets_.append(tweet_)
                 data['referenced_tweets'] = referenced_tweets_
             if 'author_id' in data:
                 author_id = data['author_id']
-                data['author'] = self._includes['users'].get(author_id)
+                data['author'] = self.get('users', author_id)
             if 'in_reply_to_user_id' in data:
                 in_reply_to_user_id = data['in_reply_to_user_id']
-                data['in_reply_to_user'] = self._includes['users'].get(in_reply_to_user_id)
+                data['in_reply_to_user'] = self.get('users', in_reply_to_user_id)
             if 'geo' in data and 'place_id' in data['geo']:
                 place_id = data['geo']['place_id']
-                data['geo']['place'] = self._includes['places'].get(place_id)
+                data['geo']['place'] = self.get('places', place_id)
         elif dtype is None or dtype == 'User':
             if 'pinned_tweet_id' in data:
                 pinned_tweet_id = data['pinned_tweet_id']
-                data['pinned_tweet'] = self._includes['tweets'].get(pinned_tweet_id)
+                data['pinned_tweet'] = self.get('tweets', pinned_tweet_id)
         elif dtype is None or dtype == 'Space':
             if 'host_ids' in data:
                 host_ids = data['host_ids']
                 hosts = []
                 for host_id in host_ids:
-                    host = self._includes['users'].get(host_id)
+                    host = self.get('users', host_id)
                     hosts.append(host)
                 data['hosts'] = hosts
             if 'invited_user_ids' in data:
                 invited_user_ids = data['invited_user_ids']
                 invited_users = []
                 for invited_user_id in invited_user_ids:
-                    invited_user = self._includes['users'].get(invited_user_id)
+                    invited_user = self.get('users', invited_user_id)
                     invited_users.append(invited_user)
                 data['invited_users'] = invited_users
             if 'speaker_ids' in data:
                 speaker_ids = data['speaker_ids']
                 speakers = []
                 for speaker_id in speaker_ids:
-                    speaker = self._includes['users'].get(speaker_id)
+                    speaker = self.get('users', speaker_id)
                     speakers.append(speaker)
                 data['speakers'] = speakers
         elif dtype is None or dtype == 'List':
             if 'owner_id' in data:
                 owner_id = data['owner_id']
-                owner = self._includes['users'].get(owner_id)
+                owner = self.get('users', owner_id)
                 data['owner'] = owner
         elif dtype is None or dtype == 'Media':
             if 'owner_id' in data:
                 owner_id = data['owner_id']
-                owner = self._includes['users'].get(owner_id)
+                owner = self.get('users', owner_id)
                 data['owner'] = owner
         elif dtype is None or dtype == 'Place':
             if 'owner_id' in data:
                 owner_id = data['owner_id']
-                owner = self._includes['users'].get(owner_id)
+                owner = self.get('users', owner_id)
                 data['owner'] = owner
         elif dtype is None or dtype == 'Poll':
             pass
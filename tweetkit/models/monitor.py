@@ -0,0 +1,331 @@
+"""Monitor"""
+import collections
+import datetime
+import itertools
+import threading
+import time
+
+__all__ = [
+    'StreamMonitor',
+]
+
+_time_formats = ['%Y-%m-%dT%H:%M:%S.%fZ', '%Y-%m-%dT%H:%M:%SZ']
+
+_epoch = datetime.datetime(1970, 1, 1)
+
+
+def _parse_timestamp(value):
+    """Parses a timestamp of the API (e.g., ``2022-10-17T12:00:00.000Z``) to seconds since the epoch."""
+    for time_format in _time_formats:
+        try:
+            return (datetime.datetime.strptime(value, time_format) - _epoch).total_seconds()
+        except ValueError:
+            pass
+    return None
+
+
+class _Connection(object):
+    """State of a connection recorded by a monitor (returned by `StreamMonitor.connected`)."""
+
+    __slots__ = ('id', 'name', 'connected', 'last_received', 'last_heartbeat', 'stalled_since', 'open')
+
+    def __init__(self, id_, name, now):
+        self.id = id_
+        self.name = name
+        self.connected = now
+        self.last_received = now
+        self.last_heartbeat = None
+        self.stalled_since = None
+        self.open = True
+
+    def __repr__(self):
+        return '_Connection(id={}, name={!r})'.format(self.id, self.name)
+
+
+class StreamMonitor(object):
+    """Live health metrics of streams with stall detection.
+
+    Tracks the intervals between heartbeats, the rate of messages and bytes, and the lag between the ``created_at``
+    of tweets and the time they are received. Share a monitor across the connections of a stream (e.g., the
+    reconnects of a ``ReconnectingStream`` or the partitions of a ``PartitionedStream``) by passing it as
+    ``monitor`` to the request. Heartbeats and stalls are tracked per connection, so that a stalled partition is
+    detected while other partitions receive data; rates and lags are of all connections.
+
+    Twitter sends a heartbeat every 20 seconds, so a connection which receives nothing (neither messages nor
+    heartbeats) for longer than `stall_timeout` is stalled. Stalls are detected by a background thread while the
+    stream is blocked on reading, well before the read timeout ends the connection.
+
+    Callbacks are called with the stats of the monitor (stall callbacks from the thread of the monitor).
+
+    Parameters
+    ----------
+    stall_timeout: float
+        The number of seconds without data after which a connection is stalled (None to disable stall detection).
+    window: float
+        The number of seconds of recent messages over which rates and lags are computed.
+    max_lag: float
+        The number of seconds of lag after which the stream is lagging (None to disable).
+    on_stall: typing.Callable
+        Called when a stall of a connection is detected.
+    on_resume: typing.Callable
+        Called when a stalled connection receives data.
+    on_lag: typing.Callable
+        Called when the lag exceeds `max_lag` (once until the lag recovers).
+    """
+
+    def __init__(self, stall_timeout=22.0, window=60.0, max_lag=None, on_stall=None, on_resume=None, on_lag=None):
+        self.stall_timeout = stall_timeout
+        self.window = window
+        self.max_lag = max_lag
+        self.on_stall = on_stall
+        self.on_resume = on_resume
+        self.on_lag = on_lag
+        self._lock = threading.Lock()
+        self._watchdog = None
+        self._ids = itertools.count(1)
+        # open connections by ID
+        self._connections = collections.OrderedDict()
+        self._start = time.monotonic()
+        self._lagging = False
+        # recent messages (time, count, bytes) and lags (time, lag)
+        self._recent = collections.deque()
+        self._lags = collections.deque()
+        # totals
+        self.connects = 0
+        self.messages = 0
+        self.heartbeats = 0
+        self.bytes = 0
+        self.stalls = 0
+        self.stalled_seconds = 0.0
+        self.heartbeat_interval = None
+        self.max_heartbeat_interval = None
+        self._heartbeat_intervals = 0
+        self._heartbeat_seconds = 0.0
+        self.lag = None
+
+    def connected(self, name=None):
+        """Records a new connection (and starts the stall detection).
+
+        Parameters
+        ----------
+        name: str
+            The name of the connection (e.g., the partition).
+
+        Returns
+        -------
+        connection: object
+            The connection to record data of (with `add_heartbeat` and `add_messages`) and to end with
+            `disconnected`.
+        """
+        with self._lock:
+            self.connects += 1
+            connection = _Connection(next(self._ids), name, time.monotonic())
+            self._connections[connection.id] = connection
+            if self.stall_timeout is not None and self._watchdog is None:
+                self._watchdog = threading.Thread(target=self._watch, daemon=True)
+                self._watchdog.start()
+        return connection
+
+    def disconnected(self, connection):
+        """Records the end of a connection.
+
+        Parameters
+        ----------
+        connection: object
+            The connection returned by `connected`.
+
+        Returns
+        -------
+        None
+        """
+        with self._lock:
+            if not connection.open:
+                return
+            connection.open = False
+            self._connections.pop(connection.id, None)
+            if connection.stalled_since is not None:
+                # the stall ends with the connection
+                self.stalled_seconds += time.monotonic() - connection.stalled_since
+                connection.stalled_since = None
+
+    def _watch(self):
+        interval = min(1.0, self.stall_timeout / 4.0)
+        while True:
+            time.sleep(interval)
+            with self._lock:
+                if len(self._connections) == 0:
+                    self._watchdog = None
+                    return
+                now = time.monotonic()
+                stalled = 0
+                for connection in self._connections.values():
+                    if connection.stalled_since is None and now - connection.last_received > self.stall_timeout:
+                        connection.stalled_since = connection.last_received
+                        stalled += 1
+                self.stalls += stalled
+            if self.on_stall is not None:
+                for _ in range(stalled):
+                    self.on_stall(self.stats)
+
+    def _received(self, connection, now):
+        """Updates the time of the last data of a connection and gets whether a stall ended (requires the lock)."""
+        connection.last_received = now
+        if connection.stalled_since is None:
+            return False
+        self.stalled_seconds += now - connection.stalled_since
+        connection.stalled_since = None
+        return True
+
+    def _prune(self, now):
+        since = now - self.window
+        while len(self._recent) > 0 and self._recent[0][0] < since:
+            self._recent.popleft()
+        while len(self._lags) > 0 and self._lags[0][0] < since:
+            self._lags.popleft()
+
+    def add_heartbeat(self, connection, size=0, count=1):
+        """Records heartbeats of a connection.
+
+        Parameters
+        ----------
+        connection: object
+            The connection returned by `connected`.
+        size: int
+            The number of bytes of the heartbeats.
+        count: int
+            The number of heartbeats.
+
+        Returns
+        -------
+        None
+        """
+        now = time.monotonic()
+        with self._lock:
+            resumed = self._received(connection, now)
+            self.heartbeats += count
+            self.bytes += size
+            if connection.last_heartbeat is not None:
+                interval = now - connection.last_heartbeat
+                self.heartbeat_interval = interval
+                if self.max_heartbeat_interval is None or interval > self.max_heartbeat_interval:
+                    self.max_heartbeat_interval = interval
+                self._heartbeat_intervals += 1
+                self._heartbeat_seconds += interval
+            connection.last_heartbeat = now
+        if resumed and self.on_resume is not None:
+            self.on_resume(self.stats)
+
+    def add_messages(self, connection, size, count=1):
+        """Records messages received by a connection.
+
+        Parameters
+        ----------
+        connection: object
+            The connection returned by `connected`.
+        size: int
+            The number of bytes of the messages.
+        count: int
+            The number of messages.
+
+        Returns
+        -------
+        None
+        """
+        now = time.monotonic()
+        with self._lock:
+            resumed = self._received(connection, now)
+            self.messages += count
+            self.bytes += size
+            self._recent.append((now, count, size))
+            self._prune(now)
+        if resumed and self.on_resume is not None:
+            self.on_resume(self.stats)
+
+    def add_created_at(self, created_at):
+        """Records the lag of a message from its creation time.
+
+        Parameters
+        ----------
+        created_at: str
+            The ``created_at`` of the message (e.g., a tweet).
+
+        Returns
+        -------
+        None
+        """
+        created = _parse_timestamp(created_at) if isinstance(created_at, str) else None
+        if created is None:
+            return
+        lag = max(time.time() - created, 0.0)
+        with self._lock:
+            self.lag = lag
+            now = time.monotonic()
+            self._lags.append((now, lag))
+            self._prune(now)
+            lagging = self.max_lag is not None and lag > self.max_lag
+            started_lagging = lagging and not self._lagging
+            self._lagging = lagging
+        if started_lagging and self.on_lag is not None:
+            self.on_lag(self.stats)
+
+    @property
+    def stalled(self):
+        """Whether a connection is stalled."""
+        with self._lock:
+            return any(connection.stalled_since is not None for connection in self._connections.values())
+
+    @property
+    def stats(self):
+        """Gets the live metrics of the stream.
+
+        Returns
+        -------
+        stats: dict
+            The number of connections, messages, heartbeats and bytes (in line mode, excluding line breaks), the
+            message and byte rates over the window, the heartbeat intervals, the lags (in seconds, over the window),
+            the stalls, and the seconds since data was last received and whether it is stalled by open connection.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            elapsed = min(self.window, now - self._start)
+            messages = sum(count for _, count, _ in self._recent)
+            size = sum(size for _, _, size in self._recent)
+            lags = [lag for _, lag in self._lags]
+            stalled_seconds = self.stalled_seconds
+            connections = []
+            for connection in self._connections.values():
+                if connection.stalled_since is not None:
+                    stalled_seconds += now - connection.stalled_since
+                connections.append({
+                    'id': connection.id,
+                    'name': connection.name,
+                    'connected_seconds': now - connection.connected,
+                    'idle_seconds': now - connection.last_received,
+                    'stalled': connection.stalled_since is not None,
+                })
+            return {
+                'connected': len(connections) > 0,
+                'connects': self.connects,
+                'messages': self.messages,
+                'heartbeats': self.heartbeats,
+                'bytes': self.bytes,
+                'messages_per_second': messages / elapsed if elapsed > 0 else None,
+                'bytes_per_second': size / elapsed if elapsed > 0 else None,
+                'heartbeat_interval': self.heartbeat_interval,
+                'mean_heartbeat_interval': self._heartbeat_seconds / self._heartbeat_intervals
+                if self._heartbeat_intervals > 0 else None,
+                'max_heartbeat_interval': self.max_heartbeat_interval,
+                'lag': self.lag,
+                'mean_lag': sum(lags) / len(lags) if len(lags) > 0 else None,
+                'max_lag': max(lags) if len(lags) > 0 else None,
+                'lagging': self._lagging,
+                'idle_seconds': max((c['idle_seconds'] for c in connections), default=None),
+                'stalled': any(c['stalled'] for c in connections),
+                'stalls': self.stalls,
+                'stalled_seconds': stalled_seconds,
+                'connections': connections,
+            }
+
+    def __repr__(self):
+        return 'StreamMonitor(stall_timeout={})'.format(self.stall_timeout)
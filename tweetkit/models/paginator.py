@@ -1,48 +1,415 @@
 """Paginator"""
+import asyncio
 import collections
+import collections.abc
+import hashlib
+import queue
+import threading
+import urllib.parse
+import weakref
+
+from tweetkit.utils import json
 
 __all__ = [
     'Paginator',
+    'AsyncPaginator',
 ]
 
 
+def _prefetch_pages(ref, pages, stop):
+    """Fetches pages in a background thread.
+
+    Only a weak reference to the paginator is kept in between pages, so that a paginator which is no longer used
+    (e.g., after breaking out of a loop without closing it) is collected and its finalizer stops the thread.
+    """
+    def put(item):
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    try:
+        while not stop.is_set():
+            paginator = ref()
+            if paginator is None:
+                return
+            resp = paginator._next_page()
+            del paginator
+            if not put(resp) or resp is None:
+                return
+    except BaseException as ex:
+        put(ex)
+
+
+def _cancel(task):
+    if not task.done():
+        try:
+            task.cancel()
+        except RuntimeError:
+            # the event loop is closed
+            pass
+
+
+async def _aprefetch_pages(ref, pages):
+    """Fetches pages in a background task (only a weak reference to the paginator is kept in between pages)."""
+    try:
+        while True:
+            paginator = ref()
+            if paginator is None:
+                return
+            resp = await paginator._next_page()
+            del paginator
+            await pages.put(resp)
+            if resp is None:
+                return
+    except asyncio.CancelledError:
+        raise
+    except BaseException as ex:
+        await pages.put(ex)
+
+
 class Paginator(object):
-    """Paginator."""
+    """Paginator.
+
+    Parameters
+    ----------
+    request: TwitterRequest
+        The request to paginate.
+    prefetch: int
+        The number of pages to fetch ahead in a background thread (as soon as the next token is known) while the
+        current page is processed. Zero (default) disables prefetching.
+    checkpoint: FileCheckpointStore or SQLiteCheckpointStore
+        The store to save the cursor state to. If an unfinished checkpoint exists for the key, iteration resumes
+        from the saved cursor instead of the first page. The checkpoint is deleted when the iteration completes,
+        hence a later run of the same request starts from the first page again.
+    checkpoint_key: str
+        The key of the checkpoint (defaults to a digest of the request URL, method, query and params).
+    checkpoint_every: int
+        The number of pages in between two checkpoints.
+
+    Prefetching stops when the iteration ends, when `close` is called or when the paginator is garbage collected
+    (e.g., after breaking out of a loop over a paginator which is no longer referenced).
+    """
 
-    def __init__(self, request):
+    def __init__(self, request, prefetch=0, checkpoint=None, checkpoint_key=None, checkpoint_every=1):
         self.request = request
+        self.prefetch = prefetch
         self.next_token = None
         self.has_next = True
         self.errors = []
+        # prefetch state
+        self._queue = None
+        self._stop = None
+        self._worker = None
+        # stops the worker when the paginator is collected
+        self._finalizer = None
+        # checkpoint state
+        self.checkpoint = checkpoint
+        if checkpoint_key is None:
+            checkpoint_key = self._get_checkpoint_key()
+        self.checkpoint_key = checkpoint_key
+        self.checkpoint_every = checkpoint_every
+        self.pages = 0
+        self.items = 0
 
-    def __next__(self):
-        if not self.has_next:
-            raise StopIteration()
-        try:
-            self.request.query['next_token'] = self.next_token
-            resp = self.request.send()
-        except Exception as ex:
-            raise ex
+    def _get_cursor_query(self):
+        return {k: v for k, v in (self.request.query or {}).items() if k != 'next_token'}
+
+    def _get_checkpoint_key(self):
+        key = json.dumps([self.request.method, self.request.url, self._get_cursor_query(), self.request.params],
+                         sort_keys=True)
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def get_state(self, next_token=None, has_next=True):
+        """Gets the cursor state of the paginator.
+
+        Parameters
+        ----------
+        next_token: str
+            The token of the next page to be returned.
+        has_next: bool
+            Whether there are more pages.
+
+        Returns
+        -------
+        state: dict
+            The cursor state.
+        """
+        return {
+            'path': urllib.parse.urlsplit(self.request.url).path,
+            'method': self.request.method,
+            'query': self._get_cursor_query(),
+            'params': self.request.params,
+            # the entity cache is not serializable (provide it again when resuming)
+            'kwargs': {k: v for k, v in self.request.kwargs.items() if k != 'cache'},
+            'next_token': next_token,
+            'has_next': has_next,
+            'pages': self.pages,
+            'items': self.items,
+        }
+
+    def _restore(self):
+        """Restores the cursor from the checkpoint (or resets it if there is no checkpoint)."""
+        state = None
+        if self.checkpoint is not None:
+            state = self.checkpoint.load(self.checkpoint_key)
+        if state is not None and not state['has_next']:
+            # the checkpoint of a completed run (e.g., saved with the last page) is not resumed
+            self.checkpoint.delete(self.checkpoint_key)
+            state = None
+        if state is None:
+            self.next_token, self.has_next, self.pages, self.items = None, True, 0, 0
+        else:
+            self.next_token, self.has_next = state['next_token'], state['has_next']
+            self.pages, self.items = state['pages'], state['items']
+
+    def _emit(self, resp):
+        """Updates the cursor state with the page returned to the caller."""
+        self.pages += 1
+        # prefer result count of meta, which does not require decoding the data of lazy responses
+        result_count = resp.meta.get('result_count')
+        if result_count is not None:
+            self.items += result_count
+        elif isinstance(resp.data, collections.abc.Sequence) and not isinstance(resp.data, str):
+            self.items += len(resp.data)
         else:
-            self.next_token = resp.meta.get('next_token')
-            self.has_next = self.next_token is not None
-            # also stop when meta has result_count equals to zero
-            if resp.meta.get('result_count') == 0:
+            self.items += 1
+        next_token = resp.meta.get('next_token')
+        if self.checkpoint is not None and next_token is not None and self.pages % self.checkpoint_every == 0:
+            # the page is returned, resume from the page after it
+            self.checkpoint.save(self.checkpoint_key, self.get_state(next_token))
+        return resp
+
+    def _finish(self):
+        """Deletes the checkpoint of the completed cursor."""
+        if self.checkpoint is not None:
+            self.checkpoint.delete(self.checkpoint_key)
+
+    @classmethod
+    def from_checkpoint(cls, client, checkpoint, checkpoint_key, **kwargs):
+        """Creates the paginator saved to a checkpoint.
+
+        Only unfinished runs can be resumed, the checkpoint of a completed run is deleted (raises KeyError).
+
+        Parameters
+        ----------
+        client: TwitterClient or AsyncTwitterClient
+            The client to make requests with.
+        checkpoint: FileCheckpointStore or SQLiteCheckpointStore
+            The checkpoint store.
+        checkpoint_key: str
+            The key of the checkpoint.
+        kwargs: typing.Any
+            Other keyword arguments to the request (e.g., `prefetch`).
+
+        Returns
+        -------
+        paginator: Paginator or AsyncPaginator
+            The paginator which resumes from the checkpoint.
+        """
+        state = checkpoint.load(checkpoint_key)
+        if state is None:
+            raise KeyError('checkpoint \'{}\' not found'.format(checkpoint_key))
+        kwargs = dict(state['kwargs'], **kwargs)
+        return client.request(state['path'], method=state['method'], query=state['query'], params=state['params'],
+                              paginate=True, checkpoint=checkpoint, checkpoint_key=checkpoint_key, **kwargs)
+
+    def _next_page(self):
+        """Requests the next page (returns None if there are no more pages)."""
+        if not self.has_next:
+            return None
+        self.request.query['next_token'] = self.next_token
+        resp = self.request.send()
+        self.next_token = resp.meta.get('next_token')
+        self.has_next = self.next_token is not None
+        # also stop when meta has result_count equals to zero
+        if resp.meta.get('result_count') == 0:
+            self.has_next = False
+            return None
+        return resp
+
+    def __next__(self):
+        if self.prefetch <= 0:
+            resp = self._next_page()
+            if resp is None:
+                self._finish()
                 raise StopIteration()
-            return resp
+            return self._emit(resp)
+        if self._queue is None:
+            self._queue, self._stop = queue.Queue(maxsize=self.prefetch), threading.Event()
+            self._worker = threading.Thread(target=_prefetch_pages, args=(weakref.ref(self), self._queue, self._stop),
+                                            daemon=True)
+            self._finalizer = weakref.finalize(self, self._stop.set)
+            self._worker.start()
+        resp = self._queue.get()
+        if resp is None:
+            self.close()
+            self._finish()
+            raise StopIteration()
+        if isinstance(resp, BaseException):
+            self.close()
+            raise resp
+        return self._emit(resp)
 
     def __iter__(self):
-        self.next_token = None
-        self.has_next = True
+        self.close()
+        self._restore()
         return self
 
+    def close(self):
+        """Stop prefetching pages.
+
+        Returns
+        -------
+        None
+        """
+        if self._finalizer is not None:
+            # stops the worker
+            self._finalizer()
+        if self._worker is not None and self._worker is not threading.current_thread():
+            # wait for the request in progress (if any) to complete
+            self._worker.join()
+        self._queue, self._stop, self._worker, self._finalizer = None, None, None, None
+
+    def batches(self, fields, output='numpy', dtype=None):
+        """Iterator of columns of the selected fields, a batch per page (with the same schema).
+
+        Parameters
+        ----------
+        fields: list of str or dict
+            The fields to select (e.g., ``['id', 'author_id', 'created_at', 'public_metrics.*']``) or a dict of
+            fields to types.
+        output: str
+            The type of the columns, one of `list`, `numpy` or `arrow`.
+        dtype: str
+            The data-type declaring the types of fields (defaults to the data-type of the responses).
+
+        Returns
+        -------
+        generator of dict or pyarrow.RecordBatch
+            The columns by field of each page.
+        """
+        try:
+            for response in self:
+                yield response.to_columns(fields, output=output, dtype=dtype)
+        finally:
+            self.close()
+
     @property
     def content(self):
         """Iterator of objects."""
-        for response in self:
-            content = response.content
-            if isinstance(content, collections.Mapping):
-                yield content
-            else:
-                for item in content:
-                    yield item
+        try:
+            for response in self:
+                content = response.content
+                if isinstance(content, collections.abc.Mapping):
+                    yield content
+                else:
+                    for item in content:
+                        yield item
+        finally:
+            self.close()
+
+
+class AsyncPaginator(Paginator):
+    """Asynchronous paginator (use with ``async for``).
+
+    With prefetching, the following pages are fetched in a background task.
+    """
+
+    async def _next_page(self):
+        if not self.has_next:
+            return None
+        self.request.query['next_token'] = self.next_token
+        resp = await self.request.send()
+        self.next_token = resp.meta.get('next_token')
+        self.has_next = self.next_token is not None
+        # also stop when meta has result_count equals to zero
+        if resp.meta.get('result_count') == 0:
+            self.has_next = False
+            return None
+        return resp
+
+    async def __anext__(self):
+        if self.prefetch <= 0:
+            resp = await self._next_page()
+            if resp is None:
+                self._finish()
+                raise StopAsyncIteration()
+            return self._emit(resp)
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.prefetch)
+            self._worker = asyncio.ensure_future(_aprefetch_pages(weakref.ref(self), self._queue))
+            self._finalizer = weakref.finalize(self, _cancel, self._worker)
+        resp = await self._queue.get()
+        if resp is None:
+            self.close()
+            self._finish()
+            raise StopAsyncIteration()
+        if isinstance(resp, BaseException):
+            self.close()
+            raise resp
+        return self._emit(resp)
+
+    def __aiter__(self):
+        self.close()
+        self._restore()
+        return self
+
+    def __next__(self):
+        raise TypeError('\'{}\' object is not an iterator, use \'async for\' instead'.format(type(self).__name__))
+
+    def __iter__(self):
+        raise TypeError('\'{}\' object is not iterable, use \'async for\' instead'.format(type(self).__name__))
+
+    def close(self):
+        """Stop prefetching pages (cancels the background task).
+
+        Returns
+        -------
+        None
+        """
+        if self._finalizer is not None:
+            # cancels the background task
+            self._finalizer()
+        self._queue, self._worker, self._finalizer = None, None, None
+
+    async def batches(self, fields, output='numpy', dtype=None):
+        """Asynchronous iterator of columns of the selected fields, a batch per page (with the same schema).
+
+        Parameters
+        ----------
+        fields: list of str or dict
+            The fields to select (e.g., ``['id', 'author_id', 'created_at', 'public_metrics.*']``) or a dict of
+            fields to types.
+        output: str
+            The type of the columns, one of `list`, `numpy` or `arrow`.
+        dtype: str
+            The data-type declaring the types of fields (defaults to the data-type of the responses).
+
+        Returns
+        -------
+        async generator of dict or pyarrow.RecordBatch
+            The columns by field of each page.
+        """
+        try:
+            async for response in self:
+                yield response.to_columns(fields, output=output, dtype=dtype)
+        finally:
+            self.close()
+
+    @property
+    async def content(self):
+        """Asynchronous iterator of objects."""
+        try:
+            async for response in self:
+                content = response.content
+                if isinstance(content, collections.abc.Mapping):
+                    yield content
+                else:
+                    for item in content:
+                        yield item
+        finally:
+            self.close()
@@ -0,0 +1,266 @@
+"""Records
+
+Compact record types of Twitter objects. Fields are stored in ``__slots__`` (missing fields take no space) and
+nested structures (e.g., ``public_metrics`` or ``entities``) are kept encoded as JSON until they are accessed.
+"""
+import sys
+
+from tweetkit.utils import json
+
+__all__ = [
+    'Record',
+    'Tweet',
+    'User',
+    'Media',
+    'Place',
+    'Poll',
+    'Space',
+    'List',
+    'record_types',
+    'to_record',
+]
+
+
+class _LazyField(object):
+    """Descriptor decoding a nested field (stored as JSON bytes) on first access."""
+
+    __slots__ = ('name', 'slot')
+
+    def __init__(self, name, slot):
+        self.name = name
+        self.slot = slot
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        try:
+            value = self.slot.__get__(obj, objtype)
+        except AttributeError:
+            return None
+        if isinstance(value, bytes):
+            value = json.loads(value)
+            self.slot.__set__(obj, value)
+        return value
+
+    def __set__(self, obj, value):
+        self.slot.__set__(obj, value)
+
+
+class Record(object):
+    """Base class of records.
+
+    Parameters
+    ----------
+    data: dict
+        The object (e.g., a Tweet) returned by the API.
+    """
+
+    __slots__ = ('_extra',)
+
+    _fields = ()
+    _nested = frozenset()
+    _interned = frozenset()
+
+    def __init__(self, data):
+        extra = None
+        for key, value in data.items():
+            if key not in self._fields:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+            elif key in self._nested:
+                if value is not None:
+                    value = json.dumps(value).encode('utf-8')
+                setattr(self, '_' + key, value)
+            else:
+                if key in self._interned and isinstance(value, str):
+                    value = sys.intern(value)
+                setattr(self, key, value)
+        # fields which are not known (e.g., added by a later version of the API)
+        self._extra = None if extra is None else json.dumps(extra).encode('utf-8')
+
+    def __getattr__(self, name):
+        # only called for fields which are not set
+        if name in self._fields:
+            return None
+        raise AttributeError('\'{}\' object has no attribute \'{}\''.format(type(self).__name__, name))
+
+    def _has(self, name):
+        slot = '_' + name if name in self._nested else name
+        try:
+            object.__getattribute__(self, slot)
+        except AttributeError:
+            return False
+        return True
+
+    def get(self, name, default=None):
+        """Gets the value of a field.
+
+        Parameters
+        ----------
+        name: str
+            The name of the field.
+        default: typing.Any
+            The value to return if the field is missing.
+
+        Returns
+        -------
+        value: typing.Any
+            The value of the field.
+        """
+        if name in self._fields:
+            return getattr(self, name) if self._has(name) else default
+        extra = self._get_extra()
+        return extra.get(name, default)
+
+    def _get_extra(self):
+        if self._extra is None:
+            return {}
+        return json.loads(self._extra)
+
+    def to_dict(self):
+        """Gets the record as a dict (in the format returned by the API).
+
+        Returns
+        -------
+        data: dict
+            The record as a dict.
+        """
+        data = {name: getattr(self, name) for name in self._fields if self._has(name)}
+        data.update(self._get_extra())
+        return data
+
+    def __getstate__(self):
+        # only the slots which are set (unset fields are resolved to None by __getattr__)
+        state = {}
+        for slot in self.__slots__ + ('_extra',):
+            try:
+                state[slot] = object.__getattribute__(self, slot)
+            except AttributeError:
+                pass
+        return state
+
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            object.__setattr__(self, slot, value)
+
+    def __eq__(self, other):
+        if not isinstance(other, Record):
+            return NotImplemented
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        key = 'media_key' if 'media_key' in self._fields else 'id'
+        return '{}({}={!r})'.format(type(self).__name__, key, getattr(self, key))
+
+
+def _make_record(name, fields, nested=(), interned=(), doc=None):
+    """Creates a record type with a slot for each field.
+
+    Parameters
+    ----------
+    name: str
+        The name of the record type (the dtype).
+    fields: list of str
+        The names of the fields.
+    nested: list of str
+        The names of fields with nested structures (encoded until accessed).
+    interned: list of str
+        The names of fields with values repeated across objects (e.g., ``lang``) to intern.
+    doc: str
+        The docstring of the record type.
+
+    Returns
+    -------
+    type
+        The record type.
+    """
+    fields = tuple(sys.intern(field) for field in fields)
+    slots = tuple('_' + field if field in nested else field for field in fields)
+    namespace = {
+        '__slots__': slots,
+        '__doc__': doc,
+        '_fields': fields,
+        '_nested': frozenset(nested),
+        '_interned': frozenset(interned),
+    }
+    cls = type(name, (Record,), namespace)
+    for field in nested:
+        # replace the (private) slot by the lazy field
+        setattr(cls, field, _LazyField(field, getattr(cls, '_' + field)))
+    cls.__module__ = __name__
+    return cls
+
+
+Tweet = _make_record('Tweet', [
+    'id', 'text', 'edit_history_tweet_ids', 'attachments', 'author_id', 'context_annotations', 'conversation_id',
+    'created_at', 'edit_controls', 'entities', 'geo', 'in_reply_to_user_id', 'lang', 'non_public_metrics',
+    'organic_metrics', 'possibly_sensitive', 'promoted_metrics', 'public_metrics', 'referenced_tweets',
+    'reply_settings', 'source', 'withheld',
+], nested=[
+    'edit_history_tweet_ids', 'attachments', 'context_annotations', 'edit_controls', 'entities', 'geo',
+    'non_public_metrics', 'organic_metrics', 'promoted_metrics', 'public_metrics', 'referenced_tweets', 'withheld',
+], interned=['lang', 'reply_settings', 'source'], doc='Tweet record.')
+
+User = _make_record('User', [
+    'id', 'name', 'username', 'created_at', 'description', 'entities', 'location', 'pinned_tweet_id',
+    'profile_image_url', 'protected', 'public_metrics', 'url', 'verified', 'verified_type', 'withheld',
+], nested=['entities', 'public_metrics', 'withheld'], interned=['verified_type'], doc='User record.')
+
+Media = _make_record('Media', [
+    'media_key', 'type', 'url', 'duration_ms', 'height', 'non_public_metrics', 'organic_metrics',
+    'preview_image_url', 'promoted_metrics', 'public_metrics', 'width', 'alt_text', 'variants',
+], nested=['non_public_metrics', 'organic_metrics', 'promoted_metrics', 'public_metrics', 'variants'],
+    interned=['type'], doc='Media record.')
+
+Place = _make_record('Place', [
+    'id', 'full_name', 'contained_within', 'country', 'country_code', 'geo', 'name', 'place_type',
+], nested=['contained_within', 'geo'], interned=['country', 'country_code', 'place_type'], doc='Place record.')
+
+Poll = _make_record('Poll', [
+    'id', 'options', 'duration_minutes', 'end_datetime', 'voting_status',
+], nested=['options'], interned=['voting_status'], doc='Poll record.')
+
+Space = _make_record('Space', [
+    'id', 'state', 'created_at', 'ended_at', 'host_ids', 'lang', 'is_ticketed', 'invited_user_ids',
+    'participant_count', 'subscriber_count', 'scheduled_start', 'speaker_ids', 'started_at', 'title', 'topic_ids',
+    'updated_at', 'creator_id',
+], nested=['host_ids', 'invited_user_ids', 'speaker_ids', 'topic_ids'], interned=['state', 'lang'],
+    doc='Space record.')
+
+List = _make_record('List', [
+    'id', 'name', 'created_at', 'description', 'follower_count', 'member_count', 'private', 'owner_id',
+], doc='List record.')
+
+record_types = {
+    'Tweet': Tweet,
+    'User': User,
+    'Media': Media,
+    'Place': Place,
+    'Poll': Poll,
+    'Space': Space,
+    'List': List,
+}
+
+
+def to_record(data, dtype):
+    """Converts objects returned by the API to records.
+
+    Parameters
+    ----------
+    data: dict or list of dict
+        The object(s).
+    dtype: str
+        The type of the object(s) (e.g., Tweet, User, Space or List).
+
+    Returns
+    -------
+    record: Record or list of Record
+        The record(s). Objects of types without a record type are returned as is.
+    """
+    record_type = record_types.get(dtype)
+    if record_type is None:
+        return data
+    if isinstance(data, list):
+        return [record_type(item) for item in data]
+    return record_type(data)
@@ -1,108 +1,27 @@
 """Request"""
-import collections
-import datetime
-import time
+import asyncio
+import functools
 
 import requests
 
 from tweetkit.exceptions import ProblemOrError, TwitterRequestException, TwitterTimeoutException
-from tweetkit.models.paginator import Paginator
-from tweetkit.models.response import TwitterResponse, TwitterStreamResponse
+from tweetkit.models.paginator import AsyncPaginator, Paginator
+from tweetkit.models.response import AsyncRawStreamResponse, AsyncTwitterStreamResponse, RawStreamResponse, \
+    TwitterResponse, TwitterStreamResponse
+from tweetkit.models.scheduler import MemoryStateBackend, TwitterRequestScheduler
+from tweetkit.models.stream import AsyncReconnectingStream, ReconnectingStream
 
 __all__ = [
     'TwitterRequest',
+    'AsyncTwitterRequest',
 ]
 
 
-class TwitterRequestScheduler(object):
-    """TwitterRequestScheduler"""
-
-    def __init__(self):
-        # for more see: https://developer.twitter.com/en/docs/twitter-api/rate-limits
-        # how to calculate: <number of requests> / (<request limit interval in minutes (usually 15)> * 60),
-        self.rate_limit = 1.0
-        self.last_request_time = None
-        self.rate_limit_remaining = None
-        self.rate_limit_reset = None
-
-    @property
-    def min_max_rate_limit(self):
-        """Calculates minimum of maximum rate limit from the rate limit parameter.
-
-        This is required when multiple values are provided.
-
-        Returns
-        -------
-        Minimum of maximum rate limit (i.e., this will result in maximum wait period).
-        """
-        if isinstance(self.rate_limit, collections.Sequence) and not isinstance(self.rate_limit, str):
-            rate_limit = min(self.rate_limit)
-        else:
-            rate_limit = self.rate_limit
-        return rate_limit
-
-    @property
-    def min_wait_period(self):
-        """Calculates minimum wait period in between two requests."""
-        return 1 / self.min_max_rate_limit
-
-    def wait(self):
-        """wait"""
-        # manage rate limiting
-        if self.last_request_time is not None:
-            current_time = datetime.datetime.now()
-            elapsed_time = (current_time - self.last_request_time).total_seconds()
-            if elapsed_time < self.min_wait_period:
-                time.sleep(self.min_wait_period - elapsed_time)
-
-    def update(self, r=None):
-        """update"""
-        # update the latest request time to current time on update
-        self.last_request_time = datetime.datetime.now()
-        if r is None:
-            # nothing else to do
-            return self
-        x_rate_limit_limit = None
-        try:
-            # the rate limit ceiling for that given endpoint
-            x_rate_limit_limit = float(r.headers.get('x-rate-limit-limit'))
-        except TypeError as ex:
-            # keep current rate limit
-            pass
-        finally:
-            if x_rate_limit_limit is not None:
-                self.rate_limit = float(x_rate_limit_limit) / (15 * 60)
-        x_rate_limit_remaining = None
-        try:
-            # the number of requests left for the 15-minute window
-            x_rate_limit_remaining = int(r.headers.get('x-rate-limit-remaining'))
-        except TypeError as ex:
-            # rate limit remaining is unknown
-            pass
-        self.rate_limit_remaining = x_rate_limit_remaining
-        x_rate_limit_reset = None
-        try:
-            # the remaining window before the rate limit resets, in UTC epoch seconds
-            x_rate_limit_reset = int(r.headers.get('x-rate-limit-reset'))
-        except TypeError as ex:
-            pass  # rate limit remaining is unknown
-        self.rate_limit_reset = x_rate_limit_reset
-        return self
-
-    def __repr__(self):
-        return 'TwitterRequestScheduler(rate_limit={:0.2f}, last_request_time=\'{}\', rate_limit_remaining={:d}, rate_limit_reset={:d})'.format(
-            self.rate_limit,
-            self.last_request_time,
-            self.rate_limit_remaining,
-            self.rate_limit_reset,
-        )
-
-
 class TwitterRequest(object):
     """Request."""
 
     def __init__(self, url, method='get', query=None, params=None, data=None, stream=False, auth=None, scheduler=None,
-                 timeout=None, **kwargs):
+                 timeout=None, session=None, **kwargs):
         self.url = url
         self.method = method.upper()
         self.data = data
@@ -116,34 +35,88 @@ class TwitterRequest(object):
         if timeout is None and stream:
             timeout = 30
         self.timeout = timeout
+        # session with the connection pool to reuse (if not provided a new connection is used per request)
+        self.session = session
         self.kwargs = kwargs
         # timer
 
-    def send(self, paginate=False):
-        """send"""
-        if paginate:
-            return Paginator(self)
+    def prepare(self):
+        """Gets the formatted URL and the query parameters of the request.
+
+        Returns
+        -------
+        url: str
+            The request URL.
+        query: dict
+            The query parameters.
+        """
         url = self.url.format(**self.params)
         query = {k: ','.join(v) if isinstance(v, list) else v for k, v in self.query.items()}
-        # wait before request
-        self.scheduler.wait()
-        try:
-            r = requests.request(
-                method=self.method, url=url,
-                params=query, json=self.data,
-                stream=self.stream, auth=self.auth,
-                timeout=self.timeout,
-            )  # type: requests.Response
-        except requests.exceptions.Timeout as ex:
-            raise TwitterTimeoutException() from ex
-        # update after request
-        self.scheduler.update(r)
+        return url, query
+
+    def send(self, paginate=False, prefetch=0, checkpoint=None, checkpoint_key=None, checkpoint_every=1,
+             reconnect=False):
+        """send"""
+        if paginate:
+            return Paginator(self, prefetch=prefetch, checkpoint=checkpoint, checkpoint_key=checkpoint_key,
+                             checkpoint_every=checkpoint_every)
+        if reconnect:
+            return ReconnectingStream(self, **self._get_reconnect_kwargs(reconnect))
+        url, query = self.prepare()
+        if self.session is not None:
+            request = self.session.request
+        else:
+            request = requests.request
+        retries = 0
+        while True:
+            # select credentials and wait before request
+            auth = self.scheduler.wait(self)
+            try:
+                r = request(
+                    method=self.method, url=url,
+                    params=query, json=self.data,
+                    stream=self.stream, auth=auth,
+                    timeout=self.timeout,
+                )  # type: requests.Response
+            except requests.exceptions.Timeout as ex:
+                raise TwitterTimeoutException() from ex
+            # update after request
+            self.scheduler.update(r, self, auth=auth)
+            if not self.scheduler.should_retry(r, retries):
+                break
+            # retry after the rate limit resets
+            r.close()
+            retries += 1
+        return self.process(r)
+
+    def _get_reconnect_kwargs(self, reconnect):
+        if not self.stream:
+            raise ValueError('reconnect is only supported by stream requests')
+        return reconnect if isinstance(reconnect, dict) else {}
+
+    def process(self, r, stream_response=None):
+        """Creates the response object or raises the error of a completed request.
+
+        Parameters
+        ----------
+        r: requests.Response
+            The response of the request.
+        stream_response: typing.Callable
+            The callable creating the stream response (defaults to TwitterStreamResponse).
+
+        Returns
+        -------
+        TwitterResponse or TwitterStreamResponse
+        """
+        if stream_response is None:
+            # raw streams yield the undecoded messages
+            stream_response = RawStreamResponse if self.kwargs.get('raw') else TwitterStreamResponse
         content_type = r.headers.get('content-type')
         if 200 <= r.status_code < 300:
             # The request has succeeded.
             content_types = 'application/json'
             if content_type is None and self.stream:
-                return TwitterStreamResponse(r, **self.kwargs)
+                return stream_response(r, **self.kwargs)
             elif content_type is not None and content_type.startswith(content_types):
                 return TwitterResponse(r, **self.kwargs)
         else:
@@ -155,3 +128,74 @@ class TwitterRequest(object):
             if error is not None:
                 raise error
         raise TwitterRequestException(r)
+
+
+class AsyncTwitterRequest(TwitterRequest):
+    """Asynchronous request.
+
+    The session should be an `AsyncTwitterSession`.
+    """
+
+    def send(self, paginate=False, prefetch=0, checkpoint=None, checkpoint_key=None, checkpoint_every=1,
+             reconnect=False):
+        """send
+
+        Returns
+        -------
+        AsyncPaginator or AsyncReconnectingStream or typing.Awaitable
+            The paginator if paginate is true, the stream if reconnect is true, otherwise an awaitable of the
+            response.
+        """
+        if paginate:
+            return AsyncPaginator(self, prefetch=prefetch, checkpoint=checkpoint, checkpoint_key=checkpoint_key,
+                                  checkpoint_every=checkpoint_every)
+        if reconnect:
+            return AsyncReconnectingStream(self, **self._get_reconnect_kwargs(reconnect))
+        return self._send()
+
+    async def _call_scheduler(self, method, *args, **kwargs):
+        """Calls the scheduler, in a thread unless the state is in memory (e.g., `SQLiteStateBackend` may block on
+        the lock of another process, which would block the event loop)."""
+        if isinstance(self.scheduler.backend, MemoryStateBackend):
+            return method(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(method, *args, **kwargs))
+
+    async def _send(self):
+        url, query = self.prepare()
+        retries = 0
+        while True:
+            # select credentials and wait before request
+            auth, delay = await self._call_scheduler(self.scheduler.reserve, self)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            # authentication is applied by preparing the request with requests
+            prepared = requests.Request(
+                method=self.method, url=url,
+                params=query, json=self.data,
+                auth=auth,
+            ).prepare()
+            try:
+                r = await self.session.send(prepared, stream=self.stream, timeout=self.timeout)
+            except requests.exceptions.Timeout as ex:
+                raise TwitterTimeoutException() from ex
+            # update after request
+            await self._call_scheduler(self.scheduler.update, r, self, auth=auth)
+            if not self.scheduler.should_retry(r, retries):
+                break
+            # retry after the rate limit resets
+            await r.aclose()
+            retries += 1
+        if self.stream and 200 <= r.status_code < 300 and r.headers.get('content-type') is None:
+            return self.process(r, stream_response=self._stream_response)
+        try:
+            r = await self.session.read(r)
+        except requests.exceptions.Timeout as ex:
+            raise TwitterTimeoutException() from ex
+        return self.process(r)
+
+    def _stream_response(self, r, **kwargs):
+        if kwargs.get('raw'):
+            chunk_size = kwargs.get('chunk_size', 2 ** 16)
+            return AsyncRawStreamResponse(self.session.aiter_bytes(r, chunk_size=chunk_size), response=r, **kwargs)
+        return AsyncTwitterStreamResponse(self.session.aiter_lines(r), response=r, **kwargs)
@@ -1,31 +1,111 @@
 """Response"""
 import collections
+import collections.abc
+import re
 
 import requests
 
 from tweetkit.exceptions import TwitterProblem, TwitterTimeoutException
+from tweetkit.models.columnar import to_columns
 from tweetkit.models.expansions import TwitterExpansions
+from tweetkit.models.records import to_record
 from tweetkit.utils import json
+from tweetkit.utils.writer import RotatingFileWriter
 
 __all__ = [
     'TwitterResponse',
     'TwitterStreamResponse',
+    'AsyncTwitterStreamResponse',
+    'RawStreamResponse',
+    'AsyncRawStreamResponse',
 ]
 
 
-class TwitterResponse(object):
-    """TwitterResponse"""
+_meta_pattern = re.compile(rb'"meta"\s*:\s*(\{[^{}]*\})')
+
+# empty lines (heartbeats) of a chunk of complete lines
+_heartbeat_pattern = re.compile(rb'(?:^|\n)(?=\r?\n)')
+
+
+def _scan_meta(raw):
+    """Extracts the meta object from raw JSON content without decoding the rest of it.
+
+    Keys can not occur unescaped in JSON strings, so the last ``"meta":`` is the top-level meta object which the
+    Twitter API places after data and includes.
+
+    Parameters
+    ----------
+    raw: bytes
+        The raw JSON content.
 
-    def __init__(self, content, dtype=None, **kwargs):
+    Returns
+    -------
+    meta: dict or None
+        The meta object or None if not found.
+    """
+    index = raw.rfind(b'"meta"')
+    if index < 0:
+        return None
+    match = _meta_pattern.match(raw, index)
+    if match is None:
+        return None
+    try:
+        return json.loads(match.group(1))
+    except ValueError:
+        return None
+
+
+class TwitterResponse(object):
+    """TwitterResponse
+
+    Parameters
+    ----------
+    content: requests.Response or str or bytes or dict
+        The response or its content.
+    dtype: str
+        The data-type of the response.
+    lazy: bool
+        Whether to defer decoding to the first access (lazy meta). Only the `meta` (e.g., the next token used by
+        the paginator) is extracted without decoding the content, the first access of any other section (`data`,
+        `includes`, `errors` or `content`) decodes the full content.
+    cache: EntityCache
+        The cache of entities shared across responses (e.g., pages of a paginator or messages of a stream) to
+        resolve expansions from. The includes are added to the cache when the content is decoded (when the response
+        is created, or on first access if `lazy`), so that later responses resolve them whether or not this response
+        is expanded.
+    """
+
+    def __init__(self, content, dtype=None, lazy=False, cache=None, **kwargs):
         self._response = None
         if isinstance(content, requests.Response):
             self._response = content
         elif 'response' in kwargs:
             self._response = kwargs['response']
+        self._dtype = dtype
+        self._raw = None
+        self._errors, self._meta, self._includes, self._data = None, None, None, None
+        # index of includes, built on first use
+        self._expansions = None
+        self._cache = cache
+        if lazy and not isinstance(content, collections.abc.Mapping):
+            if isinstance(content, requests.Response):
+                content = content.content
+            elif isinstance(content, str):
+                content = content.encode('utf-8')
+            self._raw = content
+        else:
+            self._load(content)
+
+    def _load(self, content=None):
+        """Decodes the content (the raw content if not provided)."""
+        if content is None:
+            if self._raw is None:
+                return
+            content, self._raw = self._raw, None
         # json.loads handle Response objects, strings, and dict/Mapping
         content = json.loads(content)
         errors = content.get('errors', None)
-        if isinstance(errors, collections.Mapping):
+        if isinstance(errors, collections.abc.Mapping):
             errors = [errors]
         self._errors = errors
         self._meta = content.get('meta', None)
@@ -36,7 +116,13 @@ class TwitterResponse(object):
             # for loading result of endpoint '/2/openapi.json'
             data = content
         self._data = data
-        self._dtype = dtype
+        if self._cache is not None:
+            # add the includes to the cache on decoding so that the following responses resolve them
+            self._index_includes()
+
+    def _index_includes(self):
+        """Builds the index of includes (adding them to the cache if any)."""
+        self._expansions = TwitterExpansions(self._includes, cache=self._cache)
 
     @property
     def data(self):
@@ -47,6 +133,7 @@ class TwitterResponse(object):
         dict
             The data of response.
         """
+        self._load()
         return self._data
 
     @property
@@ -58,8 +145,73 @@ class TwitterResponse(object):
         dict
             The includes of response.
         """
+        self._load()
         return self._includes
 
+    @property
+    def expansions(self):
+        """Gets the index of includes of the response.
+
+        The index is built once (on first access) and reused.
+
+        Returns
+        -------
+        TwitterExpansions
+            The index of includes.
+        """
+        if self._expansions is None:
+            self._load()
+            if self._expansions is None:
+                self._index_includes()
+        return self._expansions
+
+    def expand(self, view=False):
+        """Gets a copy of data with referenced includes expanded in place.
+
+        Parameters
+        ----------
+        view: bool
+            Whether to return read-only views resolving expanded outputs on access instead of copies.
+
+        Returns
+        -------
+        dict or list of dict or ExpandedView or list of ExpandedView
+            The expanded data.
+        """
+        return self.expansions.expand(self.data, dtype=self._dtype, view=view)
+
+    def to_records(self):
+        """Gets data as compact records (e.g., `Tweet`) of the data-type of the response.
+
+        Returns
+        -------
+        Record or list of Record
+            The data as records (or as is if there is no record type for the data-type).
+        """
+        return to_record(self.data, self._dtype)
+
+    def to_columns(self, fields, output='numpy', dtype=None):
+        """Gets data as columns of the selected fields (without creating an object per item).
+
+        Parameters
+        ----------
+        fields: list of str or dict
+            The fields to select (e.g., ``['id', 'author_id', 'created_at', 'public_metrics.*']``) or a dict of
+            fields to types.
+        output: str
+            The type of the columns, one of `list`, `numpy` or `arrow`.
+        dtype: str
+            The data-type declaring the types of fields (defaults to the data-type of the response).
+
+        Returns
+        -------
+        dict or pyarrow.RecordBatch
+            The columns by field.
+        """
+        if dtype is None:
+            dtype = self._dtype
+        return to_columns(self.data, fields, output=output, dtype=dtype)
+
     @property
     def dtype(self):
         """Gets data-type of the response.
@@ -80,6 +232,7 @@ class TwitterResponse(object):
         list of TwitterProblem
             The errors of response.
         """
+        self._load()
         if self._errors is not None:
             return list(map(TwitterProblem, self._errors))
         else:
@@ -94,6 +247,10 @@ class TwitterResponse(object):
         dict
             The errors component of response.
         """
+        if self._raw is not None and self._meta is None:
+            self._meta = _scan_meta(self._raw)
+            if self._meta is None:
+                self._load()
         return self._meta
 
     def get(self, item, default=None):
@@ -109,7 +266,7 @@ class TwitterResponse(object):
         -------
         The data item referred by the provided key.
         """
-        if isinstance(self.data, collections.Sequence) and not isinstance(self.data, str):
+        if isinstance(self.data, collections.abc.Sequence) and not isinstance(self.data, str):
             return list(map(lambda d: d.get(item, default), self.data))
         return self.data.get(item, default)
 
@@ -139,7 +296,8 @@ class TwitterResponse(object):
     @property
     def content(self):
         """Gets list of objects or object dict."""
-        if isinstance(self._data, collections.Mapping):
+        self._load()
+        if isinstance(self._data, collections.abc.Mapping):
             return {
                 'data': self._data,
                 'includes': self._includes,
@@ -148,7 +306,8 @@ class TwitterResponse(object):
                 'dtype': self._dtype,
             }.copy()
         else:
-            expansions = TwitterExpansions(self._includes)
+            expansions = self.expansions
+            expansions.index_references(self._data)
             results = []
             for data in self._data:
                 results.append(
@@ -163,30 +322,88 @@ class TwitterResponse(object):
             return results
 
 
+def _get_created_at(data):
+    data = data.get('data') if isinstance(data, collections.abc.Mapping) else None
+    return data.get('created_at') if isinstance(data, collections.abc.Mapping) else None
+
+
+def _detach(monitor, connection):
+    # connections are only recorded as ended once (e.g., on the end of the stream and on close)
+    if monitor is not None:
+        monitor.disconnected(connection)
+    return None
+
+
 class TwitterStreamResponse(object):
-    """TwitterStreamResponse"""
+    """TwitterStreamResponse
+
+    Parameters
+    ----------
+    iter: requests.Response
+        The streaming response.
+    monitor: StreamMonitor
+        The monitor recording heartbeats, throughput, lag and stalls of the stream.
+    """
 
-    def __init__(self, iter, **kwargs):
+    def __init__(self, iter, monitor=None, **kwargs):
         self._response = None
         if isinstance(iter, requests.Response):
             if iter.encoding is None:
                 iter.encoding = 'utf-8'
             self._response = iter
-            iter = iter.iter_lines(decode_unicode=True)
+            # UTF-8 lines are parsed from bytes without decoding them first
+            decode_unicode = iter.encoding.lower() not in ('utf-8', 'utf8')
+            iter = iter.iter_lines(decode_unicode=decode_unicode)
         self._iter = iter
         self._kwargs = kwargs
+        self._monitor = monitor
+        self._connection = monitor.connected() if monitor is not None else None
 
-    def __next__(self):
+    def next_line(self):
+        """Reads the next message (skipping heartbeats) without decoding it.
+
+        Returns
+        -------
+        line: bytes or str
+            The raw message.
+        """
         line = None
         # handle heartbeats
         while line is None or len(line.strip()) < 1:
+            if line is not None and self._monitor is not None:
+                self._monitor.add_heartbeat(self._connection, len(line))
             try:
                 line = next(self._iter)
             except requests.exceptions.Timeout as ex:
                 raise TwitterTimeoutException(self._response) from ex
+            except StopIteration:
+                self._monitor = _detach(self._monitor, self._connection)
+                raise
+        if self._monitor is not None:
+            self._monitor.add_messages(self._connection, len(line))
+        return line
+
+    def parse(self, line):
+        """Creates the response of a message.
+
+        Parameters
+        ----------
+        line: bytes or str or dict
+            The raw (or decoded) message.
+
+        Returns
+        -------
+        TwitterResponse
+            The response of the message.
+        """
         data = json.loads(line)
+        if self._monitor is not None:
+            self._monitor.add_created_at(_get_created_at(data))
         return TwitterResponse(data, response=self._response, **self._kwargs)
 
+    def __next__(self):
+        return self.parse(self.next_line())
+
     def __iter__(self):
         return self
 
@@ -203,6 +420,7 @@ class TwitterStreamResponse(object):
         -------
         None
         """
+        self._monitor = _detach(self._monitor, self._connection)
         if self._response is not None:
             self._response.close()
             return True
@@ -213,8 +431,277 @@ class TwitterStreamResponse(object):
         """Iterator of objects."""
         for response in self:
             content = response.content
-            if isinstance(content, collections.Mapping):
+            if isinstance(content, collections.abc.Mapping):
                 yield content
             else:
                 for item in content:
                     yield item
+
+
+class AsyncTwitterStreamResponse(object):
+    """Asynchronous TwitterStreamResponse (use with ``async for`` and ``async with``)."""
+
+    def __init__(self, iter, response=None, monitor=None, **kwargs):
+        self._response = response
+        self._iter = iter
+        self._kwargs = kwargs
+        self._monitor = monitor
+        self._connection = monitor.connected() if monitor is not None else None
+
+    async def __anext__(self):
+        line = None
+        # handle heartbeats
+        while line is None or len(line.strip()) < 1:
+            if line is not None and self._monitor is not None:
+                self._monitor.add_heartbeat(self._connection, len(line))
+            try:
+                line = await self._iter.__anext__()
+            except requests.exceptions.Timeout as ex:
+                raise TwitterTimeoutException() from ex
+            except StopAsyncIteration:
+                self._monitor = _detach(self._monitor, self._connection)
+                raise
+        data = json.loads(line)
+        if self._monitor is not None:
+            self._monitor.add_messages(self._connection, len(line))
+            self._monitor.add_created_at(_get_created_at(data))
+        return TwitterResponse(data, response=self._response, **self._kwargs)
+
+    def __aiter__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the object.
+
+        Returns
+        -------
+        None
+        """
+        self._monitor = _detach(self._monitor, self._connection)
+        if self._response is not None:
+            await self._response.aclose()
+            return True
+        return False
+
+    @property
+    async def content(self):
+        """Asynchronous iterator of objects."""
+        async for response in self:
+            content = response.content
+            if isinstance(content, collections.abc.Mapping):
+                yield content
+            else:
+                for item in content:
+                    yield item
+
+
+class _LineChunker(object):
+    """Splits chunks of bytes at the last newline, so that chunks only contain complete lines."""
+
+    def __init__(self):
+        self._remainder = []
+
+    def split(self, chunk):
+        index = chunk.rfind(b'\n')
+        if index < 0:
+            self._remainder.append(chunk)
+            return None
+        if len(self._remainder) > 0:
+            self._remainder.append(chunk[:index + 1])
+            data = b''.join(self._remainder)
+        else:
+            data = chunk[:index + 1]
+        self._remainder = [chunk[index + 1:]] if index + 1 < len(chunk) else []
+        return data
+
+    def flush(self):
+        data, self._remainder = b''.join(self._remainder), []
+        return data if len(data) > 0 else None
+
+
+def _count_lines(chunk):
+    """Counts the messages and the heartbeats of a chunk (including an unterminated last message)."""
+    heartbeats = len(_heartbeat_pattern.findall(chunk))
+    messages = chunk.count(b'\n') - heartbeats
+    if not chunk.endswith(b'\n') and len(chunk[chunk.rfind(b'\n') + 1:].strip()) > 0:
+        messages += 1
+    return messages, heartbeats
+
+
+def _add_chunk(monitor, connection, chunk):
+    messages, heartbeats = _count_lines(chunk)
+    if heartbeats > 0:
+        monitor.add_heartbeat(connection, count=heartbeats)
+    if messages > 0:
+        monitor.add_messages(connection, len(chunk), count=messages)
+
+
+class RawStreamResponse(object):
+    """Stream of raw (undecoded) messages.
+
+    The connection is read with large buffers instead of line by line. Each chunk contains one or more complete
+    newline delimited messages (including heartbeats) exactly as received.
+
+    Parameters
+    ----------
+    iter: requests.Response
+        The streaming response.
+    chunk_size: int
+        The maximum number of bytes to read at a time.
+    monitor: StreamMonitor
+        The monitor recording heartbeats, throughput and stalls of the stream (the lag is not measured as
+        messages are not decoded).
+    """
+
+    def __init__(self, iter, chunk_size=2 ** 16, monitor=None, **kwargs):
+        self._response = None
+        if isinstance(iter, requests.Response):
+            self._response = iter
+            iter = iter.iter_content(chunk_size=chunk_size)
+        self._iter = iter
+        self._chunker = _LineChunker()
+        self._monitor = monitor
+        self._connection = monitor.connected() if monitor is not None else None
+
+    def __next__(self):
+        while True:
+            try:
+                chunk = next(self._iter)
+            except requests.exceptions.Timeout as ex:
+                raise TwitterTimeoutException(self._response) from ex
+            except StopIteration:
+                data = self._chunker.flush()
+                if data is None:
+                    self._monitor = _detach(self._monitor, self._connection)
+                    raise
+                if self._monitor is not None:
+                    _add_chunk(self._monitor, self._connection, data)
+                return data
+            data = self._chunker.split(chunk)
+            if data is not None:
+                if self._monitor is not None:
+                    _add_chunk(self._monitor, self._connection, data)
+                return data
+
+    def __iter__(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Close the object.
+
+        Returns
+        -------
+        None
+        """
+        self._monitor = _detach(self._monitor, self._connection)
+        if self._response is not None:
+            self._response.close()
+            return True
+        return False
+
+    def archive(self, path, **kwargs):
+        """Appends the messages to (optionally compressed and rotated) files until the stream ends.
+
+        Parameters
+        ----------
+        path: str
+            Path to the file (e.g., ``stream.jsonl.gz``).
+        kwargs: typing.Any
+            Other keyword arguments to `RotatingFileWriter` (e.g., `max_bytes` or `max_seconds`).
+
+        Returns
+        -------
+        stats: dict
+            The throughput of the writer.
+        """
+        kwargs.setdefault('append', True)
+        with RotatingFileWriter(path, **kwargs) as writer:
+            for chunk in self:
+                writer.write(chunk, count=_count_lines(chunk)[0])
+        return writer.stats
+
+
+class AsyncRawStreamResponse(object):
+    """Asynchronous stream of raw (undecoded) messages (use with ``async for`` and ``async with``)."""
+
+    def __init__(self, iter, response=None, monitor=None, **kwargs):
+        self._response = response
+        self._iter = iter
+        self._chunker = _LineChunker()
+        self._monitor = monitor
+        self._connection = monitor.connected() if monitor is not None else None
+
+    async def __anext__(self):
+        while True:
+            try:
+                chunk = await self._iter.__anext__()
+            except requests.exceptions.Timeout as ex:
+                raise TwitterTimeoutException() from ex
+            except StopAsyncIteration:
+                data = self._chunker.flush()
+                if data is None:
+                    self._monitor = _detach(self._monitor, self._connection)
+                    raise
+                if self._monitor is not None:
+                    _add_chunk(self._monitor, self._connection, data)
+                return data
+            data = self._chunker.split(chunk)
+            if data is not None:
+                if self._monitor is not None:
+                    _add_chunk(self._monitor, self._connection, data)
+                return data
+
+    def __aiter__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the object.
+
+        Returns
+        -------
+        None
+        """
+        self._monitor = _detach(self._monitor, self._connection)
+        if self._response is not None:
+            await self._response.aclose()
+            return True
+        return False
+
+    async def archive(self, path, **kwargs):
+        """Appends the messages to (optionally compressed and rotated) files until the stream ends.
+
+        Parameters
+        ----------
+        path: str
+            Path to the file (e.g., ``stream.jsonl.gz``).
+        kwargs: typing.Any
+            Other keyword arguments to `RotatingFileWriter` (e.g., `max_bytes` or `max_seconds`).
+
+        Returns
+        -------
+        stats: dict
+            The throughput of the writer.
+        """
+        kwargs.setdefault('append', True)
+        with RotatingFileWriter(path, **kwargs) as writer:
+            async for chunk in self:
+                writer.write(chunk, count=_count_lines(chunk)[0])
+        return writer.stats
@@ -0,0 +1,510 @@
+"""Scheduler"""
+import collections.abc
+import contextlib
+import sqlite3
+import threading
+import time
+import urllib.parse
+
+from tweetkit.utils import json
+
+__all__ = [
+    'TwitterRateLimit',
+    'TwitterRequestScheduler',
+    'MemoryStateBackend',
+    'SQLiteStateBackend',
+]
+
+
+class TwitterRateLimit(object):
+    """Rate limit state of a single endpoint.
+
+    Parameters
+    ----------
+    window: float
+        The length of the rate limit window in seconds (15 minutes for the Twitter API).
+    """
+
+    def __init__(self, window=15 * 60):
+        # for more see: https://developer.twitter.com/en/docs/twitter-api/rate-limits
+        # how to calculate: <number of requests> / (<request limit interval in minutes (usually 15)> * 60),
+        self.rate_limit = 1.0
+        self.window = window
+        # the rate limit ceiling (number of requests per window)
+        self.limit = None
+        # time of the latest request (or the latest reserved request slot) in UTC epoch seconds
+        self.last_request_time = None
+        self.rate_limit_remaining = None
+        self.rate_limit_reset = None
+
+    @property
+    def min_max_rate_limit(self):
+        """Calculates minimum of maximum rate limit from the rate limit parameter.
+
+        This is required when multiple values are provided.
+
+        Returns
+        -------
+        Minimum of maximum rate limit (i.e., this will result in maximum wait period).
+        """
+        if isinstance(self.rate_limit, collections.abc.Sequence) and not isinstance(self.rate_limit, str):
+            rate_limit = min(self.rate_limit)
+        else:
+            rate_limit = self.rate_limit
+        return rate_limit
+
+    @property
+    def min_wait_period(self):
+        """Calculates minimum wait period in between two requests."""
+        return 1 / self.min_max_rate_limit
+
+    def acquire(self, mode='interval', margin=1.0):
+        """Reserves a request slot and gets the time to wait (in seconds) before making the request.
+
+        Parameters
+        ----------
+        mode: str
+            The scheduling mode. Either `interval` to keep a minimum period of ``1 / rate_limit`` in between
+            requests or `reset` to make requests without waiting while ``x-rate-limit-remaining`` is positive.
+            In both modes, requests wait until ``x-rate-limit-reset`` once the window is exhausted.
+        margin: float
+            The time (in seconds) to wait after the reset time to allow for clock differences.
+
+        Returns
+        -------
+        delay: float
+            The time to wait in seconds.
+        """
+        current_time = time.time()
+        start_time = current_time
+        if mode == 'interval' and self.last_request_time is not None:
+            start_time = max(start_time, self.last_request_time + self.min_wait_period)
+        elif self.last_request_time is not None:
+            # slots already reserved in the next window come first
+            start_time = max(start_time, self.last_request_time)
+        if self.rate_limit_reset is not None and start_time >= self.rate_limit_reset + margin:
+            # a new window has started
+            self.rate_limit_remaining = self.limit
+            self.rate_limit_reset = None
+        elif self.rate_limit_remaining is not None and self.rate_limit_remaining <= 0 \
+                and self.rate_limit_reset is not None:
+            # the window is exhausted, wait for the next window
+            start_time = self.rate_limit_reset + margin
+            self.rate_limit_remaining = self.limit
+            self.rate_limit_reset = self.rate_limit_reset + self.window if self.limit is not None else None
+        if self.rate_limit_remaining is not None:
+            self.rate_limit_remaining -= 1
+        self.last_request_time = start_time
+        return start_time - current_time
+
+    def update(self, r=None):
+        """update"""
+        # update the latest request time to current time on update
+        self.last_request_time = max(self.last_request_time or 0, time.time())
+        if r is None:
+            # nothing else to do
+            return self
+        x_rate_limit_limit = None
+        try:
+            # the rate limit ceiling for that given endpoint
+            x_rate_limit_limit = float(r.headers.get('x-rate-limit-limit'))
+        except TypeError as ex:
+            # keep current rate limit
+            pass
+        finally:
+            if x_rate_limit_limit is not None:
+                self.limit = int(x_rate_limit_limit)
+                self.rate_limit = float(x_rate_limit_limit) / self.window
+        x_rate_limit_remaining = None
+        try:
+            # the number of requests left for the 15-minute window
+            x_rate_limit_remaining = int(r.headers.get('x-rate-limit-remaining'))
+        except TypeError as ex:
+            # rate limit remaining is unknown
+            pass
+        self.rate_limit_remaining = x_rate_limit_remaining
+        x_rate_limit_reset = None
+        try:
+            # the remaining window before the rate limit resets, in UTC epoch seconds
+            x_rate_limit_reset = int(r.headers.get('x-rate-limit-reset'))
+        except TypeError as ex:
+            pass  # rate limit remaining is unknown
+        self.rate_limit_reset = x_rate_limit_reset
+        if r.status_code == 429:
+            # too many requests, wait until the reset time (or the retry after period) before the next request
+            self.rate_limit_remaining = 0
+            if self.rate_limit_reset is None:
+                try:
+                    retry_after = int(r.headers.get('retry-after'))
+                except (TypeError, ValueError) as ex:
+                    retry_after = 60
+                self.rate_limit_reset = int(time.time()) + retry_after
+        return self
+
+    def to_dict(self):
+        """Gets the state of the rate limit as a dict.
+
+        Returns
+        -------
+        state: dict
+            The state of the rate limit.
+        """
+        return {
+            'rate_limit': self.rate_limit,
+            'window': self.window,
+            'limit': self.limit,
+            'last_request_time': self.last_request_time,
+            'rate_limit_remaining': self.rate_limit_remaining,
+            'rate_limit_reset': self.rate_limit_reset,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """Creates a rate limit from its state.
+
+        Parameters
+        ----------
+        state: dict
+            The state of the rate limit (see `to_dict`).
+
+        Returns
+        -------
+        rate_limit: TwitterRateLimit
+            The rate limit.
+        """
+        self = cls(window=state.get('window', 15 * 60))
+        self.rate_limit = state.get('rate_limit', self.rate_limit)
+        self.limit = state.get('limit')
+        self.last_request_time = state.get('last_request_time')
+        self.rate_limit_remaining = state.get('rate_limit_remaining')
+        self.rate_limit_reset = state.get('rate_limit_reset')
+        return self
+
+    def __repr__(self):
+        return 'TwitterRateLimit(rate_limit={:0.2f}, last_request_time={}, rate_limit_remaining={}, ' \
+               'rate_limit_reset={})'.format(
+            self.rate_limit,
+            self.last_request_time,
+            self.rate_limit_remaining,
+            self.rate_limit_reset,
+        )
+
+
+class MemoryStateBackend(object):
+    """In-process scheduler state backend (default).
+
+    State backends provide a Redis-style interface: ``get(name)``, ``set(name, value)`` and ``lock(name)``
+    (a context manager that makes the enclosed ``get`` and ``set`` atomic). A `redis.Redis` client satisfies
+    this interface and can be used to share rate limits across hosts.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.RLock()
+
+    def get(self, name):
+        """Gets the value of the name (None if not set)."""
+        return self._data.get(name)
+
+    def set(self, name, value):
+        """Sets the value of the name."""
+        self._data[name] = value
+
+    def lock(self, name):
+        """Gets a lock for the name."""
+        return self._lock
+
+    def __repr__(self):
+        return 'MemoryStateBackend()'
+
+
+class SQLiteStateBackend(object):
+    """SQLite scheduler state backend.
+
+    Shares scheduler state (i.e., per-endpoint rate limits) among all processes on a host that use the same
+    database file. Locking relies on SQLite write transactions so that the state is updated atomically.
+
+    Parameters
+    ----------
+    path: str
+        Path to the database file.
+    timeout: float
+        The time (in seconds) to wait for the lock of the database.
+    """
+
+    def __init__(self, path, timeout=60.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS state (name TEXT PRIMARY KEY, value TEXT)')
+
+    def _connect(self):
+        # connections can not be shared among threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def get(self, name):
+        """Gets the value of the name (None if not set)."""
+        row = self._connect().execute('SELECT value FROM state WHERE name = ?', (name,)).fetchone()
+        if row is None:
+            return None
+        return row[0]
+
+    def set(self, name, value):
+        """Sets the value of the name."""
+        self._connect().execute('INSERT OR REPLACE INTO state (name, value) VALUES (?, ?)', (name, value))
+
+    @contextlib.contextmanager
+    def lock(self, name):
+        """Gets a lock for the name (locks the database for writing, reentrant within a thread)."""
+        conn = self._connect()
+        depth = getattr(self._local, 'depth', 0)
+        if depth > 0:
+            # nested in a transaction of the thread
+            self._local.depth = depth + 1
+            try:
+                yield conn
+            finally:
+                self._local.depth = depth
+            return
+        conn.execute('BEGIN IMMEDIATE')
+        self._local.depth = 1
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        else:
+            conn.execute('COMMIT')
+        finally:
+            self._local.depth = 0
+
+    def __repr__(self):
+        return 'SQLiteStateBackend(path=\'{}\')'.format(self.path)
+
+
+class TwitterRequestScheduler(object):
+    """TwitterRequestScheduler
+
+    Keeps a separate rate limit (bucket) per auth identity, HTTP method and URL template (e.g.,
+    ``('<identity>', 'GET', '/2/users/{id}/followers')``), seeded from the ``x-rate-limit-*`` response headers, so
+    that independent endpoints are scheduled at their own quotas.
+
+    The scheduler is safe to share across threads. Request slots are reserved under a lock in the order that
+    requests arrive, so waiting threads are served fairly (first come, first served) without exceeding the limits.
+    The state is kept in a pluggable backend; use a shared backend (e.g., `SQLiteStateBackend`) to coordinate
+    rate limits among processes using the same credentials.
+
+    Parameters
+    ----------
+    mode: str
+        The scheduling mode. Use `interval` (default) to keep a minimum period of ``1 / rate_limit`` in between
+        requests, or `reset` to make requests without waiting while the quota lasts and to wait exactly until
+        ``x-rate-limit-reset`` once it is exhausted.
+    max_retries: int
+        The number of times a request is retried after a `429 Too Many Requests` response (waiting until the
+        rate limit resets before each retry).
+    margin: float
+        The time (in seconds) to wait after the reset time to allow for clock differences.
+    backend: MemoryStateBackend or SQLiteStateBackend
+        The backend to keep the state of rate limits (defaults to an in-process `MemoryStateBackend`).
+    """
+
+    def __init__(self, mode='interval', max_retries=0, margin=1.0, backend=None):
+        if mode not in ('interval', 'reset'):
+            raise ValueError('expected mode to be one of \'interval\' or \'reset\', found \'{}\''.format(mode))
+        self.mode = mode
+        self.max_retries = max_retries
+        self.margin = margin
+        if backend is None:
+            backend = MemoryStateBackend()
+        self.backend = backend
+
+    @staticmethod
+    def key(request=None, auth=None):
+        """Gets the rate limit key of a request.
+
+        Parameters
+        ----------
+        request: TwitterRequest
+            The request.
+        auth: TokenAuth
+            The credentials used to make the request (defaults to the auth of the request).
+
+        Returns
+        -------
+        key: tuple or None
+            Tuple of auth identity, HTTP method and URL template of the request (None if request is None).
+        """
+        if request is None:
+            return None
+        if auth is None:
+            auth = request.auth
+        identity = getattr(auth, 'identity', None)
+        if identity is None and auth is not None:
+            identity = id(auth)
+        path = urllib.parse.urlsplit(request.url).path
+        return identity, request.method.upper(), path
+
+    @classmethod
+    def name(cls, request=None, auth=None):
+        """Gets the name of the rate limit state of a request in the backend."""
+        key = cls.key(request, auth=auth)
+        if key is None:
+            return 'tweetkit:rate_limit'
+        return 'tweetkit:rate_limit:{}:{}:{}'.format(*key)
+
+    def _load(self, name):
+        state = self.backend.get(name)
+        if state is None:
+            return TwitterRateLimit()
+        return TwitterRateLimit.from_dict(json.loads(state))
+
+    def _store(self, name, rate_limit):
+        self.backend.set(name, json.dumps(rate_limit.to_dict()))
+
+    def get_rate_limit(self, request=None, auth=None):
+        """Gets (a snapshot of) the rate limit of the endpoint of the request.
+
+        Parameters
+        ----------
+        request: TwitterRequest
+            The request.
+        auth: TokenAuth
+            The credentials used to make the request (defaults to the auth of the request).
+
+        Returns
+        -------
+        rate_limit: TwitterRateLimit
+            The rate limit of the endpoint.
+        """
+        return self._load(self.name(request, auth=auth))
+
+    def select(self, request=None):
+        """Selects the credentials to make the request with.
+
+        If the auth of the request is a `CredentialPoolAuth`, the credentials that can make the request the
+        soonest (with the most remaining quota of the endpoint among those) are selected, so exhausted credentials
+        are not used until their rate limit resets. Ties (e.g., before the rate limits are known) are broken by
+        selecting the least recently used credentials. Selecting does not reserve a slot, use `reserve` to select
+        and reserve atomically.
+
+        Parameters
+        ----------
+        request: TwitterRequest
+            The request.
+
+        Returns
+        -------
+        auth: TokenAuth
+            The credentials to make the request with.
+        """
+        if request is None:
+            return None
+        credentials = getattr(request.auth, 'credentials', None)
+        if credentials is None:
+            return request.auth
+        selected, selected_score = None, None
+        for auth in credentials:
+            # peek the rate limit without reserving a slot
+            rate_limit = self.get_rate_limit(request, auth=auth)
+            remaining, last_request_time = rate_limit.rate_limit_remaining, rate_limit.last_request_time
+            delay = rate_limit.acquire(mode=self.mode, margin=self.margin)
+            score = (max(delay, 0.0), -remaining if remaining is not None else -float('inf'),
+                     last_request_time if last_request_time is not None else -float('inf'))
+            if selected_score is None or score < selected_score:
+                selected, selected_score = auth, score
+        return selected
+
+    def reserve(self, request=None):
+        """Selects the credentials and reserves a slot for the request with them.
+
+        The credentials of a `CredentialPoolAuth` are selected and reserved under the lock of the pool, so that
+        concurrent requests are spread across the credentials.
+
+        Parameters
+        ----------
+        request: TwitterRequest
+            The request.
+
+        Returns
+        -------
+        auth: TokenAuth
+            The credentials to make the request with.
+        delay: float
+            The time to wait (in seconds) before the request can be made.
+        """
+        if request is None or getattr(request.auth, 'credentials', None) is None:
+            return None if request is None else request.auth, self.acquire(request)
+        with self.backend.lock('{}:lock'.format(self.name(request))):
+            auth = self.select(request)
+            return auth, self.acquire(request, auth=auth)
+
+    def acquire(self, request=None, auth=None):
+        """Reserves a slot for the request and gets the time to wait (in seconds) before the request can be made."""
+        name = self.name(request, auth=auth)
+        with self.backend.lock('{}:lock'.format(name)):
+            rate_limit = self._load(name)
+            delay = rate_limit.acquire(mode=self.mode, margin=self.margin)
+            self._store(name, rate_limit)
+        return delay
+
+    def wait(self, request=None, auth=None):
+        """Reserves a slot for the request and waits until the request can be made.
+
+        Parameters
+        ----------
+        request: TwitterRequest
+            The request.
+        auth: TokenAuth
+            The credentials to make the request with (selected by `reserve` if not provided).
+
+        Returns
+        -------
+        auth: TokenAuth
+            The credentials to make the request with.
+        """
+        if auth is None:
+            auth, delay = self.reserve(request)
+        else:
+            delay = self.acquire(request, auth=auth)
+        if delay > 0:
+            time.sleep(delay)
+        return auth
+
+    def update(self, r=None, request=None, auth=None):
+        """update"""
+        name = self.name(request, auth=auth)
+        with self.backend.lock('{}:lock'.format(name)):
+            rate_limit = self._load(name)
+            rate_limit.update(r)
+            self._store(name, rate_limit)
+        return self
+
+    def should_retry(self, r, retries):
+        """Checks whether to retry a request after the response.
+
+        Parameters
+        ----------
+        r: requests.Response
+            The response.
+        retries: int
+            The number of times the request has been retried.
+
+        Returns
+        -------
+        bool
+            Whether to retry the request.
+        """
+        return r.status_code == 429 and retries < self.max_retries
+
+    def __repr__(self):
+        return 'TwitterRequestScheduler(mode=\'{}\', max_retries={:d}, backend={})'.format(
+            self.mode,
+            self.max_retries,
+            self.backend,
+        )
@@ -0,0 +1,528 @@
+"""Search"""
+import collections.abc
+import concurrent.futures
+import datetime
+import queue
+import threading
+import time
+
+from tweetkit.models.request import TwitterRequest
+
+__all__ = [
+    'SearchPlan',
+    'SearchPlanner',
+    'SlicedSearch',
+    'split_time_range',
+    'split_time_range_by_counts',
+]
+
+_time_formats = [
+    '%Y-%m-%dT%H:%M:%SZ',
+    '%Y-%m-%dT%H:%M:%S.%fZ',
+]
+
+
+def parse_time(value):
+    """Parses a timestamp of the Twitter API (e.g., ``2022-09-30T00:00:01Z``).
+
+    Parameters
+    ----------
+    value: str or datetime.datetime
+        The timestamp.
+
+    Returns
+    -------
+    time: datetime.datetime
+        The parsed timestamp (timezone naive, in UTC).
+    """
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return value
+    for time_format in _time_formats:
+        try:
+            return datetime.datetime.strptime(value, time_format)
+        except ValueError:
+            pass
+    raise ValueError('time data \'{}\' does not match format \'YYYY-MM-DDTHH:mm:ssZ\''.format(value))
+
+
+def format_time(value):
+    """Formats a timestamp for the Twitter API (``YYYY-MM-DDTHH:mm:ssZ``).
+
+    Parameters
+    ----------
+    value: datetime.datetime
+        The timestamp (in UTC).
+
+    Returns
+    -------
+    time: str
+        The formatted timestamp.
+    """
+    return parse_time(value).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def get_counts(counts, query, start_time, end_time, granularity='day'):
+    """Gets the tweet counts of a query.
+
+    Parameters
+    ----------
+    counts: typing.Callable
+        The counts endpoint method (e.g., `client.tweets.tweet_counts_full_archive_search`).
+    query: str
+        The search query.
+    start_time: str or datetime.datetime
+        The oldest timestamp (inclusive).
+    end_time: str or datetime.datetime
+        The newest timestamp (exclusive).
+    granularity: str
+        The granularity of counts (`minute`, `hour` or `day`).
+
+    Returns
+    -------
+    counts: list of dict
+        The counts (with `start`, `end` and `tweet_count`).
+    """
+    results = []
+    paginator = counts(query, start_time=format_time(start_time), end_time=format_time(end_time),
+                       granularity=granularity, paginate=True)
+    for response in paginator:
+        if isinstance(response.data, collections.abc.Sequence):
+            results.extend(response.data)
+    return results
+
+
+def split_time_range(start_time, end_time, num_slices):
+    """Splits ``[start_time, end_time)`` into slices of equal duration.
+
+    Parameters
+    ----------
+    start_time: str or datetime.datetime
+        The oldest timestamp (inclusive).
+    end_time: str or datetime.datetime
+        The newest timestamp (exclusive).
+    num_slices: int
+        The number of slices.
+
+    Returns
+    -------
+    slices: list of tuple
+        The ``(start_time, end_time)`` of each slice in chronological order.
+    """
+    start_time, end_time = parse_time(start_time), parse_time(end_time)
+    if end_time <= start_time:
+        raise ValueError('expected end_time to be after start_time')
+    # timestamps are in second granularity
+    total_seconds = int((end_time - start_time).total_seconds())
+    num_slices = max(min(num_slices, total_seconds), 1)
+    boundaries = [start_time + datetime.timedelta(seconds=total_seconds * i // num_slices)
+                  for i in range(num_slices)] + [end_time]
+    return [(format_time(start), format_time(end)) for start, end in zip(boundaries, boundaries[1:])]
+
+
+def split_time_range_by_counts(counts, num_slices, start_time=None, end_time=None):
+    """Splits a time range into slices with similar tweet volumes.
+
+    Parameters
+    ----------
+    counts: list of dict
+        The counts (with `start`, `end` and `tweet_count`) in chronological order, as returned by the counts
+        endpoints (e.g., `tweet_counts_full_archive_search`).
+    num_slices: int
+        The number of slices.
+    start_time: str or datetime.datetime
+        The oldest timestamp (inclusive), defaults to the start of the first count.
+    end_time: str or datetime.datetime
+        The newest timestamp (exclusive), defaults to the end of the last count.
+
+    Returns
+    -------
+    slices: list of tuple
+        The ``(start_time, end_time)`` of each slice in chronological order.
+    """
+    counts = sorted(counts, key=lambda c: parse_time(c['start']))
+    if len(counts) == 0:
+        return split_time_range(start_time, end_time, num_slices)
+    if start_time is None:
+        start_time = counts[0]['start']
+    if end_time is None:
+        end_time = counts[-1]['end']
+    start_time, end_time = parse_time(start_time), parse_time(end_time)
+    total = sum(c['tweet_count'] for c in counts)
+    if total == 0:
+        return split_time_range(start_time, end_time, num_slices)
+    # close a slice at the end of a count bucket once it holds its share of the total volume
+    target = total / max(num_slices, 1)
+    boundaries, volume = [start_time], 0
+    for count in counts[:-1]:
+        volume += count['tweet_count']
+        boundary = parse_time(count['end'])
+        if volume >= target * len(boundaries) and start_time < boundary < end_time:
+            boundaries.append(boundary)
+    boundaries.append(end_time)
+    return [(format_time(start), format_time(end)) for start, end in zip(boundaries, boundaries[1:])]
+
+
+class SlicedSearch(object):
+    """Parallel time-sliced search.
+
+    Splits ``[start_time, end_time)`` into slices and paginates the slices concurrently (requests are still
+    scheduled by the rate limit scheduler of the client), then merges the pages into a single iterator.
+
+    Parameters
+    ----------
+    search: typing.Callable
+        The search endpoint method (e.g., `client.tweets.tweets_fullarchive_search`).
+    query: str
+        The search query.
+    start_time: str or datetime.datetime
+        The oldest timestamp (inclusive).
+    end_time: str or datetime.datetime
+        The newest timestamp (exclusive).
+    slices: list of tuple or int
+        The ``(start_time, end_time)`` of each slice or the number of slices of equal duration.
+    counts: typing.Callable
+        The counts endpoint method (e.g., `client.tweets.tweet_counts_full_archive_search`). If provided, the
+        slices are sized such that each slice holds a similar tweet volume.
+    granularity: str
+        The granularity of counts used to size the slices (`minute`, `hour` or `day`).
+    max_workers: int
+        The number of slices to paginate concurrently.
+    ordered: bool
+        Whether to yield pages in `created_at` order (newest first, as the search endpoints do) or as they
+        complete.
+    buffer_size: int
+        The maximum number of pages to buffer per slice (or in total if not ordered).
+    kwargs: typing.Any
+        Other keyword arguments to the search endpoint method (e.g., `max_results`).
+
+    Examples
+    --------
+    >>> search = SlicedSearch(client.tweets.tweets_fullarchive_search, '#HurricaneIan',
+    ...                       start_time='2022-09-01T00:00:00Z', end_time='2022-11-01T00:00:00Z', slices=8,
+    ...                       counts=client.tweets.tweet_counts_full_archive_search, max_results=500)
+    >>> for tweet in search.content:
+    ...     pass
+    """
+
+    def __init__(self, search, query, start_time, end_time, slices=4, counts=None, granularity='day',
+                 max_workers=4, ordered=True, buffer_size=2, **kwargs):
+        self.search = search
+        self.query = query
+        self.start_time = format_time(start_time)
+        self.end_time = format_time(end_time)
+        if isinstance(slices, int):
+            if counts is not None:
+                slices = split_time_range_by_counts(
+                    get_counts(counts, self.query, self.start_time, self.end_time, granularity=granularity), slices,
+                    start_time=self.start_time, end_time=self.end_time,
+                )
+            else:
+                slices = split_time_range(self.start_time, self.end_time, slices)
+        self.slices = [(format_time(start), format_time(end)) for start, end in slices]
+        self.max_workers = max_workers
+        self.ordered = ordered
+        self.buffer_size = buffer_size
+        self.kwargs = kwargs
+        self.errors = []
+
+    def _paginate(self, index, start_time, end_time, put, stop):
+        paginator = None
+        try:
+            if stop.is_set():
+                return
+            paginator = self.search(self.query, start_time=start_time, end_time=end_time, paginate=True,
+                                    **self.kwargs)
+            pages = iter(paginator)
+            # check for a stop before each request (pages are requested by the iteration)
+            while not stop.is_set():
+                response = next(pages, None)
+                if response is None:
+                    put(index, None)
+                    return
+                if not put(index, response):
+                    return
+        except BaseException as ex:
+            put(index, ex)
+        finally:
+            if paginator is not None:
+                paginator.close()
+
+    def __iter__(self):
+        stop = threading.Event()
+        # slices are paginated newest first, which is the order of results within a slice
+        slices = list(reversed(self.slices))
+        if self.ordered:
+            queues = [queue.Queue(maxsize=self.buffer_size) for _ in slices]
+        else:
+            queues = [queue.Queue(maxsize=self.buffer_size)] * len(slices)
+
+        def put(index, item):
+            while not stop.is_set():
+                try:
+                    queues[index].put((index, item), timeout=0.1)
+                except queue.Full:
+                    continue
+                return True
+            return False
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+        futures = []
+        try:
+            for index, (start_time, end_time) in enumerate(slices):
+                futures.append(executor.submit(self._paginate, index, start_time, end_time, put, stop))
+            if self.ordered:
+                for q in queues:
+                    while True:
+                        _, item = q.get()
+                        if item is None:
+                            break
+                        if isinstance(item, BaseException):
+                            raise item
+                        yield item
+            else:
+                remaining = len(slices)
+                while remaining > 0:
+                    _, item = queues[0].get()
+                    if item is None:
+                        remaining -= 1
+                    elif isinstance(item, BaseException):
+                        raise item
+                    else:
+                        yield item
+        finally:
+            # slices which have not started are cancelled, running slices send no further requests
+            stop.set()
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    @property
+    def content(self):
+        """Iterator of objects."""
+        for response in self:
+            content = response.content
+            if isinstance(content, collections.abc.Mapping):
+                yield content
+            else:
+                for item in content:
+                    yield item
+
+    def __repr__(self):
+        return 'SlicedSearch(query=\'{}\', start_time=\'{}\', end_time=\'{}\', slices={:d})'.format(
+            self.query,
+            self.start_time,
+            self.end_time,
+            len(self.slices),
+        )
+
+
+class SearchPlan(object):
+    """Execution plan of a search.
+
+    Parameters
+    ----------
+    search: typing.Callable
+        The search endpoint method.
+    query: str
+        The search query.
+    start_time: str
+        The oldest timestamp (inclusive).
+    end_time: str
+        The newest timestamp (exclusive).
+    slices: list of dict
+        The slices with `start_time`, `end_time`, `tweet_count` and `requests` (expected number of pages).
+    max_results: int
+        The maximum number of results per page.
+    duration: float
+        The expected wall-clock time (in seconds) given the current rate limit state.
+    kwargs: typing.Any
+        Other keyword arguments to the search endpoint method.
+    """
+
+    def __init__(self, search, query, start_time, end_time, slices, max_results, duration=None, **kwargs):
+        self.search = search
+        self.query = query
+        self.start_time = start_time
+        self.end_time = end_time
+        self.slices = slices
+        self.max_results = max_results
+        self.duration = duration
+        self.kwargs = kwargs
+
+    @property
+    def tweet_count(self):
+        """Gets the expected number of tweets."""
+        return sum(s['tweet_count'] for s in self.slices)
+
+    @property
+    def requests(self):
+        """Gets the expected number of search requests."""
+        return sum(s['requests'] for s in self.slices)
+
+    def execute(self, max_workers=4, ordered=True, buffer_size=2):
+        """Executes the plan.
+
+        Parameters
+        ----------
+        max_workers: int
+            The number of slices to paginate concurrently.
+        ordered: bool
+            Whether to yield pages in `created_at` order or as they complete.
+        buffer_size: int
+            The maximum number of pages to buffer per slice.
+
+        Returns
+        -------
+        search: SlicedSearch
+            The search iterating over the pages of all slices.
+        """
+        slices = [(s['start_time'], s['end_time']) for s in self.slices]
+        return SlicedSearch(self.search, self.query, self.start_time, self.end_time, slices=slices,
+                            max_workers=max_workers, ordered=ordered, buffer_size=buffer_size,
+                            max_results=self.max_results, **self.kwargs)
+
+    def __repr__(self):
+        duration = 'None' if self.duration is None else '{:0.1f}'.format(self.duration)
+        return 'SearchPlan(query=\'{}\', slices={:d}, tweet_count={:d}, requests={:d}, duration={})'.format(
+            self.query,
+            len(self.slices),
+            self.tweet_count,
+            self.requests,
+            duration,
+        )
+
+
+class SearchPlanner(object):
+    """Count-driven search planner.
+
+    Uses the counts endpoints to estimate the number of tweets, pages and requests of a search before running it.
+
+    Parameters
+    ----------
+    client: TwitterClient
+        The client.
+    endpoint: str
+        The search endpoint, `all` (full-archive search) or `recent` (recent search).
+    """
+
+    endpoints = {
+        'all': {
+            'url': '/2/tweets/search/all',
+            'search': 'tweets_fullarchive_search',
+            'counts': 'tweet_counts_full_archive_search',
+            # default number of requests per 15-minute window (app auth)
+            'limit': 300,
+            'max_results': 500,
+        },
+        'recent': {
+            'url': '/2/tweets/search/recent',
+            'search': 'tweets_recent_search',
+            'counts': 'tweet_counts_recent_search',
+            'limit': 450,
+            'max_results': 100,
+        },
+    }
+
+    def __init__(self, client, endpoint='all'):
+        if endpoint not in self.endpoints:
+            raise ValueError('expected endpoint to be one of \'all\' or \'recent\', found \'{}\''.format(endpoint))
+        self.client = client
+        self.endpoint = endpoint
+
+    def plan(self, query, start_time, end_time, slices=4, max_results=None, granularity='day', **kwargs):
+        """Creates an execution plan of a search.
+
+        Parameters
+        ----------
+        query: str
+            The search query.
+        start_time: str or datetime.datetime
+            The oldest timestamp (inclusive).
+        end_time: str or datetime.datetime
+            The newest timestamp (exclusive).
+        slices: int
+            The number of slices (sized to hold similar tweet volumes).
+        max_results: int
+            The maximum number of results per page (defaults to the maximum allowed by the endpoint).
+        granularity: str
+            The granularity of counts (`minute`, `hour` or `day`).
+        kwargs: typing.Any
+            Other keyword arguments to the search endpoint method.
+
+        Returns
+        -------
+        plan: SearchPlan
+            The execution plan.
+        """
+        endpoint = self.endpoints[self.endpoint]
+        search = getattr(self.client.tweets, endpoint['search'])
+        counts_method = getattr(self.client.tweets, endpoint['counts'])
+        if max_results is None:
+            max_results = endpoint['max_results']
+        start_time, end_time = format_time(start_time), format_time(end_time)
+        counts = get_counts(counts_method, query, start_time, end_time, granularity=granularity)
+        boundaries = split_time_range_by_counts(counts, slices, start_time=start_time, end_time=end_time)
+        plan_slices = []
+        for slice_start, slice_end in boundaries:
+            lower, upper = parse_time(slice_start), parse_time(slice_end)
+            tweet_count = sum(c['tweet_count'] for c in counts if lower <= parse_time(c['start']) < upper)
+            plan_slices.append({
+                'start_time': slice_start,
+                'end_time': slice_end,
+                'tweet_count': tweet_count,
+                # at least one request is made per slice
+                'requests': max(-(-tweet_count // max_results), 1),
+            })
+        plan = SearchPlan(search, query, start_time, end_time, plan_slices, max_results, **kwargs)
+        plan.duration = self.estimate_duration(plan.requests)
+        return plan
+
+    def estimate_duration(self, requests):
+        """Estimates the wall-clock time (in seconds) to make a number of search requests.
+
+        The estimate is based on the current rate limit state of the endpoint in the scheduler of the client
+        (excluding network latency). The quota left in the current windows is used first; credentials without a
+        known reset time (e.g., not used yet) start a new window with the next request.
+
+        Parameters
+        ----------
+        requests: int
+            The number of requests.
+
+        Returns
+        -------
+        duration: float
+            The expected time in seconds.
+        """
+        endpoint = self.endpoints[self.endpoint]
+        scheduler = self.client._request_scheduler
+        request = TwitterRequest('{}{}'.format(self.client.url, endpoint['url']), auth=self.client.auth)
+        credentials = getattr(self.client.auth, 'credentials', [self.client.auth])
+        rate_limits = [scheduler.get_rate_limit(request, auth=auth) for auth in credentials]
+        window = rate_limits[0].window
+        current_time = time.time()
+        # requests in the current windows of all credentials and the time the last of the windows resets
+        available, limit, reset_time = 0, 0, current_time
+        for rate_limit in rate_limits:
+            credential_limit = rate_limit.limit if rate_limit.limit is not None else endpoint['limit']
+            limit += credential_limit
+            if rate_limit.rate_limit_reset is None or rate_limit.rate_limit_reset <= current_time:
+                # the window starts with the next request
+                available += credential_limit
+                reset_time = max(reset_time, current_time + window)
+            else:
+                available += max(rate_limit.rate_limit_remaining or 0, 0)
+                reset_time = max(reset_time, rate_limit.rate_limit_reset)
+        if requests <= available:
+            duration = 0.0
+        else:
+            # the remaining requests are made in the following windows
+            windows = -(-(requests - available) // limit)
+            duration = (reset_time - current_time) + (windows - 1) * window
+        if scheduler.mode == 'interval':
+            # requests are spaced evenly over the window (after the reset if the current windows are exhausted)
+            start = reset_time - current_time if available == 0 else 0.0
+            duration = max(duration, start + requests * window / limit)
+        return duration
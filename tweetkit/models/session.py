@@ -0,0 +1,252 @@
+"""Session"""
+import requests
+from requests.adapters import HTTPAdapter
+
+__all__ = [
+    'TwitterSession',
+    'AsyncTwitterSession',
+]
+
+
+class TwitterSession(requests.Session):
+    """Persistent HTTP session with a configurable connection pool.
+
+    Parameters
+    ----------
+    pool_connections: int
+        The number of per-host connection pools to cache.
+    pool_maxsize: int
+        The maximum number of keep-alive connections to retain per host.
+    pool_block: bool
+        Whether to block when no free connections are available in the pool of a host (i.e., enforce
+        `pool_maxsize` as a hard per-host limit on concurrent connections).
+    max_retries: int
+        The maximum number of retries each connection should attempt (connection errors only).
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, pool_block=False, max_retries=0):
+        super(TwitterSession, self).__init__()
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.max_retries = max_retries
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+            max_retries=max_retries, pool_block=pool_block,
+        )
+        self.mount('https://', self.adapter)
+        self.mount('http://', self.adapter)
+
+    @property
+    def stats(self):
+        """Gets connection pool statistics.
+
+        Returns
+        -------
+        stats: dict
+            Per-host pool statistics (`connections`, `requests`, `idle`) along with the totals and the
+            connection reuse rate (the fraction of requests that did not open a new connection).
+        """
+        pools = {}
+        pool_manager = self.adapter.poolmanager
+        for key in list(pool_manager.pools.keys()):
+            pool = pool_manager.pools.get(key)
+            if pool is None:
+                continue
+            host = '{}://{}:{}'.format(pool.scheme, pool.host, pool.port)
+            idle = 0
+            if pool.pool is not None:
+                # empty slots of the pool queue are filled with None
+                idle = sum(1 for conn in list(pool.pool.queue) if conn is not None)
+            pools[host] = {
+                'connections': getattr(pool, 'num_connections', 0),
+                'requests': getattr(pool, 'num_requests', 0),
+                'idle': idle,
+            }
+        num_connections = sum(pool['connections'] for pool in pools.values())
+        num_requests = sum(pool['requests'] for pool in pools.values())
+        if num_requests > 0:
+            reuse_rate = max(num_requests - num_connections, 0) / num_requests
+        else:
+            reuse_rate = 0.0
+        return {
+            'pools': pools,
+            'connections': num_connections,
+            'requests': num_requests,
+            'reuse_rate': reuse_rate,
+        }
+
+    def __repr__(self):
+        return 'TwitterSession(pool_connections={:d}, pool_maxsize={:d}, pool_block={})'.format(
+            self.pool_connections,
+            self.pool_maxsize,
+            self.pool_block,
+        )
+
+
+class AsyncTwitterSession(object):
+    """Event-loop aware HTTP session with a configurable connection pool.
+
+    Requires the optional `httpx` dependency (``pip install tweetkit[async]``).
+
+    Parameters
+    ----------
+    max_connections: int
+        The maximum number of concurrent connections.
+    max_keepalive_connections: int
+        The maximum number of idle keep-alive connections to retain.
+    keepalive_expiry: float
+        The time (in seconds) to keep idle connections alive.
+    """
+
+    def __init__(self, max_connections=100, max_keepalive_connections=20, keepalive_expiry=5.0):
+        try:
+            import httpx
+        except ImportError as ex:
+            raise ImportError('AsyncTwitterSession requires httpx, install it with '
+                              '\'pip install tweetkit[async]\'') from ex
+        self._httpx = httpx
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        limits = httpx.Limits(
+            max_connections=max_connections, max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.client = httpx.AsyncClient(limits=limits)
+        self.num_requests = 0
+
+    async def send(self, request, stream=False, timeout=None):
+        """Sends a prepared request.
+
+        Parameters
+        ----------
+        request: requests.PreparedRequest
+            The prepared request (with authentication applied).
+        stream: bool
+            Whether to stream the response content.
+        timeout: float
+            The request timeout.
+
+        Returns
+        -------
+        response: httpx.Response
+            The response of the request.
+        """
+        headers = {k: v for k, v in request.headers.items() if k.lower() != 'content-length'}
+        req = self.client.build_request(
+            request.method, request.url, headers=headers, content=request.body,
+            timeout=timeout,
+        )
+        self.num_requests += 1
+        try:
+            return await self.client.send(req, stream=stream)
+        except self._httpx.TimeoutException as ex:
+            raise requests.exceptions.Timeout() from ex
+        except self._httpx.TransportError as ex:
+            raise requests.exceptions.ConnectionError() from ex
+
+    async def read(self, response):
+        """Reads the content of a response and converts it to `requests.Response`.
+
+        Parameters
+        ----------
+        response: httpx.Response
+            The response to read.
+
+        Returns
+        -------
+        response: requests.Response
+            The converted response.
+        """
+        try:
+            content = await response.aread()
+        except self._httpx.TimeoutException as ex:
+            raise requests.exceptions.Timeout() from ex
+        finally:
+            await response.aclose()
+        r = requests.Response()
+        r.status_code = response.status_code
+        r.headers = requests.structures.CaseInsensitiveDict(response.headers.items())
+        r._content = content
+        r.url = str(response.url)
+        r.encoding = response.charset_encoding
+        r.reason = response.reason_phrase
+        r.elapsed = response.elapsed
+        return r
+
+    async def aiter_lines(self, response):
+        """Iterates over lines of a streaming response.
+
+        Parameters
+        ----------
+        response: httpx.Response
+            The streaming response.
+
+        Returns
+        -------
+        lines: typing.AsyncIterator[str]
+            The lines of the response.
+        """
+        try:
+            async for line in response.aiter_lines():
+                yield line
+        except self._httpx.TimeoutException as ex:
+            raise requests.exceptions.Timeout() from ex
+        except self._httpx.TransportError as ex:
+            # e.g., the connection was closed while streaming
+            raise requests.exceptions.ConnectionError() from ex
+
+    async def aiter_bytes(self, response, chunk_size=None):
+        """Iterates over chunks of bytes of a streaming response.
+
+        Parameters
+        ----------
+        response: httpx.Response
+            The streaming response.
+        chunk_size: int
+            The maximum number of bytes of a chunk.
+
+        Returns
+        -------
+        chunks: typing.AsyncIterator[bytes]
+            The chunks of the response.
+        """
+        try:
+            async for chunk in response.aiter_bytes(chunk_size=chunk_size):
+                yield chunk
+        except self._httpx.TimeoutException as ex:
+            raise requests.exceptions.Timeout() from ex
+        except self._httpx.TransportError as ex:
+            raise requests.exceptions.ConnectionError() from ex
+
+    @property
+    def stats(self):
+        """Gets connection pool statistics.
+
+        Returns
+        -------
+        stats: dict
+            The number of requests sent along with the open and idle connections in the pool.
+        """
+        connections = getattr(getattr(self.client._transport, '_pool', None), 'connections', [])
+        return {
+            'connections': len(connections),
+            'idle': sum(1 for conn in connections if conn.is_idle()),
+            'requests': self.num_requests,
+        }
+
+    async def aclose(self):
+        """Close the session and all pooled connections.
+
+        Returns
+        -------
+        None
+        """
+        await self.client.aclose()
+
+    def __repr__(self):
+        return 'AsyncTwitterSession(max_connections={:d}, max_keepalive_connections={:d})'.format(
+            self.max_connections,
+            self.max_keepalive_connections,
+        )
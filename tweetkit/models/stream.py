@@ -0,0 +1,888 @@
+"""Stream"""
+import asyncio
+import collections
+import collections.abc
+import concurrent.futures
+import math
+import os
+import queue
+import tempfile
+import threading
+import time
+
+import requests
+
+from tweetkit.exceptions import TwitterRequestException
+from tweetkit.utils import json
+
+__all__ = [
+    'ReconnectingStream',
+    'AsyncReconnectingStream',
+    'PartitionedStream',
+    'StreamPipeline',
+]
+
+
+def _format_error(ex):
+    return '{}: {}'.format(type(ex).__name__, ex)
+
+
+class ReconnectingStream(object):
+    """Stream which reconnects on disconnects, stalls and server errors.
+
+    Reconnects follow the back-off recommended by Twitter: linearly by 250ms up to 16s for network errors (including
+    stalls and streams closed by the server), exponentially from 5s up to 320s for server errors and exponentially
+    from 1 minute up to 16 minutes for rate limits (e.g., too many connections). Other errors (e.g., unauthorized)
+    are raised.
+
+    On reconnect, ``backfill_minutes`` is set from the time since the last message (up to 5 minutes supported by
+    the API) and the tweets delivered again are skipped by ID. Raw streams (i.e., ``raw=True``) yield chunks which
+    are not decoded, so backfilled tweets are delivered again (the stats count chunks instead of messages).
+
+    Parameters
+    ----------
+    request: TwitterRequest
+        The stream request.
+    backfill: bool
+        Whether to request backfill on reconnect (requires access to backfill of the endpoint).
+    max_backfill_minutes: int
+        The maximum number of minutes of backfill to request.
+    max_retries: int
+        The maximum number of consecutive failed reconnects (None to retry forever).
+    dedupe_size: int
+        The number of recent tweet IDs to remember for skipping duplicates.
+    """
+
+    def __init__(self, request, backfill=True, max_backfill_minutes=5, max_retries=None, dedupe_size=100000):
+        self.request = request
+        if request.query is None:
+            request.query = {}
+        self.backfill = backfill
+        self.max_backfill_minutes = max_backfill_minutes
+        self.max_retries = max_retries
+        self.dedupe_size = dedupe_size
+        self._stream = None
+        # the stream which read the last message (to parse messages read with `next_line`)
+        self._parser = None
+        self._closed = False
+        self._backfill_minutes = request.query.get('backfill_minutes')
+        self._seen = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._retries = 0
+        self._last_message = None
+        self._disconnected = None
+        # statistics
+        self.connects = 0
+        self.disconnects = 0
+        self.messages = 0
+        self.duplicates = 0
+        self.downtime = 0.0
+        self.gaps = collections.deque(maxlen=100)
+        self.last_error = None
+
+    def _get_delay(self, ex):
+        """Gets the seconds to wait before reconnecting or None if the error should be raised."""
+        self._retries += 1
+        if self.max_retries is not None and self._retries > self.max_retries:
+            return None
+        code = None
+        if isinstance(ex, TwitterRequestException) and not isinstance(ex, requests.exceptions.Timeout):
+            code = ex.code
+        if code is None or code < 400:
+            # network errors (e.g., stall, connection reset or stream closed by the server)
+            return min(0.25 * self._retries, 16.0)
+        # the exponent is bounded as well (the number of retries is unbounded by default)
+        exponent = min(self._retries - 1, 16)
+        if code == 429:
+            return min(60.0 * 2 ** exponent, 960.0)
+        if code >= 500 or code == 420:
+            return min(5.0 * 2 ** exponent, 320.0)
+        return None
+
+    def _prepare_connect(self):
+        if self._closed:
+            raise ValueError('stream is closed')
+        if self._disconnected is None or not self.backfill:
+            return
+        # request tweets since the last message (or the disconnect if no message was received)
+        since = self._last_message if self._last_message is not None else self._disconnected
+        minutes = min(int(math.ceil((time.time() - since) / 60.0)), self.max_backfill_minutes)
+        if minutes > 0:
+            self.request.query['backfill_minutes'] = minutes
+
+    def _restore_query(self):
+        # restore the backfill of the first connect (if any)
+        if self._backfill_minutes is None:
+            self.request.query.pop('backfill_minutes', None)
+        else:
+            self.request.query['backfill_minutes'] = self._backfill_minutes
+
+    def _connected(self, stream):
+        backfill_minutes = self.request.query.get('backfill_minutes')
+        self._restore_query()
+        self._stream = stream
+        self._parser = stream
+        self.connects += 1
+        if self._disconnected is not None:
+            now = time.time()
+            self.downtime += now - self._disconnected
+            self.gaps.append({
+                'start': self._disconnected,
+                'end': now,
+                'seconds': now - self._disconnected,
+                'backfill_minutes': backfill_minutes if self.backfill else None,
+            })
+            self._disconnected = None
+
+    def _connect_failed(self, ex):
+        self._restore_query()
+        self.last_error = _format_error(ex)
+        return self._get_delay(ex)
+
+    def _disconnect(self, ex=None):
+        """Records a disconnect and gets the seconds to wait before reconnecting."""
+        stream, self._stream = self._stream, None
+        self.disconnects += 1
+        self._disconnected = time.time()
+        self.last_error = None if ex is None else _format_error(ex)
+        return stream, self._get_delay(ex)
+
+    def _received(self):
+        # reset back-off after a successful read
+        self._retries = 0
+        self._last_message = time.time()
+
+    def _is_new(self, resp):
+        if isinstance(resp, bytes):
+            # chunks of raw streams are not decoded, hence duplicates are not skipped
+            self.messages += 1
+            return True
+        data = resp.data
+        id_ = data.get('id') if isinstance(data, collections.abc.Mapping) else None
+        # messages may be parsed by several threads (e.g., the workers of a pipeline)
+        with self._lock:
+            if id_ is not None:
+                if id_ in self._seen:
+                    self.duplicates += 1
+                    return False
+                self._seen[id_] = None
+                if len(self._seen) > self.dedupe_size:
+                    self._seen.popitem(last=False)
+            self.messages += 1
+        return True
+
+    def _connect(self):
+        while self._stream is None:
+            self._prepare_connect()
+            try:
+                stream = self.request.send()
+            except requests.exceptions.RequestException as ex:
+                delay = self._connect_failed(ex)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+            else:
+                self._connected(stream)
+
+    def _read(self, read):
+        """Reads from the stream with the callable, reconnecting on disconnects and errors."""
+        while True:
+            self._connect()
+            try:
+                value = read(self._stream)
+            except StopIteration:
+                stream, delay = self._disconnect()
+                if delay is None:
+                    stream.close()
+                    raise
+            except requests.exceptions.RequestException as ex:
+                stream, delay = self._disconnect(ex)
+                if delay is None:
+                    stream.close()
+                    raise
+            else:
+                self._received()
+                return value
+            stream.close()
+            time.sleep(delay)
+
+    def __next__(self):
+        while True:
+            resp = self._read(next)
+            if self._is_new(resp):
+                return resp
+
+    def next_line(self):
+        """Reads the next message (skipping heartbeats) without decoding it, reconnecting on disconnects and errors.
+
+        Use with `parse`, which skips the tweets delivered again after a reconnect (e.g., by `StreamPipeline`).
+
+        Returns
+        -------
+        line: bytes or str
+            The raw message.
+        """
+        if self.request.kwargs.get('raw'):
+            raise TypeError('raw streams are read in chunks, not lines')
+        return self._read(lambda stream: stream.next_line())
+
+    def parse(self, line):
+        """Creates the response of a message read with `next_line`.
+
+        Parameters
+        ----------
+        line: bytes or str or dict
+            The raw (or decoded) message.
+
+        Returns
+        -------
+        TwitterResponse or None
+            The response of the message or None if the message is a duplicate (e.g., a backfilled tweet).
+        """
+        if self._parser is None:
+            raise ValueError('no message was read from the stream')
+        resp = self._parser.parse(line)
+        return resp if self._is_new(resp) else None
+
+    def __iter__(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Close the stream.
+
+        Returns
+        -------
+        None
+        """
+        self._closed = True
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    @property
+    def stats(self):
+        """Gets connection and gap statistics.
+
+        Returns
+        -------
+        stats: dict
+            The number of connects, disconnects, messages and skipped duplicates, the total downtime (in seconds),
+            the recent gaps and the last error.
+        """
+        return {
+            'connected': self._stream is not None,
+            'connects': self.connects,
+            'reconnects': max(self.connects - 1, 0),
+            'disconnects': self.disconnects,
+            'messages': self.messages,
+            'duplicates': self.duplicates,
+            'downtime': self.downtime,
+            'gaps': list(self.gaps),
+            'last_error': self.last_error,
+        }
+
+    @property
+    def content(self):
+        """Iterator of objects."""
+        for response in self:
+            content = response.content
+            if isinstance(content, collections.abc.Mapping):
+                yield content
+            else:
+                for item in content:
+                    yield item
+
+
+class AsyncReconnectingStream(ReconnectingStream):
+    """Asynchronous stream which reconnects on disconnects, stalls and server errors (use with ``async for``)."""
+
+    async def _connect(self):
+        while self._stream is None:
+            self._prepare_connect()
+            try:
+                stream = await self.request.send()
+            except requests.exceptions.RequestException as ex:
+                delay = self._connect_failed(ex)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+            else:
+                self._connected(stream)
+
+    async def __anext__(self):
+        while True:
+            await self._connect()
+            try:
+                resp = await self._stream.__anext__()
+            except StopAsyncIteration:
+                stream, delay = self._disconnect()
+                if delay is None:
+                    await stream.aclose()
+                    raise
+            except requests.exceptions.RequestException as ex:
+                stream, delay = self._disconnect(ex)
+                if delay is None:
+                    await stream.aclose()
+                    raise
+            else:
+                self._received()
+                if self._is_new(resp):
+                    return resp
+                continue
+            await stream.aclose()
+            await asyncio.sleep(delay)
+
+    def __aiter__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    def __next__(self):
+        raise TypeError('\'{}\' object is not an iterator, use \'async for\' instead'.format(type(self).__name__))
+
+    def __iter__(self):
+        raise TypeError('\'{}\' object is not iterable, use \'async for\' instead'.format(type(self).__name__))
+
+    def next_line(self):
+        raise TypeError('\'{}\' object can not be read synchronously'.format(type(self).__name__))
+
+    async def aclose(self):
+        """Close the stream.
+
+        Returns
+        -------
+        None
+        """
+        self._closed = True
+        if self._stream is not None:
+            await self._stream.aclose()
+            self._stream = None
+
+    @property
+    async def content(self):
+        """Asynchronous iterator of objects."""
+        async for response in self:
+            content = response.content
+            if isinstance(content, collections.abc.Mapping):
+                yield content
+            else:
+                for item in content:
+                    yield item
+
+
+def _parse_lines(lines):
+    # runs in worker processes
+    return [json.loads(line) for line in lines]
+
+
+class PartitionedStream(object):
+    """Consumes the partitions of a stream concurrently and merges their messages.
+
+    Each partition is read by a thread into a single bounded queue. A partition may only have a limited number of
+    messages in the queue, so a partition which is read faster than it is consumed waits (and stops reading from
+    its connection) instead of filling the queue.
+
+    Examples
+    --------
+    >>> stream = PartitionedStream(lambda partition: client.tweets.get_tweets_firehose_stream(
+    ...     partition, reconnect=True), partitions=20)
+
+    Parameters
+    ----------
+    connect: typing.Callable
+        Opens the stream of a partition, called with the partition number.
+    partitions: int or list of int
+        The partition numbers (or the number of partitions, numbered from 1).
+    maxsize: int
+        The maximum number of messages in the queue.
+    partition_maxsize: int
+        The maximum number of messages of a partition in the queue (defaults to an equal share of the queue).
+    processes: int
+        The number of processes to parse messages in (messages are parsed by the reader threads by default). Requires
+        streams which provide raw messages with `next_line` (e.g., `TwitterStreamResponse` or `ReconnectingStream`).
+    batch_size: int
+        The number of messages sent to a process at a time.
+    """
+
+    def __init__(self, connect, partitions, maxsize=10000, partition_maxsize=None, processes=0, batch_size=100):
+        if isinstance(partitions, int):
+            partitions = range(1, partitions + 1)
+        self.connect = connect
+        self.partitions = list(partitions)
+        self.maxsize = maxsize
+        if partition_maxsize is None:
+            partition_maxsize = max(maxsize // len(self.partitions), 1)
+        self.partition_maxsize = partition_maxsize
+        self.processes = processes
+        self.batch_size = batch_size if processes > 0 else 1
+        self._queue = None
+        self._stop = None
+        self._threads = []
+        self._streams = {}
+        self._slots = {}
+        self._executor = None
+        self._pending = collections.deque()
+        self._finished = set()
+        self._stats = {}
+
+    def _start(self):
+        self._queue = queue.Queue(maxsize=self.maxsize)
+        self._stop = threading.Event()
+        if self.processes > 0:
+            self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.processes)
+        for partition in self.partitions:
+            # the number of messages of the partition which may be queued (in batches)
+            self._slots[partition] = threading.Semaphore(max(self.partition_maxsize // self.batch_size, 1))
+            self._stats[partition] = {
+                'connected': False,
+                'received': 0,
+                'consumed': 0,
+                'lag': None,
+                'max_lag': 0.0,
+                'error': None,
+            }
+            thread = threading.Thread(target=self._read, args=(partition,), daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _put(self, partition, item, count=1):
+        """Puts an item to the queue, waiting for a slot of the partition."""
+        slots = self._slots[partition]
+        while not slots.acquire(timeout=0.1):
+            if self._stop.is_set():
+                return False
+        self._stats[partition]['received'] += count
+        while not self._stop.is_set():
+            try:
+                self._queue.put((partition, item, count, time.monotonic()), timeout=0.1)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    def _read(self, partition):
+        stats = self._stats[partition]
+        try:
+            stream = self.connect(partition)
+            self._streams[partition] = stream
+            stats['connected'] = True
+            if self._stop.is_set():
+                return
+            if self._executor is None:
+                for resp in stream:
+                    if not self._put(partition, resp):
+                        return
+            else:
+                if not hasattr(stream, 'next_line'):
+                    raise TypeError('parsing in processes requires raw messages, found \'{}\''.format(
+                        type(stream).__name__))
+                while not self._stop.is_set():
+                    lines, error = [], None
+                    try:
+                        while len(lines) < self.batch_size:
+                            lines.append(stream.next_line())
+                    except StopIteration:
+                        pass
+                    except BaseException as ex:
+                        # the messages read before the error are delivered first
+                        error = ex
+                    if len(lines) > 0:
+                        future = self._executor.submit(_parse_lines, lines)
+                        if not self._put(partition, (stream, future), count=len(lines)):
+                            return
+                    if error is not None:
+                        raise error
+                    if len(lines) < self.batch_size:
+                        break
+            # the stream ended
+            self._put(partition, None, count=0)
+        except BaseException as ex:
+            if not self._stop.is_set():
+                stats['error'] = '{}: {}'.format(type(ex).__name__, ex)
+                self._put(partition, ex, count=0)
+        finally:
+            stats['connected'] = False
+
+    def __next__(self):
+        if self._queue is None:
+            self._start()
+        while len(self._pending) == 0:
+            if len(self._finished) == len(self.partitions):
+                raise StopIteration()
+            partition, item, count, queued = self._queue.get()
+            self._slots[partition].release()
+            stats = self._stats[partition]
+            stats['lag'] = time.monotonic() - queued
+            stats['max_lag'] = max(stats['max_lag'], stats['lag'])
+            if item is None:
+                self._finished.add(partition)
+            elif isinstance(item, BaseException):
+                self.close()
+                raise item
+            elif isinstance(item, tuple):
+                stream, future = item
+                for data in future.result():
+                    resp = stream.parse(data)
+                    # reconnecting streams skip duplicates
+                    if resp is not None:
+                        self._pending.append(resp)
+            else:
+                self._pending.append(item)
+            stats['consumed'] += count
+        return self._pending.popleft()
+
+    def __iter__(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Close the streams of all partitions.
+
+        Returns
+        -------
+        None
+        """
+        if self._stop is not None:
+            self._stop.set()
+        for stream in list(self._streams.values()):
+            try:
+                stream.close()
+            except Exception:
+                pass
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=1.0)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._threads, self._streams, self._executor = [], {}, None
+        self._queue, self._stop = None, None
+        self._pending.clear()
+        self._finished.clear()
+
+    @property
+    def stats(self):
+        """Gets the statistics of each partition.
+
+        Returns
+        -------
+        stats: dict
+            Mapping of partition to whether it is connected, the number of messages received and consumed, the
+            number of messages in the queue, the time the last consumed message waited in the queue (lag), the
+            maximum lag and the last error.
+        """
+        return {partition: dict(stats, queued=stats['received'] - stats['consumed'])
+                for partition, stats in self._stats.items()}
+
+    @property
+    def content(self):
+        """Iterator of objects."""
+        try:
+            for response in self:
+                content = response.content
+                if isinstance(content, collections.abc.Mapping):
+                    yield content
+                else:
+                    for item in content:
+                        yield item
+        finally:
+            self.close()
+
+
+overflows = ['block', 'drop_oldest', 'spill']
+
+
+class StreamPipeline(object):
+    """Reads a stream in a dedicated thread and parses its messages in workers.
+
+    The reader only moves raw messages from the connection to a bounded buffer, so that a slow consumer does not stall
+    the connection (which makes Twitter disconnect the stream). Workers parse the messages and build their content.
+    When the buffer is full, the reader waits (`block`), drops the oldest message (`drop_oldest`) or appends
+    messages to a file on disk which is read back in order once the buffer drains (`spill`).
+
+    Parameters
+    ----------
+    stream: TwitterStreamResponse or ReconnectingStream
+        The stream to read (raw messages are read with `next_line` and parsed with `parse`).
+    maxsize: int
+        The maximum number of raw messages in the buffer (and of parsed messages waiting for the consumer).
+    overflow: str
+        What to do when the buffer is full, one of `block`, `drop_oldest` or `spill`.
+    workers: int
+        The number of threads parsing messages (messages may be reordered with more than one worker).
+    processes: int
+        The number of processes to parse messages in (messages are parsed by the worker threads by default).
+    batch_size: int
+        The maximum number of messages a worker takes from the buffer at a time.
+    spill_path: str
+        Path to the file to spill messages to (defaults to a temporary file).
+    """
+
+    def __init__(self, stream, maxsize=10000, overflow='block', workers=1, processes=0, batch_size=100,
+                 spill_path=None):
+        if overflow not in overflows:
+            raise ValueError('expected overflow to be one of {}, found \'{}\''.format(', '.join(overflows), overflow))
+        if not hasattr(stream, 'next_line') or not hasattr(stream, 'parse'):
+            raise TypeError('expected a stream which provides raw messages (e.g., TwitterStreamResponse or '
+                            'ReconnectingStream), found \'{}\''.format(type(stream).__name__))
+        self.stream = stream
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.workers = workers
+        self.processes = processes
+        self.batch_size = batch_size
+        self.spill_path = spill_path
+        self._buffer = collections.deque()
+        self._cond = threading.Condition()
+        self._output = None
+        self._stop = None
+        self._threads = []
+        self._executor = None
+        self._active = 0
+        self._eof = False
+        self._done = False
+        self._error = None
+        # spill file and the positions to write to and read from
+        self._spill = None
+        self._spill_temp = False
+        self._spill_write = 0
+        self._spill_read = 0
+        # counters
+        self.received = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.restored = 0
+        self.parsed = 0
+
+    def _start(self):
+        self._output = queue.Queue(maxsize=self.maxsize)
+        self._stop = threading.Event()
+        if self.processes > 0:
+            self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.processes)
+        self._active = self.workers
+        self._threads = [threading.Thread(target=self._read, daemon=True)]
+        self._threads.extend(threading.Thread(target=self._work, daemon=True) for _ in range(self.workers))
+        for thread in self._threads:
+            thread.start()
+
+    def _write_spill(self, line):
+        if self._spill is None:
+            if self.spill_path is None:
+                fd, self.spill_path = tempfile.mkstemp(suffix='.jsonl')
+                os.close(fd)
+                self._spill_temp = True
+            self._spill = open(self.spill_path, 'w+b')
+        if isinstance(line, str):
+            line = line.encode('utf-8')
+        self._spill.seek(self._spill_write)
+        self._spill.write(line + b'\n')
+        self._spill_write = self._spill.tell()
+        self.spilled += 1
+
+    def _restore_spill(self, n):
+        self._spill.flush()
+        self._spill.seek(self._spill_read)
+        for _ in range(n):
+            if self._spill.tell() >= self._spill_write:
+                break
+            self._buffer.append(self._spill.readline().rstrip(b'\n'))
+            self.restored += 1
+        self._spill_read = self._spill.tell()
+        if self._spill_read >= self._spill_write:
+            # reuse the file once all messages are read back
+            self._spill.seek(0)
+            self._spill.truncate()
+            self._spill_read, self._spill_write = 0, 0
+
+    def _push(self, line):
+        with self._cond:
+            self.received += 1
+            if self._spill_write > 0:
+                # keep the order, messages are spilled until the spill file is read back
+                self._write_spill(line)
+                self._cond.notify()
+                return
+            if len(self._buffer) >= self.maxsize:
+                if self.overflow == 'block':
+                    while len(self._buffer) >= self.maxsize and not self._stop.is_set():
+                        self._cond.wait(0.1)
+                elif self.overflow == 'drop_oldest':
+                    self._buffer.popleft()
+                    self.dropped += 1
+                else:
+                    self._write_spill(line)
+                    self._cond.notify()
+                    return
+            self._buffer.append(line)
+            self._cond.notify()
+
+    def _pop(self, n):
+        with self._cond:
+            while not self._stop.is_set():
+                if len(self._buffer) == 0 and self._spill_write > 0:
+                    self._restore_spill(self.maxsize)
+                if len(self._buffer) > 0:
+                    lines = [self._buffer.popleft() for _ in range(min(n, len(self._buffer)))]
+                    # there is space for the reader
+                    self._cond.notify_all()
+                    return lines
+                if self._eof:
+                    return None
+                self._cond.wait(0.1)
+            return None
+
+    def _read(self):
+        try:
+            while not self._stop.is_set():
+                try:
+                    line = self.stream.next_line()
+                except StopIteration:
+                    break
+                self._push(line)
+        except BaseException as ex:
+            if not self._stop.is_set():
+                self._error = ex
+        finally:
+            with self._cond:
+                self._eof = True
+                self._cond.notify_all()
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._output.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    def _work(self):
+        try:
+            while True:
+                lines = self._pop(self.batch_size)
+                if lines is None:
+                    return
+                if self._executor is not None:
+                    lines = self._executor.submit(_parse_lines, lines).result()
+                for line in lines:
+                    resp = self.stream.parse(line)
+                    if resp is None:
+                        # duplicate skipped by a reconnecting stream
+                        continue
+                    item = resp, resp.content
+                    with self._cond:
+                        self.parsed += 1
+                    if not self._put(item):
+                        return
+        except BaseException as ex:
+            if not self._stop.is_set() and self._error is None:
+                self._error = ex
+        finally:
+            with self._cond:
+                self._active -= 1
+                last = self._active == 0
+            if last:
+                self._put(None)
+
+    def _next_item(self):
+        if self._done:
+            raise StopIteration()
+        if self._output is None:
+            self._start()
+        item = self._output.get()
+        if item is None:
+            self._done = True
+            error, self._error = self._error, None
+            self.close()
+            if error is not None:
+                raise error
+            raise StopIteration()
+        return item
+
+    def __next__(self):
+        return self._next_item()[0]
+
+    def __iter__(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Close the stream and stop the reader and workers.
+
+        Returns
+        -------
+        None
+        """
+        if self._stop is not None:
+            self._stop.set()
+        try:
+            self.stream.close()
+        finally:
+            for thread in self._threads:
+                if thread is not threading.current_thread():
+                    thread.join(timeout=1.0)
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            if self._spill is not None:
+                self._spill.close()
+                if self._spill_temp:
+                    os.remove(self.spill_path)
+            self._threads, self._executor, self._spill = [], None, None
+
+    @property
+    def stats(self):
+        """Gets the counters of the pipeline.
+
+        Returns
+        -------
+        stats: dict
+            The number of messages received, dropped, spilled to disk, read back from disk and parsed along with the
+            number of messages in the buffer, on disk and waiting for the consumer.
+        """
+        with self._cond:
+            return {
+                'received': self.received,
+                'dropped': self.dropped,
+                'spilled': self.spilled,
+                'restored': self.restored,
+                'parsed': self.parsed,
+                'buffered': len(self._buffer),
+                'on_disk': self.spilled - self.restored,
+                'waiting': 0 if self._output is None else self._output.qsize(),
+            }
+
+    @property
+    def content(self):
+        """Iterator of objects (built by the workers)."""
+        try:
+            while True:
+                try:
+                    _, content = self._next_item()
+                except StopIteration:
+                    return
+                if isinstance(content, collections.abc.Mapping):
+                    yield content
+                else:
+                    for item in content:
+                        yield item
+        finally:
+            self.close()
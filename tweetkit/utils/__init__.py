@@ -1,8 +1,10 @@
 """Utility functions."""
 from tweetkit.utils import copy
 from tweetkit.utils import json
+from tweetkit.utils import writer
 
 __all__ = [
     'copy',
     'json',
+    'writer',
 ]
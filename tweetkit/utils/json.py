@@ -1,8 +1,15 @@
-"""Extended JSON functionality."""
-import io
+"""Extended JSON functionality.
+
+The JSON backend is selected automatically from the installed libraries in the order of `orjson`, `simdjson`
+(pysimdjson), `ujson` and the standard library `json`. Use `set_backend` to select a backend explicitly.
+
+Objects are encoded with the standard library unless encoding with the backend is enabled with `set_backend` (the
+output of the backends differs, e.g., in whitespace and the escaping of non-ASCII characters), hence the output of
+`dumps` and `dump` does not depend on the installed libraries.
+"""
 import json as simplejson
 import os
-from collections.abc import Sequence, Mapping
+from collections.abc import Iterable, Mapping
 
 import requests
 from requests.utils import guess_json_utf
@@ -13,15 +20,110 @@ __all__ = [
     'loads',
     'dumps',
     'dump',
+    'get_backend',
+    'set_backend',
 ]
 
+backends = ['orjson', 'simdjson', 'ujson', 'json']
+
+
+class JSONBackend(object):
+    """JSONBackend
+
+    Parameters
+    ----------
+    name: str
+        The name of the backend.
+    loads: typing.Callable
+        Function to decode JSON from `str` or `bytes`.
+    dumps: typing.Callable
+        Function to encode an object as JSON (returns `str` or `bytes`).
+    """
+
+    def __init__(self, name, loads, dumps):
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+    def __repr__(self):
+        return 'JSONBackend(name=\'{}\')'.format(self.name)
+
+
+def _create_backend(name):
+    if name == 'orjson':
+        import orjson
+        return JSONBackend(name, orjson.loads, orjson.dumps)
+    if name == 'simdjson':
+        import simdjson
+        return JSONBackend(name, simdjson.loads, simplejson.dumps)
+    if name == 'ujson':
+        import ujson
+        return JSONBackend(name, ujson.loads, ujson.dumps)
+    if name == 'json':
+        return JSONBackend(name, simplejson.loads, simplejson.dumps)
+    raise ValueError('expected backend to be one of {}, found \'{}\''.format(', '.join(backends), name))
+
+
+def _select_backend():
+    for name in backends:
+        try:
+            return _create_backend(name)
+        except ImportError:
+            pass
+    return _create_backend('json')
+
+
+_backend = _select_backend()
+
+# whether objects are encoded with the backend
+_encode = False
+
+
+def get_backend():
+    """Gets the name of the JSON backend.
+
+    Returns
+    -------
+    name: str
+        The name of the backend.
+    """
+    return _backend.name
+
+
+def set_backend(name=None, encode=False):
+    """Sets the JSON backend.
+
+    Parameters
+    ----------
+    name: str
+        The name of the backend (one of `orjson`, `simdjson`, `ujson` or `json`). Selects the fastest installed
+        backend if not provided.
+    encode: bool
+        Whether to encode objects with the backend as well (e.g., in `dumps`). The output differs from the standard
+        library (e.g., ``{"a":"é"}`` instead of ``{"a": "\\u00e9"}`` with `orjson`).
+
+    Returns
+    -------
+    None
+    """
+    global _backend, _encode
+    if name is None:
+        _backend = _select_backend()
+    else:
+        _backend = _create_backend(name)
+    _encode = encode
+
+
+def _is_utf8(encoding):
+    return encoding is not None and encoding.lower().replace('_', '-') in ('utf-8', 'utf8')
+
 
 def loads(s):
     """Load a JSON string to a dict.
 
     Parameters
     ----------
-    s: str or requests.Response
+    s: str or bytes or requests.Response
         A string input.
 
     Returns
@@ -30,22 +132,28 @@ def loads(s):
         Loaded repr.
     """
     if isinstance(s, requests.Response):
-        text = s.text
-        if not s.encoding and s.content and len(s.content) > 3:
-            encoding = guess_json_utf(s.content)
-            if encoding is not None:
-                try:
-                    text = s.content.decode(encoding)
-                except UnicodeDecodeError:
-                    pass
-        s = text
+        content = s.content
+        encoding = s.encoding
+        if not encoding and content and len(content) > 3:
+            encoding = guess_json_utf(content)
+        if encoding is None or _is_utf8(encoding):
+            # parse bytes directly, skipping charset detection and the copy to str
+            s = content
+        else:
+            try:
+                s = content.decode(encoding)
+            except (UnicodeDecodeError, LookupError):
+                s = s.text
     elif isinstance(s, Mapping):
         return s
     try:
-        data = simplejson.loads(s)
+        data = _backend.loads(s)
     except simplejson.JSONDecodeError as ex:
         # JSONDecodeError but from local mixin
         raise JSONDecodeError(ex.msg, ex.doc, ex.pos) from ex
+    except ValueError as ex:
+        doc = s.decode('utf-8', errors='replace') if isinstance(s, bytes) else s
+        raise JSONDecodeError(str(ex), doc, 0) from ex
     else:
         return data
 
@@ -67,12 +175,44 @@ def dumps(obj, *args, **kwargs):
     s: str
         The string representation of the input string object.
     """
-    return simplejson.dumps(obj, *args, **kwargs)
+    if not _encode or args or kwargs or _backend.name == 'json':
+        # formatting options are only supported by the standard library
+        return simplejson.dumps(obj, *args, **kwargs)
+    try:
+        s = _backend.dumps(obj)
+    except (TypeError, ValueError, OverflowError):
+        # e.g., non-string keys or integers out of range of the backend
+        return simplejson.dumps(obj)
+    if isinstance(s, bytes):
+        s = s.decode('utf-8')
+    return s
+
+
+def _dumpb(obj, *args, **kwargs):
+    """Gets JSON as UTF-8 encoded bytes (without decoding the output of backends which return bytes)."""
+    if _encode and not args and not kwargs and _backend.name == 'orjson':
+        try:
+            return _backend.dumps(obj)
+        except (TypeError, ValueError, OverflowError):
+            pass
+    return dumps(obj, *args, **kwargs).encode('utf-8')
+
+
+def _is_jsonl(path):
+    path = os.path.abspath(path)
+    for suffix in ('.gz', '.zst'):
+        if path.endswith(suffix):
+            path = path[:-len(suffix)]
+    return path.endswith('.jsonl')
 
 
 def dump(obj, fp, *args, **kwargs):
     """Save object to a file.
 
+    Objects are written one line at a time to JSON lines files (``.jsonl``, optionally compressed as ``.jsonl.gz``
+    or ``.jsonl.zst``), hence any iterable of objects (e.g., the content of a paginator) can be saved without
+    collecting it in memory.
+
     Parameters
     ----------
     obj: dict or object
@@ -88,25 +228,29 @@ def dump(obj, fp, *args, **kwargs):
     -------
     None
     """
-    if hasattr(fp, 'name'):
-        is_jsonline = os.path.abspath(fp.name).endswith('.jsonl')
-    elif isinstance(fp, str):
-        is_jsonline = os.path.abspath(fp).endswith('.jsonl')
+    is_path = isinstance(fp, (str, os.PathLike))
+    if is_path:
+        fp = os.fspath(fp)
+        is_jsonline = _is_jsonl(fp)
+    elif isinstance(getattr(fp, 'name', None), str):
+        is_jsonline = _is_jsonl(fp.name)
     else:
         is_jsonline = False
-    if is_jsonline:
-        output = io.StringIO()
-        if not isinstance(obj, Sequence):
-            obj = obj,
-        for item in obj:
-            line = simplejson.dumps(item, *args, **kwargs)
-            output.write('{}\n'.format(line))
-        lines = output.getvalue()
-        output.close()
-    else:
-        lines = simplejson.dumps(obj, *args, **kwargs)
-    if isinstance(fp, str):
-        with open(fp, mode='w', encoding='utf-8') as fp:
+    if not is_jsonline:
+        lines = dumps(obj, *args, **kwargs)
+        if is_path:
+            with open(fp, mode='w', encoding='utf-8') as fp:
+                fp.write(lines)
+        else:
             fp.write(lines)
+        return
+    if isinstance(obj, (Mapping, str)) or not isinstance(obj, Iterable):
+        obj = obj,
+    if is_path:
+        from tweetkit.utils.writer import RotatingFileWriter
+        with RotatingFileWriter(fp) as writer:
+            for item in obj:
+                writer.write(_dumpb(item, *args, **kwargs) + b'\n')
     else:
-        fp.write(lines)
+        for item in obj:
+            fp.write('{}\n'.format(dumps(item, *args, **kwargs)))
@@ -0,0 +1,283 @@
+"""Streaming writers of (optionally compressed and rotated) files."""
+import gzip
+import os
+import time
+
+from tweetkit.utils import json
+
+__all__ = [
+    'RotatingFileWriter',
+    'JSONLinesWriter',
+]
+
+compressions = {
+    'gzip': '.gz',
+    'zstd': '.zst',
+}
+
+
+def _infer_compression(path):
+    for compression, suffix in compressions.items():
+        if path.endswith(suffix):
+            return compression
+    return None
+
+
+class RotatingFileWriter(object):
+    """Writes bytes to a file with buffering, optional compression and rotation by size or time.
+
+    When rotation is enabled, files are numbered (e.g., ``tweets-00000.jsonl.gz``, ``tweets-00001.jsonl.gz``) and
+    rotation only happens in between two writes (e.g., lines are never split among files).
+
+    Parameters
+    ----------
+    path: str
+        Path to the file.
+    compression: str
+        One of `gzip`, `zstd` (requires zstandard) or None. Inferred from the suffix of the path by default.
+    compresslevel: int
+        The compression level (defaults to the default level of the compression).
+    max_bytes: int
+        The number of (uncompressed) bytes after which to start a new file.
+    max_seconds: float
+        The number of seconds after which to start a new file.
+    buffer_size: int
+        The number of bytes to buffer before writing to the file.
+    append: bool
+        Whether to append to existing files (continuing from the last rotated file) instead of overwriting them.
+        Compressed files can be appended to as gzip and zstd files may consist of multiple members. The existing
+        bytes of a file count towards `max_bytes` (as their size on disk for compressed files).
+    """
+
+    def __init__(self, path, compression='infer', compresslevel=None, max_bytes=None, max_seconds=None,
+                 buffer_size=2 ** 20, append=False):
+        path = os.fspath(path)
+        if compression == 'infer':
+            compression = _infer_compression(path)
+        if compression is not None and compression not in compressions:
+            raise ValueError('expected compression to be one of {}, found \'{}\''.format(
+                ', '.join(compressions), compression))
+        if compression is not None and not path.endswith(compressions[compression]):
+            path += compressions[compression]
+        self.path = path
+        self.compression = compression
+        self.compresslevel = compresslevel
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.buffer_size = buffer_size
+        self.append = append
+        self.files = []
+        self._index = self._get_last_index() if append else 0
+        self._file = None
+        self._raw = None
+        self._opened = None
+        self._file_bytes = 0
+        self._buffer = []
+        self._buffered = 0
+        # throughput
+        self.count = 0
+        self.bytes = 0
+        self._start = time.monotonic()
+        self._closed = False
+
+    @property
+    def rotate(self):
+        """Whether files are rotated."""
+        return self.max_bytes is not None or self.max_seconds is not None
+
+    def _get_path(self, index):
+        if not self.rotate:
+            return self.path
+        suffix = compressions.get(self.compression, '')
+        root = self.path[:len(self.path) - len(suffix)]
+        root, ext = os.path.splitext(root)
+        return '{}-{:05d}{}{}'.format(root, index, ext, suffix)
+
+    def _get_last_index(self):
+        index = 0
+        while self.rotate and os.path.exists(self._get_path(index + 1)):
+            index += 1
+        return index
+
+    def _get_file_bytes(self, path):
+        # the size of the file appended to
+        return os.path.getsize(path) if self.append and os.path.exists(path) else 0
+
+    def _open(self):
+        path = self._get_path(self._index)
+        file_bytes = self._get_file_bytes(path)
+        while self.max_bytes is not None and file_bytes >= self.max_bytes:
+            # skip files appended to which are full
+            self._index += 1
+            path = self._get_path(self._index)
+            file_bytes = self._get_file_bytes(path)
+        self._index += 1
+        mode = 'ab' if self.append else 'wb'
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if self.compression == 'gzip':
+            self._raw = open(path, mode)
+            compresslevel = 6 if self.compresslevel is None else self.compresslevel
+            self._file = gzip.GzipFile(fileobj=self._raw, mode='wb', compresslevel=compresslevel)
+        elif self.compression == 'zstd':
+            try:
+                import zstandard
+            except ImportError as ex:
+                raise ImportError('zstd compression requires zstandard, install it with '
+                                  '\'pip install tweetkit[zstd]\'') from ex
+            self._raw = open(path, mode)
+            level = 3 if self.compresslevel is None else self.compresslevel
+            self._file = zstandard.ZstdCompressor(level=level).stream_writer(self._raw)
+        else:
+            self._raw = None
+            self._file = open(path, mode)
+        self.files.append(path)
+        self._opened = time.monotonic()
+        self._file_bytes = file_bytes
+
+    def _should_rotate(self):
+        if self.max_bytes is not None and self._file_bytes >= self.max_bytes:
+            return True
+        if self.max_seconds is not None and time.monotonic() - self._opened >= self.max_seconds:
+            return True
+        return False
+
+    def _flush_buffer(self):
+        if self._buffered > 0:
+            self._file.write(b''.join(self._buffer))
+            self._buffer, self._buffered = [], 0
+
+    def _close_file(self):
+        if self._file is None:
+            return
+        self._flush_buffer()
+        self._file.close()
+        if self._raw is not None:
+            self._raw.close()
+        self._file, self._raw = None, None
+
+    def write(self, data, count=1):
+        """Writes bytes to the file.
+
+        Parameters
+        ----------
+        data: bytes
+            The bytes to write.
+        count: int
+            The number of items (e.g., lines) in the data (for throughput).
+
+        Returns
+        -------
+        None
+        """
+        if self._closed:
+            raise ValueError('write to closed writer')
+        if self._file is None:
+            self._open()
+        elif self.rotate and self._should_rotate():
+            self._close_file()
+            self._open()
+        self._buffer.append(data)
+        self._buffered += len(data)
+        self._file_bytes += len(data)
+        self.count += count
+        self.bytes += len(data)
+        if self._buffered >= self.buffer_size:
+            self._flush_buffer()
+
+    def flush(self):
+        """Writes the buffered bytes to the file.
+
+        Returns
+        -------
+        None
+        """
+        if self._file is not None:
+            self._flush_buffer()
+            self._file.flush()
+
+    def close(self):
+        """Writes the buffered bytes and closes the file.
+
+        Returns
+        -------
+        None
+        """
+        self._close_file()
+        self._closed = True
+
+    @property
+    def stats(self):
+        """Gets the throughput of the writer.
+
+        Returns
+        -------
+        stats: dict
+            The number of files, items and (uncompressed) bytes written, the elapsed time and the rates per second.
+        """
+        elapsed = time.monotonic() - self._start
+        return {
+            'files': len(self.files),
+            'count': self.count,
+            'bytes': self.bytes,
+            'elapsed': elapsed,
+            'count_per_second': self.count / elapsed if elapsed > 0 else None,
+            'bytes_per_second': self.bytes / elapsed if elapsed > 0 else None,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __repr__(self):
+        return '{}(path=\'{}\')'.format(type(self).__name__, self.path)
+
+
+class JSONLinesWriter(RotatingFileWriter):
+    """Writes objects to JSON lines files, one line at a time.
+
+    Accepts any iterable of objects (e.g., the content of a paginator) without collecting it in memory.
+
+    Parameters
+    ----------
+    path: str
+        Path to the file.
+    kwargs: typing.Any
+        Other keyword arguments to `RotatingFileWriter` (e.g., `compression`, `max_bytes` or `max_seconds`).
+    """
+
+    def write(self, obj, count=1):
+        """Writes an object as a line.
+
+        Parameters
+        ----------
+        obj: typing.Any
+            The object to write.
+        count: int
+            The number of items (for throughput).
+
+        Returns
+        -------
+        None
+        """
+        super(JSONLinesWriter, self).write(json._dumpb(obj) + b'\n', count=count)
+
+    def write_all(self, objs):
+        """Writes each object of an iterable as a line.
+
+        Parameters
+        ----------
+        objs: typing.Iterable
+            The objects to write.
+
+        Returns
+        -------
+        stats: dict
+            The throughput of the writer.
+        """
+        for obj in objs:
+            self.write(obj)
+        return self.stats